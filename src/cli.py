@@ -0,0 +1,202 @@
+"""Консольный режим без tkinter и значка в трее: сбор коммитов и отправка времени из скриптов и cron.
+
+    kaiten-time-logger collect --date 2025-05-05 --json > day.json
+    kaiten-time-logger submit --from day.json
+
+Тяжелые модули импортируются внутри команд, чтобы запуск и `--help` оставались быстрыми.
+"""
+
+import argparse
+import json
+import logging
+import sys
+from datetime import date
+from typing import List, Optional, TextIO
+
+
+def _parse_date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f'дата должна быть в формате ГГГГ-ММ-ДД: {value}') from e
+
+
+def _configure_logging(verbose: bool) -> None:
+    """Лог в stderr, чтобы не смешивать его с выводом команд в stdout."""
+    from src.utils.logger import configure_console
+
+    configure_console(sys.stderr, logging.INFO if verbose else logging.WARNING)
+
+
+def collect(args: argparse.Namespace, out: TextIO) -> int:
+    from src.core.config import COMMIT_INDEX_FILE, config
+    from src.core.git_manager import GitWorkspace
+
+    repo_paths = args.repo or config.git_repo_paths
+    if not repo_paths:
+        print('Не заданы пути к git репозиториям: укажите --repo или настройте приложение', file=sys.stderr)
+        return 2
+
+    start = args.start or args.date or date.today()
+    end = args.end or args.date or start
+    if start > end:
+        print(f'Начало периода {start} позже его конца {end}', file=sys.stderr)
+        return 2
+    index = None
+    if not args.no_index:
+        from src.core.commit_index import CommitIndex
+
+        index = CommitIndex(COMMIT_INDEX_FILE)
+    workspace = GitWorkspace(repo_paths, index=index)
+
+    if (start, end) == (date.today(), date.today()):
+        branches_by_date = {start: workspace.get_branches_with_commits()}
+    else:
+        day_filter = None
+        if not args.all_days:
+            from src.core.config import CALENDAR_FILE
+            from src.core.work_calendar import WorkCalendar
+
+            day_filter = WorkCalendar(CALENDAR_FILE).is_working_day
+        branches_by_date = workspace.get_branches_with_commits_by_date(start, end, day_filter=day_filter)
+
+    estimates = {}
+    if args.estimate:
+        from src.core.config import CALENDAR_FILE
+        from src.core.time_estimator import estimate_time
+        from src.core.work_calendar import WorkCalendar
+
+        calendar = WorkCalendar(CALENDAR_FILE)
+        for day, branches in branches_by_date.items():
+            working_minutes = int(calendar.working_hours(day, config.working_time) * 60) or int(
+                config.working_time * 60
+            )
+            day_estimates = estimate_time({branch.card_id: branch.commit_times for branch in branches}, working_minutes)
+            estimates.update({(day, card_id): minutes for card_id, minutes in day_estimates.items()})
+
+    rows = [
+        {
+            'for_date': day.isoformat(),
+            'card_id': branch.card_id,
+            'branch': branch.branch_name,
+            'commits': branch.commits,
+            'time_spent': estimates.get((day, branch.card_id), ''),
+            'description': '\n'.join(branch.commits),
+        }
+        for day, branches in branches_by_date.items()
+        for branch in branches
+    ]
+    if args.json:
+        json.dump(rows, out, ensure_ascii=False, indent=2)
+        out.write('\n')
+    else:
+        for row in rows:
+            time_spent = f'\t{row["time_spent"]} мин' if row['time_spent'] else ''
+            out.write(
+                f'{row["for_date"]}\t{row["card_id"]}\t{row["branch"]}\t{len(row["commits"])} коммитов{time_spent}\n'
+            )
+    return 0
+
+
+def _load_entries(rows: List[dict], hours_per_day: float):
+    from src.core.models import TimeLogEntry
+    from src.utils.time_parser import parse_duration
+
+    entries = []
+    for number, row in enumerate(rows, start=1):
+        time_spent = row.get('time_spent')
+        try:
+            # Число, в том числе строкой "90", — минуты, как в README; иначе формат 1h30m и т.п.
+            if isinstance(time_spent, int) or (isinstance(time_spent, str) and time_spent.strip().isdigit()):
+                minutes = int(time_spent)
+            else:
+                minutes = parse_duration(time_spent or '', hours_per_day)
+            for_date = date.fromisoformat(row['for_date']) if row.get('for_date') else None
+            entry = TimeLogEntry(int(row['card_id']), minutes, (row.get('description') or '').strip(), for_date)
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f'запись {number}: {e}') from e
+        if entry.time_spent > 0:
+            entries.append(entry)
+    return entries
+
+
+def submit(args: argparse.Namespace, out: TextIO) -> int:
+    from src.core.config import OUTBOX_FILE, config
+
+    try:
+        source = sys.stdin if args.source == '-' else open(args.source, encoding='utf-8')
+        with source:
+            entries = _load_entries(json.load(source), config.working_time)
+    except (OSError, ValueError) as e:
+        print(f'Некорректный файл записей: {e}', file=sys.stderr)
+        return 2
+
+    if args.dry_run:
+        for entry in entries:
+            out.write(f'{entry.for_date or date.today()}\t{entry.card_id}\t{entry.time_spent} мин\n')
+        return 0
+    if not config.is_kaiten_configured():
+        print('Приложение не настроено: нужны токен и URL Kaiten', file=sys.stderr)
+        return 2
+
+    from src.core.kaiten_api import KaitenAPI
+    from src.core.outbox import Outbox, OutboxWorker
+
+    # Через журнал отправки повторный запуск с тем же файлом не запишет время дважды
+    outbox = Outbox(OUTBOX_FILE)
+    added_count = outbox.enqueue(entries)
+    api = KaitenAPI.from_credentials(
+        config.kaiten_token,
+        config.kaiten_url,
+        config.role_id,
+        timeout=(config.connect_timeout, config.read_timeout),
+        rate_limit=config.rate_limit,
+        burst=config.rate_burst,
+    )
+    try:
+        results = OutboxWorker(outbox, lambda: api).flush()
+    finally:
+        api.close()
+
+    failed = [result for result in results if not result.success]
+    stats = api.rate_limit_stats
+    if stats.delayed:
+        out.write(f'Ожидание лимита запросов Kaiten: {stats.total_wait:.1f} с, максимум {stats.max_wait:.1f} с\n')
+    out.write(f'Новых записей: {added_count}, отправлено: {len(results) - len(failed)}, с ошибкой: {len(failed)}\n')
+    for result in failed:
+        status = f', HTTP {result.status}' if result.status else ''
+        out.write(f'Ошибка отправки: карточка {result.entry.card_id}, {result.entry.for_date}{status}\n')
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='kaiten-time-logger', description='Учет времени в Kaiten по коммитам git')
+    parser.add_argument('-v', '--verbose', action='store_true', help='подробный лог в stderr')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    collect_parser = commands.add_parser('collect', help='собрать ветки с коммитами за день или период')
+    collect_parser.add_argument('--date', type=_parse_date, help='день, по умолчанию сегодня')
+    collect_parser.add_argument('--from', dest='start', type=_parse_date, help='начало периода')
+    collect_parser.add_argument('--to', dest='end', type=_parse_date, help='конец периода')
+    collect_parser.add_argument('--repo', action='append', help='путь к репозиторию вместо настроенных')
+    collect_parser.add_argument('--all-days', action='store_true', help='не пропускать нерабочие дни')
+    collect_parser.add_argument('--no-index', action='store_true', help='не использовать индекс коммитов')
+    collect_parser.add_argument('--estimate', action='store_true', help='распределить рабочий день по коммитам')
+    collect_parser.add_argument('--json', action='store_true', help='вывод в JSON для последующего submit')
+    collect_parser.set_defaults(handler=collect)
+
+    submit_parser = commands.add_parser('submit', help='отправить время из JSON-файла, как его выводит collect')
+    submit_parser.add_argument('--from', dest='source', required=True, help='путь к файлу или - для stdin')
+    submit_parser.add_argument('--dry-run', action='store_true', help='только проверить файл')
+    submit_parser.set_defaults(handler=submit)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    _configure_logging(args.verbose)
+    return args.handler(args, sys.stdout)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from src.core.models import CardInfo
+from src.utils.logger import logger
+
+if TYPE_CHECKING:
+    from src.core.kaiten_api import KaitenAPI
+
+CARD_CACHE_TTL = 12 * 60 * 60  # секунды
+MISSING_CARD_TTL = 60 * 60  # несуществующая или недоступная карточка может появиться, поэтому проверяется чаще
+CARD_CACHE_SIZE = 1000
+
+
+class CardCache:
+    """Сведения о карточках Kaiten в памяти (LRU) и на диске, чтобы не запрашивать их при каждом открытии окна."""
+
+    def __init__(self, path: Path, ttl: float = CARD_CACHE_TTL, max_size: int = CARD_CACHE_SIZE):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._cards: Optional[OrderedDict[str, Tuple[float, CardInfo]]] = None
+
+    @staticmethod
+    def _key(url: str, card_id: int) -> str:
+        return f'{url.strip().rstrip("/")}|{card_id}'
+
+    def _load(self) -> OrderedDict:
+        if self._cards is None:
+            self._cards = OrderedDict()
+            try:
+                for key, (fetched_at, card) in json.loads(self.path.read_text(encoding='utf-8')).items():
+                    self._cards[key] = (fetched_at, CardInfo(**card))
+            except (OSError, ValueError, TypeError) as e:
+                if self.path.exists():
+                    logger.warning(f'Не удалось прочитать кеш карточек {self.path}: {e}')
+        return self._cards
+
+    def _save(self) -> None:
+        data = {key: (fetched_at, asdict(card)) for key, (fetched_at, card) in self._cards.items()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+        tmp_path.replace(self.path)
+
+    def get_many(
+        self, url: str, card_ids: Iterable[int], now: Optional[float] = None
+    ) -> Tuple[Dict[int, CardInfo], List[int]]:
+        """Возвращает карточки из кеша и ID, которые нужно запросить: отсутствующие и устаревшие.
+
+        Устаревшие карточки тоже возвращаются, чтобы показать их до обновления.
+        """
+        now = now or time.time()
+        cards, stale = {}, []
+        with self._lock:
+            cached = self._load()
+            for card_id in dict.fromkeys(card_ids):
+                key = self._key(url, card_id)
+                if key not in cached:
+                    stale.append(card_id)
+                    continue
+                cached.move_to_end(key)
+                fetched_at, card = cached[key]
+                cards[card_id] = card
+                if now - fetched_at >= (self.ttl if card.exists and card.accessible else MISSING_CARD_TTL):
+                    stale.append(card_id)
+        return cards, stale
+
+    def put_many(self, url: str, cards: Iterable[CardInfo], now: Optional[float] = None) -> None:
+        now = now or time.time()
+        with self._lock:
+            cached = self._load()
+            for card in cards:
+                key = self._key(url, card.card_id)
+                cached[key] = (now, card)
+                cached.move_to_end(key)
+            while len(cached) > self.max_size:
+                cached.popitem(last=False)
+            self._save()
+
+    def prefetch(self, api: 'KaitenAPI', url: str, card_ids: Iterable[int]) -> Dict[int, CardInfo]:
+        """Карточки из кеша, при необходимости одним пакетом конкурентных запросов дополненные из Kaiten."""
+        cards, stale = self.get_many(url, card_ids)
+        if stale:
+            fetched = list(api.get_cards(stale).values())
+            if fetched:
+                self.put_many(url, fetched)
+                cards.update({card.card_id: card for card in fetched})
+        return cards
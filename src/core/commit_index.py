@@ -0,0 +1,169 @@
+import sqlite3
+from collections import defaultdict
+from contextlib import closing
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from src.core.models import CommitRecord
+
+SCHEMA_VERSION = 1
+KEEP_DAYS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS heads (
+    repo TEXT NOT NULL,
+    author TEXT NOT NULL,
+    day TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    tip TEXT NOT NULL,
+    PRIMARY KEY (repo, author, day, branch)
+);
+CREATE TABLE IF NOT EXISTS commits (
+    repo TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    author TEXT NOT NULL,
+    committed_at TEXT NOT NULL,
+    message TEXT NOT NULL,
+    PRIMARY KEY (repo, sha)
+);
+CREATE TABLE IF NOT EXISTS branch_commits (
+    repo TEXT NOT NULL,
+    author TEXT NOT NULL,
+    day TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (repo, author, day, branch, sha)
+);
+"""
+
+
+class CommitIndex:
+    """Локальный индекс коммитов за день с вершинами веток, на которых он был построен.
+
+    Для каждой ветки хранится SHA вершины, при котором были собраны её коммиты. При обновлении
+    заново обходятся только ветки, чья вершина сдвинулась: их состав полностью заменяется,
+    поэтому force-push и rebase не оставляют в индексе устаревших коммитов.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.broken = False
+        self._broken_marker = self.path.with_name(f'{self.path.name}.broken')
+        if self._broken_marker.exists():
+            self.reset()
+            return
+        try:
+            self._init_schema()
+        except sqlite3.DatabaseError:
+            self.reset()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def _init_schema(self) -> None:
+        with closing(self._connect()) as conn:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version != SCHEMA_VERSION:
+                conn.executescript(
+                    'DROP TABLE IF EXISTS heads; DROP TABLE IF EXISTS commits; DROP TABLE IF EXISTS branch_commits;'
+                )
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            conn.commit()
+
+    def reset(self) -> None:
+        """Удаляет файл индекса и создает пустой, например если файл поврежден.
+
+        Вызывается только при открытии индекса, пока файлом не пользуются потоки сканирования.
+        """
+        for suffix in ('', '-wal', '-shm', '.broken'):
+            Path(f'{self.path}{suffix}').unlink(missing_ok=True)
+        self._init_schema()
+        self.broken = False
+
+    def mark_broken(self) -> None:
+        """Отключает поврежденный индекс до следующего открытия, где файл будет пересоздан.
+
+        Удалять файл сразу нельзя: другие потоки сканирования могут держать соединения с ним,
+        и в Windows удаление открытого файла завершится ошибкой.
+        """
+        self.broken = True
+        self._broken_marker.touch()
+
+    def get_tips(self, repo: str, author: str, day: date) -> Dict[str, str]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                'SELECT branch, tip FROM heads WHERE repo = ? AND author = ? AND day = ?',
+                (repo, author, day.isoformat()),
+            )
+            return dict(rows.fetchall())
+
+    def update(
+        self,
+        repo: str,
+        author: str,
+        day: date,
+        tips: Dict[str, str],
+        removed: Iterable[str],
+        commits_by_branch: Dict[str, List[CommitRecord]],
+    ) -> None:
+        """Заменяет состав веток `tips` и удаляет ветки `removed` одной транзакцией."""
+        day_key = day.isoformat()
+        stale = [*tips, *removed]
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                'DELETE FROM heads WHERE repo = ? AND author = ? AND day = ? AND branch = ?',
+                [(repo, author, day_key, branch) for branch in stale],
+            )
+            conn.executemany(
+                'DELETE FROM branch_commits WHERE repo = ? AND author = ? AND day = ? AND branch = ?',
+                [(repo, author, day_key, branch) for branch in stale],
+            )
+            conn.executemany(
+                'INSERT INTO heads (repo, author, day, branch, tip) VALUES (?, ?, ?, ?, ?)',
+                [(repo, author, day_key, branch, tip) for branch, tip in tips.items()],
+            )
+            for branch, commits in commits_by_branch.items():
+                conn.executemany(
+                    'INSERT OR REPLACE INTO commits (repo, sha, author, committed_at, message) VALUES (?, ?, ?, ?, ?)',
+                    [
+                        (repo, commit.sha, commit.author, commit.committed_datetime.isoformat(), commit.message)
+                        for commit in commits
+                    ],
+                )
+                conn.executemany(
+                    'INSERT OR IGNORE INTO branch_commits (repo, author, day, branch, sha, position) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    [(repo, author, day_key, branch, commit.sha, position) for position, commit in enumerate(commits)],
+                )
+            self._prune(conn, day - timedelta(days=KEEP_DAYS))
+
+    @staticmethod
+    def _prune(conn: sqlite3.Connection, before: date) -> None:
+        before_key = before.isoformat()
+        conn.execute('DELETE FROM heads WHERE day < ?', (before_key,))
+        conn.execute('DELETE FROM branch_commits WHERE day < ?', (before_key,))
+        conn.execute(
+            'DELETE FROM commits WHERE NOT EXISTS ('
+            'SELECT 1 FROM branch_commits bc WHERE bc.repo = commits.repo AND bc.sha = commits.sha)'
+        )
+
+    def load(self, repo: str, author: str, day: date) -> Dict[str, List[CommitRecord]]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                'SELECT bc.branch, c.sha, c.author, c.committed_at, c.message '
+                'FROM branch_commits bc JOIN commits c ON c.repo = bc.repo AND c.sha = bc.sha '
+                'WHERE bc.repo = ? AND bc.author = ? AND bc.day = ? '
+                'ORDER BY bc.branch, bc.position',
+                (repo, author, day.isoformat()),
+            )
+            commits_by_branch = defaultdict(list)
+            for branch, sha, commit_author, committed_at, message in rows:
+                commits_by_branch[branch].append(
+                    CommitRecord(sha, commit_author, datetime.fromisoformat(committed_at), message)
+                )
+            return commits_by_branch
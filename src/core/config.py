@@ -1,66 +1,112 @@
 import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import time
 from pathlib import Path
-
-import keyring
+from typing import List, Optional
 
 KEYRING_SERVICE = 'kaiten_time_logger'
-SETTINGS_FILE = Path(os.getenv('APPDATA')) / 'KaitenTimeLogger' / 'settings.json'
+# Вне Windows, например в консольном режиме под cron, APPDATA может быть не задана
+SETTINGS_FILE = Path(os.getenv('APPDATA') or Path.home() / '.config') / 'KaitenTimeLogger' / 'settings.json'
+COMMIT_INDEX_FILE = SETTINGS_FILE.parent / 'commit_index.sqlite3'
+OUTBOX_FILE = SETTINGS_FILE.parent / 'outbox.sqlite3'
+ROLES_CACHE_FILE = SETTINGS_FILE.parent / 'roles_cache.json'
+CALENDAR_FILE = SETTINGS_FILE.parent / 'calendar.json'
+CARD_CACHE_FILE = SETTINGS_FILE.parent / 'cards_cache.json'
+LOG_DIR = Path(os.getenv('KAITEN_LOG_DIR') or SETTINGS_FILE.parent / 'logs')
 
 
 @dataclass
 class Config:
-    kaiten_token: str = ''
     notification_time: str = '18:00'
-    git_repo_path: str = ''
+    git_repo_paths: List[str] = field(default_factory=list)
     kaiten_url: str = ''  # https://rtsoft-sg.kaiten.ru
     role_id: int = 0  # 6161
     working_time: float = 8.0  # Рабочее время в часах
+    connect_timeout: float = 5.0  # Таймауты запросов к Kaiten в секундах
+    read_timeout: float = 30.0
+    rate_limit: float = 5.0  # Не больше запросов к Kaiten в секунду
+    rate_burst: int = 10  # Сколько запросов можно отправить сразу без ожидания
+    watch_repos: bool = True  # Обновлять список коммитов открытого окна при изменении веток
+    _kaiten_token: Optional[str] = field(default=None, repr=False)
 
     def __post_init__(self):
         SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        stored_token = keyring.get_password(KEYRING_SERVICE, 'kaiten_token')
-        if stored_token:
-            self.kaiten_token = stored_token
         if SETTINGS_FILE.exists():
             try:
                 settings = json.loads(SETTINGS_FILE.read_text(encoding='utf-8'))
                 self.notification_time = settings.get('notification_time', self.notification_time)
-                self.git_repo_path = settings.get('git_repo_path', self.git_repo_path)
+                self.git_repo_paths = settings.get('git_repo_paths', self.git_repo_paths)
+                if not self.git_repo_paths and settings.get('git_repo_path'):
+                    self.git_repo_paths = [settings['git_repo_path']]
                 self.kaiten_url = settings.get('kaiten_url', self.kaiten_url)
                 self.role_id = settings.get('role_id', self.role_id)
                 self.working_time = settings.get('working_time', self.working_time)
+                self.connect_timeout = settings.get('connect_timeout', self.connect_timeout)
+                self.read_timeout = settings.get('read_timeout', self.read_timeout)
+                self.rate_limit = settings.get('rate_limit', self.rate_limit)
+                self.rate_burst = settings.get('rate_burst', self.rate_burst)
+                self.watch_repos = settings.get('watch_repos', self.watch_repos)
             except json.JSONDecodeError:
                 pass
 
+    @property
+    def kaiten_token(self) -> str:
+        """Токен читается из keyring при первом обращении: загрузка keyring заметно замедляет запуск."""
+        if self._kaiten_token is None:
+            import keyring
+
+            self._kaiten_token = keyring.get_password(KEYRING_SERVICE, 'kaiten_token') or ''
+        return self._kaiten_token
+
+    @kaiten_token.setter
+    def kaiten_token(self, value: str) -> None:
+        self._kaiten_token = value
+
+    @property
+    def notification_times(self) -> List[time]:
+        """Время напоминаний: в `notification_time` их может быть несколько через запятую."""
+        times = []
+        for value in self.notification_time.split(','):
+            try:
+                hours, minutes = map(int, value.split(':'))
+                times.append(time(hours, minutes))
+            except ValueError:
+                continue
+        return sorted(times)
+
+    def is_kaiten_configured(self) -> bool:
+        """Заданы токен и URL Kaiten: этого достаточно для отправки времени."""
+        return bool(self.kaiten_token.strip() and self.kaiten_url.strip())
+
     def is_configured(self) -> bool:
-        return all(
-            [
-                self.kaiten_token.strip(),
-                self.kaiten_url.strip(),
-                self.git_repo_path.strip(),
-            ]
-        )
+        return self.is_kaiten_configured() and any(path.strip() for path in self.git_repo_paths)
 
     def _save_settings_file(self) -> None:
         settings = {
             'notification_time': self.notification_time,
-            'git_repo_path': self.git_repo_path,
+            'git_repo_paths': self.git_repo_paths,
             'kaiten_url': self.kaiten_url,
             'role_id': self.role_id,
             'working_time': self.working_time,
+            'connect_timeout': self.connect_timeout,
+            'read_timeout': self.read_timeout,
+            'rate_limit': self.rate_limit,
+            'rate_burst': self.rate_burst,
+            'watch_repos': self.watch_repos,
         }
         SETTINGS_FILE.write_text(json.dumps(settings, indent=2), encoding='utf-8')
 
     @classmethod
     def save_config(
-        cls, token: str, time: str, repo_path: str, kaiten_url: str, role_id: int, working_time: float
+        cls, token: str, time: str, repo_paths: List[str], kaiten_url: str, role_id: int, working_time: float
     ) -> None:
+        import keyring
+
         keyring.set_password(KEYRING_SERVICE, 'kaiten_token', token)
         config.kaiten_token = token
         config.notification_time = time
-        config.git_repo_path = repo_path
+        config.git_repo_paths = repo_paths
         config.kaiten_url = kaiten_url
         config.role_id = role_id
         config.working_time = working_time
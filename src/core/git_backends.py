@@ -0,0 +1,170 @@
+import codecs
+import os
+import shutil
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Protocol, Tuple
+
+from src.utils.logger import logger
+
+GIT_BACKEND_ENV = 'KAITEN_GIT_BACKEND'  # cli или gitpython
+READ_CHUNK_SIZE = 64 * 1024
+# Поля записи git log, разделенные NUL; с -z записи тоже завершаются NUL
+LOG_FORMAT = '%H%x00%P%x00%cI%x00%an <%ae>%x00%B'
+LOG_FIELDS = 5
+# Без этого флага на Windows для каждого вызова git открывается окно консоли
+CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+
+class GitLogEntry(NamedTuple):
+    sha: str
+    parents: Tuple[str, ...]
+    committed_at: datetime
+    author: str  # имя <email>
+    message: str
+
+
+class GitBackend(Protocol):
+    """Чтение истории репозитория, необходимой `GitManager`."""
+
+    git_dir: str
+
+    def user_name(self) -> Optional[str]: ...
+
+    def head_tips(self) -> Dict[str, str]:
+        """SHA вершин всех локальных веток."""
+        ...
+
+    def log(self, revisions: List[str], since: datetime, until: Optional[datetime] = None) -> Iterator[GitLogEntry]:
+        """Коммиты `revisions` в интервале [`since`, `until`] в топологическом порядке."""
+        ...
+
+
+def _date_range(since: datetime, until: Optional[datetime]) -> List[str]:
+    args = [f'--since={since.isoformat()}']
+    if until:
+        args.append(f'--until={until.isoformat()}')
+    return args
+
+
+class CliGitBackend:
+    """Читает историю одним вызовом `git log` и разбирает вывод потоком, без объектов GitPython.
+
+    Сообщения коммитов приходят в том же выводе, поэтому на каждый коммит не требуется
+    отдельный `cat-file`.
+    """
+
+    def __init__(self, repo_path: Path, git: str = 'git'):
+        self.repo_path = Path(repo_path)
+        self.git = git
+        self.git_dir = str(Path(self._run('rev-parse', '--absolute-git-dir').strip()).resolve())
+
+    def _command(self, *args: str) -> List[str]:
+        return [self.git, '-C', str(self.repo_path), *args]
+
+    def _run(self, *args: str, check: bool = True) -> str:
+        result = subprocess.run(
+            self._command(*args),
+            capture_output=True,
+            encoding='utf-8',
+            errors='replace',
+            check=check,
+            creationflags=CREATE_NO_WINDOW,
+        )
+        return result.stdout
+
+    def user_name(self) -> Optional[str]:
+        # git config завершается с кодом 1, если параметр не задан
+        return self._run('config', 'user.name', check=False).strip() or None
+
+    def head_tips(self) -> Dict[str, str]:
+        tips = {}
+        for line in self._run('for-each-ref', 'refs/heads', '--format=%(objectname) %(refname:short)').splitlines():
+            sha, _, name = line.partition(' ')
+            if name:
+                tips[name] = sha
+        return tips
+
+    def _iter_fields(self, *args: str) -> Iterator[str]:
+        """Поля вывода git, разделенные NUL, по мере чтения из процесса."""
+        process = subprocess.Popen(
+            self._command(*args), stdout=subprocess.PIPE, stderr=subprocess.PIPE, creationflags=CREATE_NO_WINDOW
+        )
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        tail = ''
+        try:
+            while chunk := process.stdout.read(READ_CHUNK_SIZE):
+                *fields, tail = (tail + decoder.decode(chunk)).split('\0')
+                yield from fields
+            tail += decoder.decode(b'', final=True)
+            if tail:
+                yield tail
+            stderr = process.stderr.read()
+            if process.wait() != 0:
+                raise subprocess.CalledProcessError(process.returncode, process.args, stderr=stderr)
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            process.stderr.close()
+
+    def log(self, revisions: List[str], since: datetime, until: Optional[datetime] = None) -> Iterator[GitLogEntry]:
+        args = ['log', '-z', '--encoding=UTF-8', f'--format={LOG_FORMAT}', '--topo-order', *_date_range(since, until)]
+        fields = self._iter_fields(*args, *revisions, '--')
+        try:
+            for sha in fields:
+                parents, committed_at, author, message = (next(fields) for _ in range(LOG_FIELDS - 1))
+                yield GitLogEntry(sha, tuple(parents.split()), datetime.fromisoformat(committed_at), author, message)
+        finally:
+            # Если история прочитана не до конца, процесс git завершается сразу
+            fields.close()
+
+
+class GitPythonBackend:
+    """История через объекты `Commit` GitPython.
+
+    Медленнее `CliGitBackend`: родители и сообщения каждого коммита читаются отдельными запросами к git.
+    """
+
+    def __init__(self, repo_path: Path):
+        from git import Repo
+
+        self.repo = Repo(repo_path)
+        self.git_dir = str(Path(self.repo.git_dir).resolve())
+
+    def user_name(self) -> Optional[str]:
+        return self.repo.config_reader().get_value('user', 'name', default=None)
+
+    def head_tips(self) -> Dict[str, str]:
+        return {head.name: head.commit.hexsha for head in self.repo.heads}
+
+    def log(self, revisions: List[str], since: datetime, until: Optional[datetime] = None) -> Iterator[GitLogEntry]:
+        options = dict(topo_order=True, since=since.isoformat())
+        if until:
+            options['until'] = until.isoformat()
+        for commit in self.repo.iter_commits(revisions, **options):
+            yield GitLogEntry(
+                commit.hexsha,
+                tuple(parent.hexsha for parent in commit.parents),
+                commit.committed_datetime,
+                f'{commit.author.name} <{commit.author.email}>',
+                commit.message,
+            )
+
+
+def make_backend(repo_path: Path, name: Optional[str] = None) -> GitBackend:
+    """Backend по имени или из переменной окружения KAITEN_GIT_BACKEND.
+
+    По умолчанию используется `CliGitBackend`, а если git нет в PATH — GitPython, которому путь к git
+    можно задать через GIT_PYTHON_GIT_EXECUTABLE.
+    """
+    name = (name or os.getenv(GIT_BACKEND_ENV) or 'cli').lower()
+    if name == 'cli':
+        if shutil.which('git'):
+            return CliGitBackend(repo_path)
+        logger.warning('git не найден в PATH, для чтения истории используется GitPython')
+    elif name != 'gitpython':
+        raise ValueError(f'Неизвестный backend git: {name}')
+    return GitPythonBackend(repo_path)
@@ -1,38 +1,135 @@
 import re
+import sqlite3
+import threading
 from collections import defaultdict
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, time, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
 
-from git import Repo
-from git.objects import Commit
+from src.core.commit_index import CommitIndex
+from src.core.git_backends import GitBackend, make_backend
+from src.core.models import BranchCommits, CommitRecord
+from src.utils.logger import logger
+from src.utils.tracing import span
+
+MAX_SCAN_WORKERS = 8
+
+T = TypeVar('T')
 
 
 class GitManager:
-    def __init__(self, repo_path: Path):
-        self.repo = Repo(repo_path) if repo_path else None
-        self.current_user = self._get_current_user()
+    def __init__(self, repo_path: Path, index: Optional[CommitIndex] = None, backend: Optional[GitBackend] = None):
+        self.repo_path = repo_path
+        self.backend = backend or (make_backend(repo_path) if repo_path else None)
+        self.index = index
+        self.current_user = self.backend.user_name() if self.backend else None
+        # Результат последнего обхода без индекса: ((since, until), вершины веток, коммиты по веткам).
+        # Сбрасывается при смене интервала; автор определяется один раз при создании менеджера, а при
+        # изменении настроек приложение создает менеджеры заново, так что кэш живет не дольше них
+        self._last_walk: Optional[Tuple[tuple, Dict[str, str], Dict[str, List[CommitRecord]]]] = None
 
-    def _get_current_user(self) -> str | None:
-        if self.repo:
-            return self.repo.config_reader().get_value('user', 'name')
-        return None
+    @property
+    def repo_key(self) -> str:
+        return self.backend.git_dir
 
-    def _get_todays_commits(self) -> Dict[str, List[Commit]]:
-        if not self.repo:
+    def _get_todays_commits(self) -> Dict[str, List[CommitRecord]]:
+        if not self.backend:
             return {}
 
-        tz = datetime.now().astimezone().tzinfo
-        current_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=tz)
-        formatted_date = current_date.strftime('%Y-%m-%d %H:%M:%S.%f')
-        commits_by_branch = defaultdict(list)
+        current_date = self._start_of_day(date.today())
+
+        tips = self.backend.head_tips()
+        if not self.index or self.index.broken:
+            return self._walk_moved_branches(tips, current_date)
 
-        for branch in self.repo.heads:
-            latest_commit = branch.commit
-            if latest_commit.committed_datetime < current_date:
+        try:
+            return self._refresh_index(tips, current_date)
+        except sqlite3.Error as e:
+            logger.warning(f'Индекс коммитов поврежден, выполняется полное сканирование: {e}')
+            self.index.mark_broken()
+            return self._walk_moved_branches(tips, current_date)
+
+    def _walk_moved_branches(
+        self, tips: Dict[str, str], since: datetime, until: Optional[datetime] = None
+    ) -> Dict[str, List[CommitRecord]]:
+        """Коммиты всех веток в интервале, как `_walk_branches`.
+
+        При повторном обходе того же интервала заново обходятся только ветки, чья вершина изменилась.
+        Изменения, не сдвигающие вершины (например user.name в конфигурации git), учитываются только
+        новым экземпляром менеджера.
+        """
+        commits_by_branch = None
+        if self._last_walk and self._last_walk[0] == (since, until):
+            _, known_tips, known_commits = self._last_walk
+            moved = {name: sha for name, sha in tips.items() if known_tips.get(name) != sha}
+            if len(moved) < len(tips):
+                commits_by_branch = {
+                    name: commits for name, commits in known_commits.items() if name in tips and name not in moved
+                }
+                commits_by_branch.update(self._walk_branches(moved, since, until))
+        if commits_by_branch is None:
+            commits_by_branch = self._walk_branches(tips, since, until, all_branches=True)
+        self._last_walk = ((since, until), tips, commits_by_branch)
+        return commits_by_branch
+
+    def _refresh_index(self, tips: Dict[str, str], since: datetime) -> Dict[str, List[CommitRecord]]:
+        """Обходит заново только ветки, чья вершина изменилась с прошлого обновления индекса."""
+        author = self.current_user or ''
+        day = since.date()
+        known_tips = self.index.get_tips(self.repo_key, author, day)
+        moved = {name: sha for name, sha in tips.items() if known_tips.get(name) != sha}
+        removed = known_tips.keys() - tips.keys()
+        if moved or removed:
+            commits_by_branch = self._walk_branches(moved, since, all_branches=len(moved) == len(tips))
+            self.index.update(self.repo_key, author, day, moved, removed, commits_by_branch)
+        return self.index.load(self.repo_key, author, day)
+
+    @staticmethod
+    def _start_of_day(day: date) -> datetime:
+        return datetime.combine(day, time.min).astimezone()
+
+    def _walk_branches(
+        self, tips: Dict[str, str], since: datetime, until: Optional[datetime] = None, all_branches: bool = False
+    ) -> Dict[str, List[CommitRecord]]:
+        """Собирает коммиты веток `tips` в интервале [`since`, `until`) за один проход по истории.
+
+        Выполняется один `git log` в топологическом порядке, после чего каждая ветка
+        распространяется от своей вершины к родителям: коммит относится ко всем веткам,
+        из которых он достижим.
+        """
+        if not tips:
+            return {}
+
+        revisions = ['--branches'] if all_branches else sorted(set(tips.values()))
+        history = list(self.backend.log(revisions, since, until))
+        if not history:
+            return {}
+
+        branches_by_sha: Dict[str, Set[str]] = defaultdict(set)
+        for name, sha in tips.items():
+            branches_by_sha[sha].add(name)
+
+        # Потомки в --topo-order всегда идут раньше предков, поэтому одного прохода достаточно
+        for entry in history:
+            branches = branches_by_sha.get(entry.sha)
+            if not branches:
+                continue
+            for parent in entry.parents:
+                branches_by_sha[parent] |= branches
+
+        commits_by_branch = defaultdict(list)
+        for entry in history:
+            if self.current_user and self.current_user not in entry.author:
+                continue
+            if until and entry.committed_at >= until:
+                continue
+            branches = branches_by_sha.get(entry.sha)
+            if not branches:
                 continue
-            for commit in self.repo.iter_commits(branch, since=formatted_date, author=self.current_user):
-                commits_by_branch[branch.name].append(commit)
+            record = CommitRecord(entry.sha, entry.author, entry.committed_at, entry.message)
+            for branch in sorted(branches):
+                commits_by_branch[branch].append(record)
 
         return commits_by_branch
 
@@ -41,11 +138,181 @@ class GitManager:
         match = re.search(r'[^-]+-(\d+)', branch_name)
         return int(match.group(1)) if match else None
 
-    def get_branches_with_commits(self) -> List[Tuple[str, int, List[str]]]:
+    def _get_commits_by_date(self, start: date, end: date) -> Dict[date, Dict[str, List[CommitRecord]]]:
+        """Собирает коммиты за период [`start`, `end`] одним проходом и группирует их по дням."""
+        if not self.backend:
+            return {}
+
+        commits_by_branch = self._walk_moved_branches(
+            self.backend.head_tips(), self._start_of_day(start), self._start_of_day(end + timedelta(days=1))
+        )
+        commits_by_date = defaultdict(lambda: defaultdict(list))
+        for branch_name, commits in commits_by_branch.items():
+            for commit in commits:
+                commits_by_date[commit.committed_datetime.astimezone().date()][branch_name].append(commit)
+        return commits_by_date
+
+    def _to_branch_entries(self, commits_by_branch: Dict[str, List[CommitRecord]]) -> List[BranchCommits]:
         result = []
-        commits_by_branch = self._get_todays_commits()
         for branch_name, commits in commits_by_branch.items():
             if commits and (card_id := self._extract_card_id(branch_name)):
                 commit_messages = [commit.message.strip() for commit in commits]
-                result.append((branch_name, card_id, commit_messages))
+                commit_times = tuple(commit.committed_datetime for commit in commits)
+                commit_shas = tuple(commit.sha for commit in commits)
+                result.append(BranchCommits(branch_name, card_id, commit_messages, commit_times, commit_shas))
         return result
+
+    def get_branches_with_commits(self) -> List[BranchCommits]:
+        with span('git.branches', repo=str(self.repo_path)) as attributes:
+            branches = self._to_branch_entries(self._get_todays_commits())
+            attributes['branches'] = len(branches)
+        return branches
+
+    def get_branches_with_commits_by_date(self, start: date, end: date) -> Dict[date, List[BranchCommits]]:
+        with span('git.branches_by_date', repo=str(self.repo_path), days=(end - start).days + 1):
+            return {
+                day: self._to_branch_entries(commits_by_branch)
+                for day, commits_by_branch in sorted(self._get_commits_by_date(start, end).items())
+            }
+
+
+def merge_branches_by_card(
+    results: Iterable[List[BranchCommits]],
+) -> List[BranchCommits]:
+    """Объединяет ветки разных репозиториев с одной карточкой в одну запись.
+
+    Коммит, попавший в несколько веток, учитывается один раз по его SHA.
+    """
+    merged: Dict[int, Tuple[List[str], Dict[str, Tuple[str, datetime]]]] = {}
+    for branches in results:
+        for branch in branches:
+            branch_names, commits = merged.setdefault(branch.card_id, ([], {}))
+            if branch.branch_name not in branch_names:
+                branch_names.append(branch.branch_name)
+            for sha, message, commit_time in zip(branch.commit_shas, branch.commits, branch.commit_times, strict=True):
+                commits.setdefault(sha, (message, commit_time))
+    return [
+        BranchCommits(
+            ', '.join(branch_names),
+            card_id,
+            [message for message, _ in commits.values()],
+            tuple(sorted(commit_time for _, commit_time in commits.values())),
+            tuple(commits),
+        )
+        for card_id, (branch_names, commits) in merged.items()
+    ]
+
+
+def merge_branches_by_day(
+    results: Iterable[Dict[Optional[date], List[BranchCommits]]],
+) -> Dict[Optional[date], List[BranchCommits]]:
+    """Объединяет результаты репозиториев по дням, дни отсортированы."""
+    results = list(results)
+    days = sorted({day for result in results for day in result}, key=lambda day: day or date.min)
+    return {day: merge_branches_by_card(result.get(day, []) for result in results) for day in days}
+
+
+class GitWorkspace:
+    """Несколько репозиториев, которые сканируются параллельно."""
+
+    def __init__(
+        self, repo_paths: Iterable[Path], index: Optional[CommitIndex] = None, max_workers: int = MAX_SCAN_WORKERS
+    ):
+        self.managers: List[GitManager] = []
+        for path in repo_paths:
+            if not path:
+                continue
+            # Недоступный репозиторий не должен мешать сканированию остальных
+            try:
+                self.managers.append(GitManager(path, index=index))
+            except Exception as e:
+                logger.error(f'Не удалось открыть репозиторий {path}: {e}')
+        self.max_workers = max_workers
+
+    def _select(self, repo_keys: Optional[Iterable[str]]) -> List[GitManager]:
+        if repo_keys is None:
+            return self.managers
+        repo_keys = set(repo_keys)
+        return [manager for manager in self.managers if manager.repo_key in repo_keys]
+
+    def _scan(self, scan: Callable[[GitManager], T]) -> List[T]:
+        if not self.managers:
+            return []
+
+        # git работает в отдельных процессах, поэтому потоков достаточно для параллельного сканирования
+        workers = min(self.max_workers, len(self.managers))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='git-scan') as executor:
+            futures = [(manager, executor.submit(scan, manager)) for manager in self.managers]
+            results = []
+            for manager, future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f'Ошибка сканирования репозитория {manager.repo_path}: {e}')
+        return results
+
+    def iter_scan(
+        self,
+        scan: Callable[[GitManager], T],
+        cancelled: Optional[threading.Event] = None,
+        repo_keys: Optional[Iterable[str]] = None,
+    ) -> Iterator[T]:
+        """Результаты по мере готовности репозиториев. После `cancelled` ожидающие репозитории не сканируются.
+
+        `repo_keys` ограничивает сканирование репозиториями с этими `GitManager.repo_key`.
+        """
+        managers = self._select(repo_keys)
+        if not managers:
+            return
+
+        workers = min(self.max_workers, len(managers))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='git-scan')
+        try:
+            futures = {executor.submit(scan, manager): manager for manager in managers}
+            for future in as_completed(futures):
+                if cancelled is not None and cancelled.is_set():
+                    return
+                try:
+                    yield future.result()
+                except Exception as e:
+                    logger.error(f'Ошибка сканирования репозитория {futures[future].repo_path}: {e}')
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_repo_branches(
+        self,
+        period: Optional[Tuple[date, date]] = None,
+        day_filter: Optional[Callable[[date], bool]] = None,
+        cancelled: Optional[threading.Event] = None,
+        repo_keys: Optional[Iterable[str]] = None,
+    ) -> Iterator[Tuple[str, Dict[Optional[date], List[BranchCommits]]]]:
+        """Ключ репозитория и его ветки по дням, по мере сканирования. Без `period` — за сегодня с ключом None."""
+
+        def scan(manager: GitManager) -> Tuple[str, Dict[Optional[date], List[BranchCommits]]]:
+            if period:
+                return manager.repo_key, manager.get_branches_with_commits_by_date(*period)
+            return manager.repo_key, {None: manager.get_branches_with_commits()}
+
+        for repo_key, result in self.iter_scan(scan, cancelled, repo_keys):
+            yield (
+                repo_key,
+                {day: branches for day, branches in result.items() if day is None or not day_filter or day_filter(day)},
+            )
+
+    @property
+    def git_dirs(self) -> List[str]:
+        return [manager.repo_key for manager in self.managers]
+
+    def get_branches_with_commits(self) -> List[BranchCommits]:
+        return merge_branches_by_card(self._scan(GitManager.get_branches_with_commits))
+
+    def get_branches_with_commits_by_date(
+        self, start: date, end: date, day_filter: Optional[Callable[[date], bool]] = None
+    ) -> Dict[date, List[BranchCommits]]:
+        """Коммиты за период по дням; `day_filter` отбрасывает, например, нерабочие дни."""
+        results = self._scan(lambda manager: manager.get_branches_with_commits_by_date(start, end))
+        return {
+            day: branches
+            for day, branches in merge_branches_by_day(results).items()
+            if not day_filter or day_filter(day)
+        }
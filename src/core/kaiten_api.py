@@ -1,17 +1,169 @@
-from datetime import datetime
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
 
-import requests
+import httpx
 
+from src.core.models import CardInfo, TimeLogEntry, TimeLogResult
 from src.utils.logger import logger
+from src.utils.tracing import span
 
+DEFAULT_TIMEOUT = (5.0, 30.0)  # (connect, read) в секундах
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Запрос, изменяющий данные, мог быть выполнен сервером, поэтому он повторяется, только если сервер
+# точно его не принял: соединение не установлено либо ответ 429/503
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS')
+UNSAFE_RETRY_STATUSES = (429, 503)
+UNSAFE_RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+MAX_RETRY_AFTER = 120.0  # секунды
+POOL_SIZE = 10
+MAX_CONCURRENT_REQUESTS = POOL_SIZE
+DEFAULT_RATE_LIMIT = 5.0  # запросов в секунду
+DEFAULT_BURST = 10
+
+T = TypeVar('T')
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Задержка из заголовка Retry-After: число секунд или HTTP-дата."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(delay, 0.0), MAX_RETRY_AFTER)
+
+
+def _rate_limit_reset(response: httpx.Response) -> Optional[float]:
+    """Через сколько секунд сервер снова примет запросы, если квота по заголовкам X-RateLimit-* исчерпана."""
+    headers = response.headers
+    remaining = headers.get('X-RateLimit-Remaining', headers.get('RateLimit-Remaining'))
+    reset = headers.get('X-RateLimit-Reset', headers.get('RateLimit-Reset'))
+    try:
+        if remaining is None or int(remaining) > 0 or reset is None:
+            return None
+        delay = float(reset)
+    except ValueError:
+        return None
+    # Сброс может быть задан как Unix-время, а не как число секунд
+    if delay > 1e9:
+        delay -= time.time()
+    return min(max(delay, 0.0), MAX_RETRY_AFTER)
+
+
+@dataclass(frozen=True)
+class RateLimitStats:
+    requests: int = 0
+    delayed: int = 0
+    total_wait: float = 0.0  # секунды
+    max_wait: float = 0.0
+
+    @property
+    def average_wait(self) -> float:
+        return self.total_wait / self.requests if self.requests else 0.0
+
+
+class RateLimiter:
+    """Ограничитель частоты запросов по алгоритму token bucket.
+
+    Запросы проходят без ожидания, пока в корзине есть токены (до `burst`), затем с частотой `rate`
+    в секунду. `pause` приостанавливает все запросы, например пока сервер отвечает 429. Токены
+    резервируются без блокировок, поэтому ограничитель не привязан к конкретному циклу событий.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE_LIMIT, burst: int = DEFAULT_BURST):
+        if rate <= 0 or burst < 1:
+            raise ValueError('Частота и размер пакета запросов должны быть положительными')
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._stats = RateLimitStats()
+
+    @property
+    def stats(self) -> RateLimitStats:
+        return self._stats
+
+    def _reserve(self) -> float:
+        """Берет токен, возможно в долг, и возвращает, сколько ждать до его появления."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        self._tokens -= 1
+        return max(-self._tokens / self.rate, self._paused_until - now, 0.0)
+
+    async def acquire(self) -> float:
+        """Ждет разрешения на запрос и возвращает время ожидания в секундах."""
+        started = time.monotonic()
+        delay = self._reserve()
+        delayed = delay > 0
+        while delay > 0:
+            await asyncio.sleep(delay)
+            # За время ожидания сервер мог попросить подождать еще
+            delay = self._paused_until - time.monotonic()
+        waited = time.monotonic() - started if delayed else 0.0
+        stats = self._stats
+        self._stats = RateLimitStats(
+            stats.requests + 1,
+            stats.delayed + delayed,
+            stats.total_wait + waited,
+            max(stats.max_wait, waited),
+        )
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        # Сервер считает квоту исчерпанной, поэтому накопленные токены больше не действительны
+        self._tokens = min(self._tokens, 0.0)
+
+
+class AsyncKaitenAPI:
+    """Асинхронный клиент Kaiten с общим пулом keep-alive соединений.
+
+    Все запросы одного клиента ограничены семафором, поэтому пакетная отправка, запросы карточек
+    и ролей могут выполняться в одном цикле событий без отдельного потока на запрос. Частота
+    запросов ограничена `rate_limiter`, который также учитывает заголовки X-RateLimit-* и 429.
+    Запросы на чтение повторяются при 429/5xx и сетевых ошибках с учетом Retry-After, запросы на
+    изменение — только при 429/503 и ошибках установки соединения.
+    """
 
-class KaitenAPI:
     API_VERSION_PATH = '/api/latest'
 
-    def __init__(self, token: str, kaiten_url: str, role_id: int = 0):
+    def __init__(
+        self,
+        token: str,
+        kaiten_url: str,
+        role_id: int = 0,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
         self.token = token
         self.base_url = kaiten_url + self.API_VERSION_PATH
         self.role_id = role_id
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        connect_timeout, read_timeout = timeout
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.rate_limiter = rate_limiter or RateLimiter()
 
     @property
     def headers(self):
@@ -20,40 +172,247 @@ class KaitenAPI:
             'Content-Type': 'application/json',
         }
 
-    def add_time_log(self, card_id: int, time_spent: int, description: str) -> bool:
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        with span('kaiten.request', method=method, path=path) as attributes:
+            async with self._semaphore:
+                response = await self._send(method, path, attributes, **kwargs)
+            attributes['status'] = response.status_code
+            return response
+
+    async def _send(self, method: str, path: str, attributes: dict, **kwargs) -> httpx.Response:
+        idempotent = method in IDEMPOTENT_METHODS
+        retry_statuses = RETRY_STATUSES if idempotent else UNSAFE_RETRY_STATUSES
+        retry_errors = httpx.TransportError if idempotent else UNSAFE_RETRY_ERRORS
+        for attempt in range(self.max_retries + 1):
+            attributes['attempts'] = attempt + 1
+            is_last_attempt = attempt == self.max_retries
+            if waited := await self.rate_limiter.acquire():
+                attributes['rate_limit_wait_ms'] = round(attributes.get('rate_limit_wait_ms', 0) + waited * 1000, 2)
+            try:
+                response = await self.client.request(method, f'{self.base_url}{path}', **kwargs)
+            except retry_errors:
+                if is_last_attempt:
+                    raise
+                delay = self.backoff_factor * 2**attempt
+            else:
+                # Пауза действует на все запросы клиента, а не только на повтор этого
+                pause = (response.status_code == 429 and _retry_after(response)) or _rate_limit_reset(response)
+                if pause:
+                    logger.warning(f'Исчерпан лимит запросов к Kaiten, пауза {pause:.1f} с')
+                    self.rate_limiter.pause(pause)
+                if response.status_code not in retry_statuses or is_last_attempt:
+                    return response
+                delay = _retry_after(response)
+                if delay is None:
+                    delay = self.backoff_factor * 2**attempt
+            await asyncio.sleep(delay)
+
+    async def add_time_log(
+        self, card_id: int, time_spent: int, description: str, for_date: Optional[date] = None
+    ) -> bool:
+        return await self._post_time_log(card_id, time_spent, description, for_date) == 200
+
+    async def _post_time_log(
+        self, card_id: int, time_spent: int, description: str, for_date: Optional[date] = None
+    ) -> Optional[int]:
+        """Код ответа Kaiten или None, если ответ не получен."""
         try:
             data = {
                 'card_id': card_id,
                 'time_spent': time_spent,
                 'comment': description,
-                'for_date': datetime.now().strftime('%Y-%m-%d'),
+                'for_date': (for_date or date.today()).strftime('%Y-%m-%d'),
                 'role_id': self.role_id,
             }
+            response = await self._request('POST', f'/cards/{card_id}/time-logs', json=data)
+            return response.status_code
+
+        except httpx.HTTPError as e:
+            logger.error(f'Ошибка сохранения времени в Kaiten: {e!r}')
+            return None
+
+    async def add_time_logs(
+        self,
+        entries: Iterable[TimeLogEntry],
+        max_concurrency: Optional[int] = None,
+        on_result: Optional[Callable[[TimeLogResult], None]] = None,
+    ) -> List[TimeLogResult]:
+        """Отправляет записи параллельно и возвращает результаты в порядке `entries`.
+
+        `on_result` вызывается в цикле событий по мере завершения каждого запроса.
+        """
+        batch_semaphore = asyncio.Semaphore(max_concurrency or MAX_CONCURRENT_REQUESTS)
+
+        async def submit(entry: TimeLogEntry) -> TimeLogResult:
+            async with batch_semaphore:
+                try:
+                    status = await self._post_time_log(
+                        entry.card_id, entry.time_spent, entry.description, entry.for_date
+                    )
+                except Exception as e:
+                    logger.error(f'Ошибка при сохранении времени для карточки {entry.card_id}: {e}')
+                    status = None
+            result = TimeLogResult(entry, status == 200, status)
+            if on_result:
+                on_result(result)
+            return result
+
+        return list(await asyncio.gather(*(submit(entry) for entry in entries)))
 
-            response = requests.post(
-                f'{self.base_url}/cards/{card_id}/time-logs',
-                headers=self.headers,
-                json=data,
-            )
+    async def _fetch_card(self, card_id: int) -> httpx.Response:
+        """Ответ на запрос карточки: 200, 403 или 404; на остальные ответы выбрасывается исключение."""
+        try:
+            response = await self._request('GET', f'/cards/{card_id}')
+            if response.status_code not in (403, 404):
+                response.raise_for_status()
+            return response
+        except httpx.HTTPError as e:
+            logger.error(f'Ошибка получения карточки {card_id} из Kaiten: {e!r}')
+            raise
 
-            return response.status_code == 200
+    async def get_card(self, card_id: int) -> Optional[dict]:
+        """Карточка по ID или None, если ее нет или к ней нет доступа."""
+        response = await self._fetch_card(card_id)
+        return response.json() if response.status_code == 200 else None
 
-        except requests.RequestException as e:
-            logger.error(f'Ошибка сохранения времени в Kaiten: {e}')
-            return False
+    async def get_cards(self, card_ids: Iterable[int]) -> Dict[int, CardInfo]:
+        """Сведения о карточках по ID; карточки, которые не удалось получить из-за ошибки, пропускаются."""
+        card_ids = list(dict.fromkeys(card_ids))
+        responses = await asyncio.gather(*(self._fetch_card(card_id) for card_id in card_ids), return_exceptions=True)
+        cards = {}
+        for card_id, response in zip(card_ids, responses, strict=True):
+            if isinstance(response, BaseException):
+                continue
+            if response.status_code == 404:
+                cards[card_id] = CardInfo(card_id, exists=False)
+            elif response.status_code == 403:
+                cards[card_id] = CardInfo(card_id, accessible=False)
+            else:
+                try:
+                    cards[card_id] = CardInfo.from_response(card_id, response.json())
+                except (ValueError, AttributeError) as e:
+                    logger.error(f'Некорректный ответ Kaiten для карточки {card_id}: {e!r}')
+        return cards
 
-    def get_list_of_user_roles(self) -> dict[id, str]:
+    async def get_list_of_user_roles(self) -> dict[int, str]:
         try:
-            response = requests.get(
-                f'{self.base_url}/user-roles',
-                headers=self.headers,
-            )
+            response = await self._request('GET', '/user-roles')
+            response.raise_for_status()
             user_roles = response.json()
             return {role['id']: role['name'] for role in user_roles}
-        except requests.RequestException as e:
-            logger.error(f'Ошибка получения списка ролей в Kaiten: {e}')
+        except (httpx.HTTPError, ValueError, KeyError, TypeError) as e:
+            logger.error(f'Ошибка получения списка ролей в Kaiten: {e!r}')
             return {}
 
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class _EventLoopThread:
+    """Общий цикл событий в фоновом потоке для синхронных клиентов."""
+
+    _instance: Optional['_EventLoopThread'] = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, name='kaiten-api-loop', daemon=True).start()
+
+    @classmethod
+    def get(cls) -> '_EventLoopThread':
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def run(self, coroutine: Awaitable[T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+
+class KaitenAPI:
+    """Синхронная обертка над `AsyncKaitenAPI`: запросы выполняются в общем фоновом цикле событий."""
+
+    def __init__(
+        self,
+        token: str,
+        kaiten_url: str,
+        role_id: int = 0,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        burst: int = DEFAULT_BURST,
+    ):
+        self.async_api = AsyncKaitenAPI(
+            token,
+            kaiten_url,
+            role_id,
+            timeout,
+            max_retries,
+            backoff_factor,
+            rate_limiter=RateLimiter(rate_limit, burst),
+        )
+        self._loop_thread = _EventLoopThread.get()
+
+    @property
+    def token(self) -> str:
+        return self.async_api.token
+
+    @property
+    def base_url(self) -> str:
+        return self.async_api.base_url
+
+    @property
+    def role_id(self) -> int:
+        return self.async_api.role_id
+
+    @property
+    def headers(self):
+        return self.async_api.headers
+
+    @property
+    def rate_limit_stats(self) -> RateLimitStats:
+        return self.async_api.rate_limiter.stats
+
+    def add_time_log(self, card_id: int, time_spent: int, description: str, for_date: Optional[date] = None) -> bool:
+        return self._loop_thread.run(self.async_api.add_time_log(card_id, time_spent, description, for_date))
+
+    def add_time_logs(
+        self,
+        entries: Iterable[TimeLogEntry],
+        max_workers: int = MAX_CONCURRENT_REQUESTS,
+        on_result: Optional[Callable[[TimeLogResult], None]] = None,
+    ) -> List[TimeLogResult]:
+        """Отправляет записи параллельно и возвращает результаты в порядке `entries`.
+
+        `on_result` вызывается из потока цикла событий по мере завершения каждого запроса.
+        """
+        entries = list(entries)
+        with span('kaiten.add_time_logs', entries=len(entries)):
+            return self._loop_thread.run(self.async_api.add_time_logs(entries, max_workers, on_result))
+
+    def get_card(self, card_id: int) -> Optional[dict]:
+        return self._loop_thread.run(self.async_api.get_card(card_id))
+
+    def get_cards(self, card_ids: Iterable[int]) -> Dict[int, CardInfo]:
+        card_ids = list(card_ids)
+        with span('kaiten.get_cards', cards=len(card_ids)):
+            return self._loop_thread.run(self.async_api.get_cards(card_ids))
+
+    def get_list_of_user_roles(self) -> dict[int, str]:
+        return self._loop_thread.run(self.async_api.get_list_of_user_roles())
+
+    def close(self) -> None:
+        self._loop_thread.run(self.async_api.aclose())
+
     @classmethod
-    def from_credentials(cls, token: str, base_url: str, role_id: int = 0) -> 'KaitenAPI':
-        return cls(token, base_url, role_id)
+    def from_credentials(
+        cls,
+        token: str,
+        base_url: str,
+        role_id: int = 0,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        burst: int = DEFAULT_BURST,
+    ) -> 'KaitenAPI':
+        return cls(token, base_url, role_id, timeout=timeout, rate_limit=rate_limit, burst=burst)
@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import List, NamedTuple, Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class CommitRecord:
+    """Краткие сведения о коммите, достаточные для учета времени."""
+
+    sha: str
+    author: str
+    committed_datetime: datetime
+    message: str
+
+
+class BranchCommits(NamedTuple):
+    """Ветка карточки с сообщениями, временем и SHA каждого коммита."""
+
+    branch_name: str
+    card_id: int
+    commits: List[str]
+    commit_times: Tuple[datetime, ...] = ()
+    commit_shas: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class TimeLogEntry:
+    """Запись времени для отправки в Kaiten."""
+
+    card_id: int
+    time_spent: int  # минуты
+    description: str
+    for_date: Optional[date] = None
+
+
+@dataclass(frozen=True, slots=True)
+class TimeLogResult:
+    entry: TimeLogEntry
+    success: bool
+    status: Optional[int] = None  # код ответа Kaiten; None, если ответа не было
+
+
+@dataclass(frozen=True, slots=True)
+class CardInfo:
+    """Сведения о карточке Kaiten для отображения рядом с веткой."""
+
+    card_id: int
+    title: str = ''
+    board: str = ''
+    status: str = ''
+    exists: bool = True
+    accessible: bool = True  # карточка есть, но Kaiten запрещает ее просмотр (403)
+
+    @classmethod
+    def from_response(cls, card_id: int, card: dict) -> 'CardInfo':
+        return cls(
+            card_id,
+            title=card.get('title') or '',
+            board=(card.get('board') or {}).get('title') or '',
+            status=(card.get('column') or {}).get('title') or '',
+        )
@@ -0,0 +1,225 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional, Tuple
+
+from src.core.models import TimeLogEntry, TimeLogResult
+from src.utils.logger import logger
+
+if TYPE_CHECKING:
+    from src.core.kaiten_api import KaitenAPI
+
+RETRY_BASE_DELAY = 30.0  # секунды
+RETRY_MAX_DELAY = 3600.0
+# Kaiten отклонил саму запись или доступ к карточке: повтор вернет тот же ответ
+PERMANENT_FAILURE_STATUSES = (400, 401, 403, 404)
+MAX_SERVER_ERROR_ATTEMPTS = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    key TEXT PRIMARY KEY,
+    card_id INTEGER NOT NULL,
+    time_spent INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    for_date TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    sent_at REAL,
+    failed_at REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (next_attempt_at) WHERE sent_at IS NULL;
+"""
+
+
+class Outbox:
+    """Локальный журнал записей времени, ожидающих отправки в Kaiten.
+
+    Запись попадает в журнал один раз: ключ идемпотентности состоит из карточки, даты
+    и хеша времени с описанием, поэтому повторное сохранение той же записи игнорируется,
+    в том числе после успешной отправки. Записи, которые не удалось отправить окончательно,
+    остаются в журнале с отметкой failed_at и текстом ошибки.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    @staticmethod
+    def idempotency_key(entry: TimeLogEntry) -> str:
+        digest = hashlib.sha256(f'{entry.time_spent}\n{entry.description}'.encode('utf-8')).hexdigest()[:16]
+        return f'{entry.card_id}:{entry.for_date.isoformat()}:{digest}'
+
+    def enqueue(self, entries: Iterable[TimeLogEntry], now: Optional[float] = None) -> int:
+        """Добавляет записи в журнал и возвращает количество новых или возвращенных в очередь."""
+        now = now or time.time()
+        # Дата фиксируется в момент сохранения, а не отправки, которая может случиться на следующий день
+        entries = [
+            entry if entry.for_date else TimeLogEntry(entry.card_id, entry.time_spent, entry.description, date.today())
+            for entry in entries
+        ]
+        with closing(self._connect()) as conn, conn:
+            before = conn.total_changes
+            # Повторное сохранение записи, отправка которой прекращена, снова ставит ее в очередь
+            conn.executemany(
+                'INSERT INTO outbox (key, card_id, time_spent, description, for_date, created_at, next_attempt_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET attempts = 0, failed_at = NULL, '
+                'error = NULL, next_attempt_at = excluded.next_attempt_at WHERE failed_at IS NOT NULL',
+                [
+                    (
+                        self.idempotency_key(entry),
+                        entry.card_id,
+                        entry.time_spent,
+                        entry.description,
+                        entry.for_date.isoformat(),
+                        now,
+                        now,
+                    )
+                    for entry in entries
+                ],
+            )
+            return conn.total_changes - before
+
+    def due(self, now: Optional[float] = None) -> List[Tuple[str, TimeLogEntry]]:
+        now = now or time.time()
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                'SELECT key, card_id, time_spent, description, for_date FROM outbox '
+                'WHERE sent_at IS NULL AND failed_at IS NULL AND next_attempt_at <= ? ORDER BY created_at',
+                (now,),
+            )
+            return [
+                (key, TimeLogEntry(card_id, time_spent, description, date.fromisoformat(for_date)))
+                for key, card_id, time_spent, description, for_date in rows
+            ]
+
+    def mark_sent(self, keys: Iterable[str], now: Optional[float] = None) -> None:
+        now = now or time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany('UPDATE outbox SET sent_at = ? WHERE key = ?', [(now, key) for key in keys])
+
+    def mark_failed(self, failures: Iterable[Tuple[str, Optional[int]]], now: Optional[float] = None) -> List[str]:
+        """Откладывает следующую попытку с экспоненциально растущей задержкой.
+
+        `failures` — пары (ключ, код ответа Kaiten или None). Записи с кодом из
+        PERMANENT_FAILURE_STATUSES и записи, получившие ошибку сервера MAX_SERVER_ERROR_ATTEMPTS раз,
+        больше не отправляются. Возвращает ключи таких записей.
+        """
+        now = now or time.time()
+        given_up = []
+        with closing(self._connect()) as conn, conn:
+            for key, status in failures:
+                error = f'HTTP {status}' if status else 'нет ответа от сервера'
+                row = conn.execute('SELECT attempts FROM outbox WHERE key = ?', (key,)).fetchone()
+                attempts = (row[0] if row else 0) + 1
+                if status in PERMANENT_FAILURE_STATUSES or (
+                    status and status >= 500 and attempts >= MAX_SERVER_ERROR_ATTEMPTS
+                ):
+                    conn.execute(
+                        'UPDATE outbox SET attempts = ?, failed_at = ?, error = ? WHERE key = ?',
+                        (attempts, now, error, key),
+                    )
+                    given_up.append(key)
+                else:
+                    delay = min(RETRY_BASE_DELAY * 2 ** min(attempts - 1, 16), RETRY_MAX_DELAY)
+                    conn.execute(
+                        'UPDATE outbox SET attempts = ?, error = ?, next_attempt_at = ? WHERE key = ?',
+                        (attempts, error, now + delay, key),
+                    )
+        return given_up
+
+    def next_attempt_at(self) -> Optional[float]:
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                'SELECT MIN(next_attempt_at) FROM outbox WHERE sent_at IS NULL AND failed_at IS NULL'
+            ).fetchone()[0]
+
+    def pending_count(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute('SELECT COUNT(*) FROM outbox WHERE sent_at IS NULL AND failed_at IS NULL').fetchone()[0]
+
+    def failed(self) -> List[Tuple[TimeLogEntry, str]]:
+        """Записи, отправка которых прекращена, с текстом ошибки."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                'SELECT card_id, time_spent, description, for_date, error FROM outbox '
+                'WHERE failed_at IS NOT NULL ORDER BY failed_at'
+            )
+            return [
+                (TimeLogEntry(card_id, time_spent, description, date.fromisoformat(for_date)), error)
+                for card_id, time_spent, description, for_date, error in rows
+            ]
+
+
+class OutboxWorker:
+    """Фоновый поток, отправляющий записи журнала в Kaiten с повторами.
+
+    `on_flush` получает результаты отправки и те из неудачных, которые больше не будут повторяться;
+    о каждой такой записи сообщается один раз.
+    """
+
+    def __init__(
+        self,
+        outbox: Outbox,
+        get_api: Callable[[], Optional['KaitenAPI']],
+        on_flush: Optional[Callable[[List[TimeLogResult], List[TimeLogResult]], None]] = None,
+    ):
+        self.outbox = outbox
+        self.get_api = get_api
+        self.on_flush = on_flush
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='kaiten-outbox', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def flush(self, now: Optional[float] = None) -> List[TimeLogResult]:
+        """Отправляет записи, время повторной попытки которых наступило."""
+        api = self.get_api()
+        due = self.outbox.due(now)
+        if not api or not due:
+            return []
+
+        keys = {entry: key for key, entry in due}
+        results = api.add_time_logs(keys)
+        self.outbox.mark_sent([keys[result.entry] for result in results if result.success], now)
+        given_up = set(
+            self.outbox.mark_failed(
+                [(keys[result.entry], result.status) for result in results if not result.success], now
+            )
+        )
+        if self.on_flush:
+            self.on_flush(results, [result for result in results if keys[result.entry] in given_up])
+        return results
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.flush()
+                # Без настроенного API ждем явного пробуждения, например после сохранения настроек
+                next_attempt_at = self.outbox.next_attempt_at() if self.get_api() else None
+            except Exception as e:
+                logger.error(f'Ошибка отправки журнала записей времени: {e}')
+                next_attempt_at = time.time() + RETRY_BASE_DELAY
+            timeout = None if next_attempt_at is None else max(next_attempt_at - time.time(), 0)
+            self._wake.wait(timeout)
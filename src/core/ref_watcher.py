@@ -0,0 +1,215 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from src.utils.logger import logger
+
+DEBOUNCE_INTERVAL = 0.5  # секунды; git меняет несколько ссылок подряд, например при rebase
+POLL_INTERVAL = 2.0
+STOP_CHECK_INTERVAL = 0.5
+ROOT_REF_FILES = ('HEAD', 'packed-refs')
+
+IN_MODIFY = 0x2
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def _is_ref_name(name: str) -> bool:
+    # Git пишет ссылку во временный файл .lock и затем переименовывает его
+    return bool(name) and not name.endswith('.lock')
+
+
+class _InotifySource:
+    """Изменения ссылок через inotify: каталоги refs/heads и корень каталога .git каждого репозитория."""
+
+    def __init__(self, git_dirs: Iterable[str]):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1')
+        self.git_dirs = list(git_dirs)
+        # Дескриптор наблюдения -> (каталог .git, наблюдаемый каталог, это корень .git)
+        self._watches: Dict[int, Tuple[str, Path, bool]] = {}
+        try:
+            for git_dir in self.git_dirs:
+                self._watch(git_dir, Path(git_dir), is_root=True)
+                if (Path(git_dir) / 'refs' / 'heads').is_dir():
+                    self._watch_tree(git_dir, Path(git_dir) / 'refs' / 'heads')
+        except OSError:
+            self.close()
+            raise
+
+    def _watch(self, git_dir: str, path: Path, is_root: bool = False) -> None:
+        wd = self._add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch {path}')
+        self._watches[wd] = (git_dir, path, is_root)
+
+    def _watch_tree(self, git_dir: str, path: Path) -> None:
+        """Ветки вида feature/TASK-1 хранятся во вложенных каталогах, за ними тоже нужно следить."""
+        self._watch(git_dir, path)
+        for directory, subdirectories, _ in os.walk(path):
+            for subdirectory in subdirectories:
+                self._watch(git_dir, Path(directory) / subdirectory)
+
+    def wait(self, timeout: float) -> Set[str]:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size : offset + EVENT_HEADER.size + length].rstrip(b'\0')
+            offset += EVENT_HEADER.size + length
+            if mask & IN_Q_OVERFLOW:
+                # Часть событий потеряна, поэтому изменившимися считаются все репозитории
+                return set(self.git_dirs)
+            if wd not in self._watches:
+                continue
+            git_dir, path, is_root = self._watches[wd]
+            name = os.fsdecode(name)
+            if is_root:
+                if name in ROOT_REF_FILES:
+                    changed.add(git_dir)
+            elif _is_ref_name(name):
+                changed.add(git_dir)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    try:
+                        self._watch_tree(git_dir, path / name)
+                    except OSError as e:
+                        logger.warning(f'Не удалось следить за {path / name}: {e}')
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _PollingSource:
+    """Изменения ссылок по сравнению времени изменения файлов через `interval` секунд."""
+
+    def __init__(self, git_dirs: Iterable[str], stopped: threading.Event, interval: float = POLL_INTERVAL):
+        self.git_dirs = list(git_dirs)
+        self.stopped = stopped
+        self.interval = interval
+        self._snapshots = {git_dir: self._snapshot(git_dir) for git_dir in self.git_dirs}
+        self._next_poll = time.monotonic() + interval
+
+    @staticmethod
+    def _snapshot(git_dir: str) -> Dict[str, Tuple[int, int]]:
+        paths = [os.path.join(git_dir, name) for name in ROOT_REF_FILES]
+        for directory, _, files in os.walk(os.path.join(git_dir, 'refs', 'heads')):
+            paths.extend(os.path.join(directory, name) for name in files if _is_ref_name(name))
+        snapshot = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout: float) -> Set[str]:
+        self.stopped.wait(min(timeout, max(self._next_poll - time.monotonic(), 0.0)))
+        if time.monotonic() < self._next_poll:
+            return set()
+        self._next_poll = time.monotonic() + self.interval
+        changed = set()
+        for git_dir in self.git_dirs:
+            snapshot = self._snapshot(git_dir)
+            if snapshot != self._snapshots[git_dir]:
+                self._snapshots[git_dir] = snapshot
+                changed.add(git_dir)
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class RefWatcher:
+    """Следит за ветками репозиториев и сообщает, в каких из них они изменились.
+
+    На Linux используется inotify, в остальных случаях — периодическая проверка файлов. Изменения
+    накапливаются, пока ссылки меняются чаще `debounce` секунд, и передаются в `on_change` одним
+    вызовом из фонового потока.
+    """
+
+    def __init__(
+        self,
+        git_dirs: Iterable[str],
+        on_change: Callable[[Set[str]], None],
+        debounce: float = DEBOUNCE_INTERVAL,
+        poll_interval: float = POLL_INTERVAL,
+        use_inotify: bool = True,
+    ):
+        self.git_dirs = list(dict.fromkeys(git_dirs))
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify and sys.platform.startswith('linux')
+        self._stopped: Optional[threading.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._stopped is not None
+
+    def _create_source(self, stopped: threading.Event):
+        if self.use_inotify:
+            try:
+                return _InotifySource(self.git_dirs)
+            except (OSError, AttributeError) as e:
+                logger.warning(f'inotify недоступен, изменения веток проверяются периодически: {e}')
+        return _PollingSource(self.git_dirs, stopped, self.poll_interval)
+
+    def start(self) -> None:
+        if self._stopped is None and self.git_dirs:
+            # У каждого запуска свое событие остановки, чтобы поток предыдущего запуска не продолжил работу
+            self._stopped = threading.Event()
+            source = self._create_source(self._stopped)
+            threading.Thread(target=self._run, args=(source, self._stopped), name='ref-watcher', daemon=True).start()
+
+    def stop(self) -> None:
+        if self._stopped is not None:
+            self._stopped.set()
+            self._stopped = None
+
+    def _run(self, source, stopped: threading.Event) -> None:
+        pending: Set[str] = set()
+        deadline = None
+        try:
+            while not stopped.is_set():
+                timeout = STOP_CHECK_INTERVAL if deadline is None else max(deadline - time.monotonic(), 0.0)
+                changed = source.wait(min(timeout, STOP_CHECK_INTERVAL))
+                if changed:
+                    pending |= changed
+                    deadline = time.monotonic() + self.debounce
+                elif deadline is not None and time.monotonic() >= deadline:
+                    try:
+                        self.on_change(pending)
+                    except Exception as e:
+                        logger.error(f'Ошибка обработки изменения веток: {e}')
+                    pending, deadline = set(), None
+        except OSError as e:
+            logger.error(f'Наблюдение за ветками остановлено: {e}')
+        finally:
+            source.close()
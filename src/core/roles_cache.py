@@ -0,0 +1,49 @@
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+ROLES_CACHE_TTL = 24 * 60 * 60  # секунды
+
+
+class RolesCache:
+    """Роли пользователей Kaiten, сохраняемые между запусками.
+
+    Ключ кеша — URL и хеш токена, сам токен на диск не попадает.
+    """
+
+    def __init__(self, path: Path, ttl: float = ROLES_CACHE_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(url: str, token: str) -> str:
+        token_hash = hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]
+        return f'{url.strip().rstrip("/")}|{token_hash}'
+
+    def _read(self) -> dict:
+        try:
+            return json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, url: str, token: str) -> Tuple[Dict[int, str], bool]:
+        """Возвращает роли из кеша и признак того, что они еще не устарели."""
+        with self._lock:
+            cached = self._read().get(self._key(url, token))
+        if not cached:
+            return {}, False
+        roles = {role_id: name for role_id, name in cached['roles']}
+        return roles, time.time() - cached['fetched_at'] < self.ttl
+
+    def put(self, url: str, token: str, roles: Dict[int, str], now: Optional[float] = None) -> None:
+        with self._lock:
+            data = self._read()
+            data[self._key(url, token)] = {'fetched_at': now or time.time(), 'roles': list(roles.items())}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+            tmp_path.replace(self.path)
@@ -0,0 +1,70 @@
+import threading
+from datetime import datetime
+from typing import Callable, Optional
+
+from src.utils.logger import logger
+
+# Сон ограничен сверху: ожидание идет по монотонным часам, поэтому после перевода системных часов или
+# выхода из спящего режима напоминание запаздывает не больше чем на это время
+MAX_SLEEP_SECONDS = 60
+
+
+class NotificationScheduler:
+    """Поток, который спит до следующего напоминания вместо периодического опроса.
+
+    Если напоминание пропущено (например, компьютер был в спящем режиме), оно срабатывает
+    сразу после пробуждения, но только в тот же день. Несколько пропущенных напоминаний
+    объединяются в одно.
+    """
+
+    def __init__(
+        self,
+        get_next_time: Callable[[datetime], Optional[datetime]],
+        on_notification: Callable[[], None],
+        now: Callable[[], datetime] = datetime.now,
+    ):
+        self.get_next_time = get_next_time
+        self.on_notification = on_notification
+        self.now = now
+        self._last_checked = now()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='notification-scheduler', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def reschedule(self) -> None:
+        """Пересчитывает время напоминания, например после изменения настроек."""
+        self._wake.set()
+
+    def check(self) -> Optional[datetime]:
+        """Срабатывает, если время напоминания наступило, и возвращает время следующего."""
+        now = self.now()
+        target = self.get_next_time(self._last_checked)
+        if target is None or now < target:
+            return target
+        self._last_checked = now
+        if target.date() == now.date():
+            self.on_notification()
+        else:
+            logger.info(f'Пропущено напоминание за {target:%d.%m.%Y %H:%M}')
+        return self.get_next_time(now)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                target = self.check()
+            except Exception as e:
+                logger.error(f'Ошибка планировщика уведомлений: {e}')
+                target = None
+            timeout = MAX_SLEEP_SECONDS
+            if target is not None:
+                timeout = min(max((target - self.now()).total_seconds(), 0), MAX_SLEEP_SECONDS)
+            if self._wake.wait(timeout):
+                self._wake.clear()
+                self._last_checked = max(self._last_checked, self.now())
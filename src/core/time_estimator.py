@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+SESSION_GAP = timedelta(minutes=90)  # больший перерыв между коммитами начинает новую сессию работы
+SESSION_LEAD_IN = timedelta(minutes=30)  # работа до первого коммита сессии
+ROUNDING_STEP = 5  # минуты
+
+
+def _sorted_by_minute(commit_times_by_card: Dict[int, Iterable[datetime]]) -> List[Tuple[int, int]]:
+    """Коммиты (минута, карточка) по возрастанию времени.
+
+    Сортировка подсчетом по минутам: коммиты одного дня укладываются в 1440 корзин, поэтому
+    упорядочивание линейно по числу коммитов.
+    """
+    commits = [
+        (int(commit_time.timestamp()) // 60, card_id)
+        for card_id, commit_times in commit_times_by_card.items()
+        for commit_time in commit_times
+    ]
+    if not commits:
+        return []
+    first = min(minute for minute, _ in commits)
+    buckets: List[List[Tuple[int, int]]] = [[] for _ in range(max(minute for minute, _ in commits) - first + 1)]
+    for commit in commits:
+        buckets[commit[0] - first].append(commit)
+    return [commit for bucket in buckets for commit in bucket]
+
+
+def _round_to_total(raw_minutes: Dict[int, float], total_minutes: int, step: int) -> Dict[int, int]:
+    """Масштабирует минуты к `total_minutes` и округляет до `step` методом наибольшего остатка."""
+    raw_total = sum(raw_minutes.values())
+    units_total, leftover = divmod(total_minutes, step)
+    shares = {card_id: minutes * units_total / raw_total for card_id, minutes in raw_minutes.items()}
+    units = {card_id: int(share) for card_id, share in shares.items()}
+    by_remainder = sorted(shares, key=lambda card_id: shares[card_id] - units[card_id], reverse=True)
+    for card_id in by_remainder[: units_total - sum(units.values())]:
+        units[card_id] += 1
+    result = {card_id: count * step for card_id, count in units.items()}
+    # Остаток меньше шага округления достается карточке с наибольшим временем
+    result[max(result, key=result.get)] += leftover
+    return result
+
+
+def estimate_time(
+    commit_times_by_card: Dict[int, Iterable[datetime]],
+    total_minutes: int,
+    gap: timedelta = SESSION_GAP,
+    lead_in: timedelta = SESSION_LEAD_IN,
+    step: int = ROUNDING_STEP,
+) -> Dict[int, int]:
+    """Распределяет `total_minutes` между карточками по времени их коммитов.
+
+    Коммиты всех карточек упорядочиваются по времени и делятся на сессии по перерывам больше `gap`.
+    Время от предыдущего коммита сессии до текущего относится к карточке текущего коммита, первый
+    коммит сессии получает `lead_in`. Полученные минуты масштабируются так, чтобы в сумме дать
+    `total_minutes`.
+    """
+    commits = _sorted_by_minute(commit_times_by_card)
+    if not commits or total_minutes <= 0:
+        return {}
+
+    gap_minutes = gap.total_seconds() / 60
+    lead_in_minutes = lead_in.total_seconds() / 60
+    raw_minutes: Dict[int, float] = {}
+    previous = None
+    for minute, card_id in commits:
+        elapsed = minute - previous if previous is not None else None
+        spent = elapsed if elapsed is not None and elapsed <= gap_minutes else lead_in_minutes
+        raw_minutes[card_id] = raw_minutes.get(card_id, 0.0) + spent
+        previous = minute
+    # Карточка, закоммиченная в ту же минуту, что и другая, все равно получает немного времени
+    raw_minutes = {card_id: max(minutes, step) for card_id, minutes in raw_minutes.items()}
+    return _round_to_total(raw_minutes, total_minutes, step)
@@ -1,25 +1,134 @@
-from datetime import date, datetime
-from typing import Optional
+import json
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Set
 
 import holidays
 
+from src.utils.logger import logger
+
+MAX_LOOKAHEAD_DAYS = 366
+
+
+class _YearTable:
+    """Рабочие дни года: битовая карта по дню года и отсортированный массив ординалов."""
+
+    __slots__ = ('first_ordinal', 'bitmap', 'ordinals')
+
+    def __init__(self, first_ordinal: int, bitmap: bytearray, ordinals: array):
+        self.first_ordinal = first_ordinal
+        self.bitmap = bitmap
+        self.ordinals = ordinals
+
 
 class WorkCalendar:
-    def __init__(self):
+    """Производственный календарь с таблицами рабочих дней, построенными один раз на год.
+
+    Поверх праздников из `holidays` можно задать собственные исключения в JSON-файле:
+
+        {
+            "days_off": ["2025-07-14..2025-07-27", "2025-08-01"],
+            "working_days": ["2025-11-01"],
+            "short_days": {"2025-12-30": 7}
+        }
+
+    `days_off` — отпуск и другие личные выходные, `working_days` — рабочие дни, которые иначе
+    считались бы выходными, `short_days` — сокращенные дни с количеством рабочих часов.
+    """
+
+    def __init__(self, overrides_path: Optional[Path] = None):
         self.calendar = holidays.country_holidays('Russia')
+        self.days_off: Set[date] = set()
+        self.working_days: Set[date] = set()
+        self.short_days: Dict[date, float] = {}
+        self._years: Dict[int, _YearTable] = {}
+        if overrides_path:
+            self._load_overrides(Path(overrides_path))
+
+    def _load_overrides(self, path: Path) -> None:
+        if not path.exists():
+            return
+        try:
+            overrides = json.loads(path.read_text(encoding='utf-8'))
+            self.days_off = set(self._parse_days(overrides.get('days_off', [])))
+            self.working_days = set(self._parse_days(overrides.get('working_days', [])))
+            self.short_days = {
+                date.fromisoformat(day): float(hours) for day, hours in overrides.get('short_days', {}).items()
+            }
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning(f'Не удалось загрузить исключения календаря из {path}: {e}')
+
+    @staticmethod
+    def _parse_days(values: Iterable[str]) -> Iterator[date]:
+        for value in values:
+            start, _, end = value.partition('..')
+            day = date.fromisoformat(start.strip())
+            last_day = date.fromisoformat(end.strip()) if end else day
+            while day <= last_day:
+                yield day
+                day += timedelta(days=1)
+
+    def _year(self, year: int) -> _YearTable:
+        table = self._years.get(year)
+        if table is None:
+            first_day = date(year, 1, 1)
+            days_in_year = (date(year + 1, 1, 1) - first_day).days
+            bitmap = bytearray(days_in_year)
+            ordinals = array('i')
+            for offset in range(days_in_year):
+                day = first_day + timedelta(days=offset)
+                if day in self.working_days or (day not in self.days_off and self.calendar.is_working_day(day)):
+                    bitmap[offset] = 1
+                    ordinals.append(day.toordinal())
+            table = self._years[year] = _YearTable(first_day.toordinal(), bitmap, ordinals)
+        return table
 
     def is_working_day(self, date_to_check: Optional[date] = None) -> bool:
         date_to_check = date_to_check or date.today()
-        return self.calendar.is_working_day(date_to_check)
+        table = self._year(date_to_check.year)
+        return bool(table.bitmap[date_to_check.toordinal() - table.first_ordinal])
 
-    def should_show_notification(self, notification_time: str) -> bool:
-        if not self.is_working_day():
-            return False
+    def count_working_days(self, start: date, end: date) -> int:
+        """Количество рабочих дней в интервале [`start`, `end`]."""
+        count = 0
+        for year in range(start.year, end.year + 1):
+            ordinals = self._year(year).ordinals
+            count += bisect_right(ordinals, end.toordinal()) - bisect_left(ordinals, start.toordinal())
+        return max(count, 0)
 
-        try:
-            target_hour, target_minute = map(int, notification_time.split(':'))
-            current_time = datetime.now().time()
-            return current_time.hour == target_hour and current_time.minute == target_minute
+    def iter_working_days(self, start: date, end: date) -> Iterator[date]:
+        for year in range(start.year, end.year + 1):
+            ordinals = self._year(year).ordinals
+            for index in range(bisect_left(ordinals, start.toordinal()), bisect_right(ordinals, end.toordinal())):
+                yield date.fromordinal(ordinals[index])
+
+    def next_working_day(self, after: date, inclusive: bool = False) -> Optional[date]:
+        """Ближайший рабочий день после `after` (или начиная с него при `inclusive`)."""
+        ordinal = after.toordinal()
+        for year in range(after.year, after.year + 2):
+            ordinals = self._year(year).ordinals
+            index = bisect_left(ordinals, ordinal) if inclusive else bisect_right(ordinals, ordinal)
+            if index < len(ordinals):
+                return date.fromordinal(ordinals[index])
+        return None
+
+    def working_hours(self, day: date, default_hours: float) -> float:
+        if not self.is_working_day(day):
+            return 0.0
+        return self.short_days.get(day, default_hours)
 
-        except ValueError:
-            return False
+    def next_notification_time(self, notification_times: Iterable[time], after: datetime) -> Optional[datetime]:
+        """Ближайшее время напоминания строго после `after` в рабочий день."""
+        notification_times = sorted(notification_times)
+        if not notification_times:
+            return None
+        day = self.next_working_day(after.date(), inclusive=True)
+        while day and (day - after.date()).days < MAX_LOOKAHEAD_DAYS:
+            for notification_time in notification_times:
+                candidate = datetime.combine(day, notification_time)
+                if candidate > after:
+                    return candidate
+            day = self.next_working_day(day)
+        return None
@@ -0,0 +1,53 @@
+import tkinter as tk
+from datetime import date, datetime, timedelta
+from tkinter import messagebox, ttk
+from typing import Callable
+
+DATE_FORMAT = '%d.%m.%Y'
+
+
+class BackfillWindow(tk.Toplevel):
+    """Выбор периода, за который нужно заполнить пропущенное время."""
+
+    def __init__(self, parent, on_confirm: Callable[[date, date], None]):
+        super().__init__(parent)
+        self.on_confirm = on_confirm
+
+        self.title('Учет времени за период')
+
+        window_width = 320
+        window_height = 220
+        screen_width = self.winfo_screenwidth()
+        screen_height = self.winfo_screenheight()
+        x = (screen_width - window_width) // 2
+        y = (screen_height - window_height) // 2
+        self.geometry(f'{window_width}x{window_height}+{x}+{y}')
+
+        today = date.today()
+
+        start_label = ttk.Label(self, text='С (ДД.ММ.ГГГГ):', style='Settings.TLabel')
+        start_label.pack(padx=5, pady=5)
+        self.start_var = tk.StringVar(value=(today - timedelta(days=7)).strftime(DATE_FORMAT))
+        ttk.Entry(self, textvariable=self.start_var, width=12, style='Settings.TEntry').pack(padx=5, pady=5)
+
+        end_label = ttk.Label(self, text='По (ДД.ММ.ГГГГ):', style='Settings.TLabel')
+        end_label.pack(padx=5, pady=5)
+        self.end_var = tk.StringVar(value=today.strftime(DATE_FORMAT))
+        ttk.Entry(self, textvariable=self.end_var, width=12, style='Settings.TEntry').pack(padx=5, pady=5)
+
+        ttk.Button(self, text='Загрузить коммиты', command=self.confirm, style='Settings.TButton').pack(padx=5, pady=15)
+
+    def confirm(self):
+        try:
+            start = datetime.strptime(self.start_var.get().strip(), DATE_FORMAT).date()
+            end = datetime.strptime(self.end_var.get().strip(), DATE_FORMAT).date()
+        except ValueError:
+            messagebox.showwarning('Ошибка валидации', 'Даты должны быть в формате ДД.ММ.ГГГГ', parent=self)
+            return
+        if start > end or end > date.today():
+            messagebox.showwarning(
+                'Ошибка валидации', 'Начало периода должно быть не позже конца, а конец — не позже сегодня', parent=self
+            )
+            return
+        self.destroy()
+        self.on_confirm(start, end)
@@ -0,0 +1,96 @@
+import queue
+import threading
+import tkinter as tk
+from typing import Callable, Iterator, List, Optional, TypeVar
+
+from src.utils.logger import logger
+
+T = TypeVar('T')
+
+POLL_INTERVAL_MS = 30
+MAX_RESULTS_PER_TICK = 8
+
+_RESULT = 'result'
+_DONE = 'done'
+_ERROR = 'error'
+
+
+class BackgroundLoader:
+    """Выполняет загрузку, например сканирование коммитов, в фоновом потоке и передает результаты в поток Tk.
+
+    Фоновый поток не обращается к Tk: результаты забираются из очереди в `root.after` порциями
+    не больше `MAX_RESULTS_PER_TICK`, чтобы окно оставалось отзывчивым. Новый `start` отменяет
+    текущую загрузку, а ее запоздавшие результаты отбрасываются по номеру поколения.
+    """
+
+    def __init__(
+        self,
+        root: tk.Misc,
+        on_results: Callable[[List[T]], None],
+        on_done: Callable[[Optional[Exception]], None],
+        name: str = 'background-loader',
+    ):
+        self.root = root
+        self.on_results = on_results
+        self.on_done = on_done
+        self.name = name
+        self._queue: queue.Queue = queue.Queue()
+        self._generation = 0
+        self._cancelled: Optional[threading.Event] = None
+        self._after_id: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._cancelled is not None
+
+    def start(self, load: Callable[[threading.Event], Iterator[T]]) -> None:
+        """Запускает `load(cancelled)` в фоне. Вызывается только из потока Tk."""
+        self.cancel()
+        self._generation += 1
+        self._cancelled = threading.Event()
+        threading.Thread(
+            target=self._run, args=(self._generation, load, self._cancelled), name=self.name, daemon=True
+        ).start()
+        if self._after_id is None:
+            self._after_id = self.root.after(POLL_INTERVAL_MS, self._drain)
+
+    def cancel(self) -> None:
+        if self._cancelled is not None:
+            self._cancelled.set()
+            self._cancelled = None
+
+    def _run(self, generation: int, load: Callable[[threading.Event], Iterator[T]], cancelled: threading.Event):
+        try:
+            for result in load(cancelled):
+                if cancelled.is_set():
+                    return
+                self._queue.put((generation, _RESULT, result))
+            self._queue.put((generation, _DONE, None))
+        except Exception as e:
+            logger.error(f'Ошибка фоновой загрузки ({self.name}): {e}')
+            self._queue.put((generation, _ERROR, e))
+
+    def _drain(self):
+        self._after_id = None
+        results = []
+        finished, error = False, None
+        for _ in range(MAX_RESULTS_PER_TICK):
+            try:
+                generation, kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._generation or not self.running:
+                continue
+            if kind == _RESULT:
+                results.append(payload)
+            else:
+                finished, error = True, payload
+                break
+
+        if results:
+            self.on_results(results)
+        if finished:
+            self._cancelled = None
+            self.on_done(error)
+        if self.running or not self._queue.empty():
+            self._after_id = self.root.after(POLL_INTERVAL_MS, self._drain)
@@ -1,12 +1,25 @@
 import re
 import tkinter as tk
 import webbrowser
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from tkinter import font as tkfont
 from tkinter import messagebox, ttk
-from typing import Callable, List, Optional, Tuple
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
 
 from src.core.config import config
+from src.core.models import CardInfo
+from src.ui.backfill_window import DATE_FORMAT
+from src.utils.time_parser import parse_duration, parse_duration_or_zero
 
 CARD_ID_REGEX = re.compile(r'card/(\d+)|kaiten\.ru/(\d{6,})\b|^(\d{6,})$')
+COMMITS_FONT = ('Consolas', 9)
+MAX_COMMIT_LINES = 12
+MAX_TITLE_LENGTH = 70
+ROW_PADX = 10
+ROW_PADY = 7
+OVERSCAN_PX = 300  # строки чуть за границей окна создаются заранее, чтобы прокрутка была плавной
 
 
 class ScrollableFrame(ttk.Frame):
@@ -17,7 +30,7 @@ class ScrollableFrame(ttk.Frame):
         self.rowconfigure(0, weight=1)
 
         self.canvas = tk.Canvas(self, borderwidth=0, highlightthickness=0)
-        scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.canvas.yview)
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.canvas.yview)
 
         self.scrollable_frame = ttk.Frame(self.canvas)
         self.scrollable_frame.bind('<Configure>', lambda e: self.canvas.configure(scrollregion=self.canvas.bbox('all')))
@@ -32,10 +45,10 @@ class ScrollableFrame(ttk.Frame):
 
         self.canvas.bind('<Configure>', self._on_canvas_configure)
 
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
 
         self.canvas.grid(row=0, column=0, sticky='nsew')
-        scrollbar.grid(row=0, column=1, sticky='ns')
+        self.scrollbar.grid(row=0, column=1, sticky='ns')
 
         self.bind_mouse_wheel()
 
@@ -51,89 +64,131 @@ class ScrollableFrame(ttk.Frame):
         self.canvas.bind_all('<MouseWheel>', _on_mousewheel)
 
 
-class BranchTimeEntry(ttk.Frame):
-    """Виджет для ввода времени, потраченного на работу в ветке."""
+@dataclass(eq=False)
+class BranchEntry:
+    """Данные строки списка веток.
+
+    Виджеты строк переиспользуются при прокрутке, поэтому введенное время и отредактированное
+    описание хранятся здесь, а не в виджете.
+    """
+
+    branch_name: str
+    card_id: int
+    commits: List[str]
+    for_date: Optional[date] = None
+    time_spent: str = ''
+    description: Optional[str] = None  # None — описание собирается из коммитов
+    key: Hashable = None
+    card: Optional[CardInfo] = None  # сведения из Kaiten, пока не загружены — None
+    minutes: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.key is None:
+            self.key = (self.for_date, self.card_id)
+        self.minutes = parse_duration_or_zero(self.time_spent, config.working_time)
+
+    def set_time_spent(self, time_spent: str) -> int:
+        """Сохраняет введенное время и возвращает изменение в минутах."""
+        minutes = parse_duration_or_zero(time_spent, config.working_time)
+        delta = minutes - self.minutes
+        self.time_spent, self.minutes = time_spent, minutes
+        return delta
+
+    @property
+    def text(self) -> str:
+        return self.description if self.description is not None else '\n'.join(self.commits)
+
+    @property
+    def text_lines(self) -> int:
+        return min(max(len(self.commits) + 1, 3), MAX_COMMIT_LINES)
+
+    def update_from(self, other: 'BranchEntry') -> bool:
+        """Обновляет данные из git, сохраняя введенные пользователем значения. Возвращает признак изменений."""
+        if (self.branch_name, self.commits, self.for_date) == (other.branch_name, other.commits, other.for_date):
+            return False
+        self.branch_name = other.branch_name
+        self.commits = other.commits
+        self.for_date = other.for_date
+        return True
 
-    def __init__(
-        self,
-        parent: ScrollableFrame,
-        branch_name: str,
-        card_id: int,
-        commits: List[str],
-        on_time_change: Callable = None,
-    ):
-        self.card_id = card_id
-        self.on_time_change = on_time_change
-        super().__init__()
+    def get_data(self) -> Tuple[int, int, str]:
+        return self.card_id, self.get_time_minutes(), self.text.strip()
 
-        self.frame = tk.Frame(
-            parent.scrollable_frame,
-            borderwidth=1,
-            relief='solid',
-            bg='#ffffff',
-        )
-        self.frame.pack(fill=tk.X, padx=10, pady=7, ipady=10)
-        self.frame.columnconfigure(0, weight=1)
+    def get_time_minutes(self) -> int:
+        return self.minutes
 
-        info_frame = ttk.Frame(self.frame)
+
+class BranchTimeEntry(tk.Frame):
+    """Виджет для ввода времени, потраченного на работу в ветке.
+
+    Отображает одну запись `BranchEntry` и может быть привязан к другой записи через `bind_entry`.
+    """
+
+    def __init__(self, parent: tk.Widget, on_time_change: Callable[[BranchEntry, int], None] = None):
+        super().__init__(parent, borderwidth=1, relief='solid', bg='#ffffff', pady=10)
+        self.on_time_change = on_time_change
+        self.entry: Optional[BranchEntry] = None
+        self._binding = False
+        self.columnconfigure(0, weight=1)
+
+        info_frame = ttk.Frame(self)
         info_frame.grid(row=0, column=0, sticky='ew', padx=15, pady=(10, 5))
         info_frame.columnconfigure(1, weight=1)
 
-        branch_label = ttk.Label(info_frame, text=f'🔀 {branch_name}', font=('Segoe UI', 11, 'bold'))
-        branch_label.grid(row=0, column=0, sticky='w')
+        self.branch_label = ttk.Label(info_frame, font=('Segoe UI', 11, 'bold'))
+        self.branch_label.grid(row=0, column=0, sticky='w')
 
-        ttk.Label(info_frame).grid(row=0, column=1, sticky='ew')
+        self.title_label = ttk.Label(info_frame, font=('Segoe UI', 10))
+        self.title_label.grid(row=0, column=1, sticky='ew', padx=10)
 
         card_frame = ttk.Frame(info_frame)
         card_frame.grid(row=0, column=2, sticky='e')
 
-        card_label = tk.Label(
+        self.card_label = tk.Label(
             card_frame,
-            text=f'#{self.card_id}',
             font=('Segoe UI', 10),
             fg='#0066cc',
             cursor='hand2',
         )
-        card_label.pack()
+        self.card_label.pack()
 
         def open_card(event):
-            webbrowser.open(f'{config.kaiten_url}/{self.card_id}')
+            if self.entry:
+                webbrowser.open(f'{config.kaiten_url}/{self.entry.card_id}')
 
-        card_label.bind('<Button-1>', open_card)
+        self.card_label.bind('<Button-1>', open_card)
 
         def on_enter(event):
-            card_label.configure(fg='#003366')
+            self.card_label.configure(fg='#003366')
 
         def on_leave(event):
-            card_label.configure(fg='#0066cc')
+            self.card_label.configure(fg='#0066cc')
 
-        card_label.bind('<Enter>', on_enter)
-        card_label.bind('<Leave>', on_leave)
+        self.card_label.bind('<Enter>', on_enter)
+        self.card_label.bind('<Leave>', on_leave)
 
-        commits_frame = ttk.Frame(self.frame)
+        commits_frame = ttk.Frame(self)
         commits_frame.grid(row=1, column=0, sticky='ew', padx=15, pady=(5, 10))
         commits_frame.columnconfigure(0, weight=1)
 
         self.commits_text = tk.Text(
             commits_frame,
-            height=max(len(commits) + 1, 3),
+            height=3,
             wrap=tk.WORD,
-            font=('Consolas', 9),
+            font=COMMITS_FONT,
             borderwidth=1,
             relief='solid',
             padx=8,
             pady=8,
         )
         self.commits_text.grid(row=0, column=0, sticky='ew')
-
-        for message in commits:
-            self.commits_text.insert(tk.END, f'{message}\n')
+        self.commits_text.bind('<<Modified>>', self._on_text_change)
 
         scrollbar = tk.Scrollbar(commits_frame, orient='vertical', command=self.commits_text.yview)
         self.commits_text.config(yscrollcommand=scrollbar.set)
         scrollbar.grid(row=0, column=1, sticky='ns')
 
-        time_frame = ttk.Frame(self.frame)
+        time_frame = ttk.Frame(self)
         time_frame.grid(row=2, column=0, sticky='w', padx=15, pady=(0, 10))
 
         time_label = ttk.Label(time_frame, text='⏱️ Время:', font=('Segoe UI', 10))
@@ -144,108 +199,223 @@ class BranchTimeEntry(ttk.Frame):
         time_entry = ttk.Entry(time_frame, textvariable=self.time_var, width=10, font=('Segoe UI', 10))
         time_entry.pack(side=tk.LEFT, padx=5)
 
+    def bind_entry(self, entry: BranchEntry):
+        """Показывает запись `entry`, не вызывая обработчики изменений."""
+        self._binding = True
+        try:
+            self.entry = entry
+            branch_text = f'🔀 {entry.branch_name}'
+            if entry.for_date:
+                branch_text = f'📅 {entry.for_date:%d.%m.%Y}  {branch_text}'
+            self.branch_label.configure(text=branch_text)
+            self.card_label.configure(text=f'#{entry.card_id}')
+            self._show_card(entry.card)
+            self.commits_text.configure(height=entry.text_lines)
+            self.commits_text.delete('1.0', tk.END)
+            self.commits_text.insert('1.0', entry.text)
+            self.commits_text.edit_modified(False)
+            self.time_var.set(entry.time_spent)
+        finally:
+            self._binding = False
+
+    def _show_card(self, card: Optional[CardInfo]):
+        if card is None:
+            self.title_label.configure(text='', foreground='')
+        elif not card.exists:
+            self.title_label.configure(text='⚠️ Карточка не найдена в Kaiten', foreground='#cc0000')
+        elif not card.accessible:
+            self.title_label.configure(text='🔒 Нет доступа к карточке в Kaiten', foreground='#cc0000')
+        else:
+            title = card.title if len(card.title) <= MAX_TITLE_LENGTH else f'{card.title[: MAX_TITLE_LENGTH - 1]}…'
+            details = ' · '.join(part for part in (card.board, card.status) if part)
+            self.title_label.configure(text=f'{title}  ({details})' if details else title, foreground='#555555')
+
+    def _on_text_change(self, event=None):
+        if not self.commits_text.edit_modified():
+            return
+        if self.entry and not self._binding:
+            self.entry.description = self.commits_text.get('1.0', 'end-1c')
+        self.commits_text.edit_modified(False)
+
     def _on_time_change(self, *args):
+        if self._binding or not self.entry:
+            return
+        delta = self.entry.set_time_spent(self.time_var.get())
         if self.on_time_change:
-            self.on_time_change()
+            self.on_time_change(self.entry, delta)
 
-    def get_data(self) -> Tuple[int, int, str]:
-        hours, minutes = self._prepare_time(self.time_var.get())
-        total_minutes = hours * 60 + minutes
-        return self.card_id, total_minutes, self.commits_text.get('1.0', tk.END).strip()
+    @staticmethod
+    def parse_time(time_str: str) -> Tuple[int, int]:
+        """Парсит строку времени в часы и минуты, форматы описаны в `parse_duration`."""
+        return divmod(parse_duration(time_str, config.working_time), 60)
 
-    def get_time_minutes(self) -> int:
-        hours, minutes = self._prepare_time(self.time_var.get())
-        return hours * 60 + minutes
 
-    @staticmethod
-    def _prepare_time(time_spent: str) -> tuple[int, int]:
+class VirtualBranchList(ScrollableFrame):
+    """Прокручиваемый список веток, в котором виджеты создаются только для видимых строк.
+
+    Над строками остается обычная область `scrollable_frame` для произвольных виджетов. При
+    прокрутке виджеты ушедших из вида строк переиспользуются для появившихся, а `set_entries`
+    перерисовывает только строки с изменившимися данными.
+    """
+
+    def __init__(self, container, on_time_change: Callable[[BranchEntry], None] = None, *args, **kwargs):
+        super().__init__(container, *args, **kwargs)
+        self.on_time_change = on_time_change
+        self.entries: List[BranchEntry] = []
+        self.total_minutes = 0
+        self._offsets: List[int] = [0]
+        self._visible: Dict[Hashable, BranchTimeEntry] = {}
+        self._pool: List[BranchTimeEntry] = []
+        self._items: Dict[BranchTimeEntry, int] = {}
+        self._dirty: Set[Hashable] = set()
+        self._header_height = 0
+        self._row_base_height: Optional[int] = None
+        self._line_height = tkfont.Font(font=COMMITS_FONT).metrics('linespace')
+
+        # Высота прокрутки считается по размерам строк, а не через bbox('all') на каждый <Configure>
+        self.scrollable_frame.bind('<Configure>', self._on_header_configure)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+
+    def set_entries(self, entries: List[BranchEntry]):
+        """Заменяет список записей; существующие записи с тем же ключом сохраняют введенные данные."""
+        current = {entry.key: entry for entry in self.entries}
+        result = []
+        for entry in entries:
+            existing = current.get(entry.key)
+            if existing is None:
+                self._dirty.add(entry.key)
+                result.append(entry)
+            else:
+                if existing.update_from(entry):
+                    self._dirty.add(entry.key)
+                result.append(existing)
+        self.entries = result
+        self.total_minutes = sum(entry.minutes for entry in result)
+        self._relayout()
+
+    def add_entry(self, entry: BranchEntry):
+        self.entries.append(entry)
+        self.total_minutes += entry.minutes
+        self._dirty.add(entry.key)
+        self._relayout()
+
+    def update_cards(self, cards: Dict[int, CardInfo]):
+        """Показывает сведения о карточках в строках с этими карточками."""
+        for entry in self.entries:
+            card = cards.get(entry.card_id)
+            if card is not None and card != entry.card:
+                entry.card = card
+                self._dirty.add(entry.key)
+        self._refresh_visible()
+
+    def fill_time(self, values: Dict[Hashable, str]):
+        """Заполняет время записей по ключам, например рассчитанное по коммитам."""
+        for entry in self.entries:
+            if entry.key in values:
+                self.total_minutes += entry.set_time_spent(values[entry.key])
+                self._dirty.add(entry.key)
+        self._refresh_visible()
+
+    def _row_height(self, entry: BranchEntry) -> int:
+        return self._row_base_height + entry.text_lines * self._line_height + 2 * ROW_PADY
+
+    def _measure_rows(self):
+        """Высота строки без текста коммитов измеряется один раз на первом созданном виджете."""
+        if self._row_base_height is not None or not self.entries:
+            return
+        row = self._acquire_row()
+        row.bind_entry(self.entries[0])
+        row.update_idletasks()
+        self._row_base_height = row.winfo_reqheight() - self.entries[0].text_lines * self._line_height
+        self._release_row(row)
+
+    def _relayout(self):
+        self._measure_rows()
+        offsets = [0]
+        for entry in self.entries:
+            offsets.append(offsets[-1] + self._row_height(entry))
+        self._offsets = offsets
+        self.canvas.configure(
+            scrollregion=(0, 0, self.canvas.winfo_width(), self._header_height + offsets[-1]),
+        )
+        self._refresh_visible()
+
+    def _refresh_visible(self):
+        visible_top = self.canvas.canvasy(0) - self._header_height - OVERSCAN_PX
+        visible_bottom = self.canvas.canvasy(self.canvas.winfo_height()) - self._header_height + OVERSCAN_PX
+        first = max(bisect_right(self._offsets, visible_top) - 1, 0)
+        last = min(bisect_left(self._offsets, visible_bottom), len(self.entries))
+        wanted = {self.entries[index].key: index for index in range(first, last)}
+        # Строка с фокусом ввода не переиспользуется, иначе ввод попадет в другую запись или пропадет
+        focused = self._focused_key()
+        if focused is not None and focused not in wanted:
+            for index, entry in enumerate(self.entries):
+                if entry.key == focused:
+                    wanted[focused] = index
+                    break
+
+        for key in [key for key in self._visible if key not in wanted]:
+            self._release_row(self._visible.pop(key))
+
+        width = max(self.canvas.winfo_width() - 2 * ROW_PADX, 1)
+        for key, index in wanted.items():
+            row = self._visible.get(key)
+            if row is None:
+                row = self._visible[key] = self._acquire_row()
+                row.bind_entry(self.entries[index])
+            elif key in self._dirty or row.entry is not self.entries[index]:
+                row.bind_entry(self.entries[index])
+            y = self._header_height + self._offsets[index] + ROW_PADY
+            self.canvas.coords(self._items[row], ROW_PADX, y)
+            self.canvas.itemconfigure(self._items[row], width=width)
+        self._dirty.clear()
+
+    def _focused_key(self) -> Optional[Hashable]:
+        """Ключ записи видимой строки, в которой находится фокус ввода."""
         try:
-            if time_spent.isdigit():
-                return int(time_spent), 0
-            hours, minutes = BranchTimeEntry.parse_time(time_spent)
-            return hours, minutes
-        except (ValueError, AttributeError):
-            return 0, 0
+            focus = self.focus_get()
+        except KeyError:
+            # focus_get не находит виджеты некоторых системных диалогов
+            return None
+        if focus is None:
+            return None
+        for key, row in self._visible.items():
+            if str(focus).startswith(f'{row}.'):
+                return key
+        return None
 
-    @staticmethod
-    def parse_time(time_str: str) -> Tuple[int, int]:
-        """Парсит строку времени в часы и минуты.
-
-        Поддерживаемые форматы:
-        - 13:30 (часы:минуты)
-        - 1h30m, 1ч30м (часы и минуты без пробелов)
-        - 1h 30m, 1ч 30м (часы и минуты с пробелами)
-        - 1h, 1ч (только часы)
-        - 30m, 30м (только минуты)
-        - 1.5h, 1.5ч (десятичные часы)
-        - 90m, 90м (минуты больше 60)
-        - 5 (целое число как часы)
-        """
-        import re
-
-        if not time_str or not time_str.strip():
-            return 0, 0
-
-        time_str = time_str.strip()
-        hours = 0
-        minutes = 0
-
-        patterns = [
-            # 13:30, 1:0, 0:5
-            r'^(\d{1,2}):(\d{1,2})$',
-            # 1h30m, 1ч30м
-            r'^(\d+(?:\.\d+)?)[hч](\d+)[mм]$',
-            # 1h 30m, 1ч 30м
-            r'^(\d+(?:\.\d+)?)[hч]\s+(\d+)[mм]$',
-            # 1h, 1ч
-            r'^(\d+(?:\.\d+)?)[hч]$',
-            # 30m, 30м
-            r'^(\d+)[mм]$',
-            # 5 (целое число как часы)
-            r'^(\d+)$',
-        ]
-
-        for pattern in patterns:
-            match = re.match(pattern, time_str)
-            if match:
-                groups = match.groups()
-
-                if len(groups) == 2:
-                    if ':' in time_str:
-                        hours = int(groups[0])
-                        minutes = int(groups[1])
-                    else:
-                        hours = float(groups[0])
-                        minutes = int(groups[1])
-
-                        if hours != int(hours):
-                            total_minutes = int(hours * 60)
-                            hours = total_minutes // 60
-                            minutes += total_minutes % 60
-                        else:
-                            hours = int(hours)
-
-                elif len(groups) == 1:
-                    value = float(groups[0])
-
-                    if time_str.endswith(('h', 'ч')):
-                        if value != int(value):
-                            total_minutes = int(value * 60)
-                            hours = total_minutes // 60
-                            minutes = total_minutes % 60
-                        else:
-                            hours = int(value)
-                    elif time_str.endswith(('m', 'м')):
-                        minutes = int(value)
-                        if minutes >= 60:
-                            hours = minutes // 60
-                            minutes = minutes % 60
-                    else:
-                        hours = int(value)
-
-                return hours, minutes
-
-        raise ValueError(f'Неизвестный формат времени: {time_str}')
+    def _acquire_row(self) -> BranchTimeEntry:
+        if self._pool:
+            row = self._pool.pop()
+            self.canvas.itemconfigure(self._items[row], state='normal')
+            return row
+        row = BranchTimeEntry(self.canvas, on_time_change=self._on_row_time_change)
+        self._items[row] = self.canvas.create_window((ROW_PADX, 0), window=row, anchor='nw')
+        return row
+
+    def _release_row(self, row: BranchTimeEntry):
+        row.entry = None
+        self.canvas.itemconfigure(self._items[row], state='hidden')
+        self._pool.append(row)
+
+    def _on_row_time_change(self, entry: BranchEntry, delta: int):
+        # Общее время меняется на разницу только измененной записи, без пересчета всех строк
+        self.total_minutes += delta
+        if self.on_time_change:
+            self.on_time_change(entry)
+
+    def _on_header_configure(self, event):
+        if event.height != self._header_height:
+            self._header_height = event.height
+            self._relayout()
+
+    def _on_canvas_configure(self, event):
+        super()._on_canvas_configure(event)
+        self._relayout()
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._refresh_visible()
 
 
 class ManualTimeEntry(ttk.Frame):
@@ -255,6 +425,7 @@ class ManualTimeEntry(ttk.Frame):
         super().__init__()
         self.on_add_entry = on_add_entry
         self.on_time_change = on_time_change
+        self.period: Optional[Tuple[date, date]] = None
 
         self.frame = tk.Frame(
             parent.scrollable_frame,
@@ -304,6 +475,14 @@ class ManualTimeEntry(ttk.Frame):
         time_entry = ttk.Entry(input_frame, textvariable=self.time_var, width=10, font=('Segoe UI', 10))
         time_entry.grid(row=2, column=1, sticky='w', padx=5, pady=5)
 
+        # Дата, только при учете времени за период
+        self.date_label = ttk.Label(input_frame, text='Дата (ДД.ММ.ГГГГ):', font=('Segoe UI', 10))
+        self.date_label.grid(row=3, column=0, sticky='w', pady=5)
+        self.date_var = tk.StringVar()
+        self.date_entry = ttk.Entry(input_frame, textvariable=self.date_var, width=12, font=('Segoe UI', 10))
+        self.date_entry.grid(row=3, column=1, sticky='w', padx=5, pady=5)
+        self.set_period(None)
+
         # Кнопка добавления
         add_button = ttk.Button(
             input_frame,
@@ -311,21 +490,26 @@ class ManualTimeEntry(ttk.Frame):
             command=self.add_entry,
             style='Main.TButton',
         )
-        add_button.grid(row=3, column=1, sticky='e', pady=10)
+        add_button.grid(row=4, column=1, sticky='e', pady=10)
+
+    def set_period(self, period: Optional[Tuple[date, date]]):
+        """За период запись добавляется на указанный день, по умолчанию первый день периода."""
+        self.period = period
+        if period:
+            self.date_var.set(period[0].strftime(DATE_FORMAT))
+            self.date_label.grid()
+            self.date_entry.grid()
+        else:
+            self.date_var.set('')
+            self.date_label.grid_remove()
+            self.date_entry.grid_remove()
 
     def _on_time_change(self, *args):
         if self.on_time_change:
             self.on_time_change()
 
     def get_time_minutes(self) -> int:
-        time_spent = self.time_var.get()
-        if not time_spent:
-            return 0
-        try:
-            hours, minutes = BranchTimeEntry.parse_time(time_spent)
-            return hours * 60 + minutes
-        except (ValueError, AttributeError):
-            return 0
+        return parse_duration_or_zero(self.time_var.get(), config.working_time)
 
     def add_entry(self):
         """Обработчик нажатия кнопки добавления."""
@@ -339,20 +523,27 @@ class ManualTimeEntry(ttk.Frame):
         if not card_id.isdigit():
             messagebox.showwarning('Предупреждение', '"ID карточки" должно быть только числовым значением')
         try:
-            hours, minutes = BranchTimeEntry.parse_time(time_spent)
-            if not (0 <= hours <= 24 and 0 <= minutes <= 59):
+            if parse_duration(time_spent, config.working_time) > 24 * 60:
                 raise ValueError
         except ValueError:
             messagebox.showwarning(
                 title='Предупреждение',
                 message=(
                     'Не верный формат времени. '
-                    'Поддерживаемые форматы 13:30, 1h30m, 1ч30м, 1h 10m, 1ч 10м, 1h, 1ч, 10m, 10м или 1'
+                    'Поддерживаемые форматы 13:30, 1h30m, 1ч30м, 1h 10m, 1ч 10м, 1h, 1ч, 1.5h, 10m, 10м, 1d 2h или 1'
                 ),
             )
             return
-
-        self.on_add_entry(int(card_id), time_spent, description)
+        for_date = None
+        if self.period:
+            try:
+                for_date = self._parse_date(self.date_var.get(), self.period)
+            except ValueError:
+                start, end = (day.strftime(DATE_FORMAT) for day in self.period)
+                messagebox.showwarning('Предупреждение', f'Укажите дату с {start} по {end} в формате ДД.ММ.ГГГГ')
+                return
+
+        self.on_add_entry(int(card_id), time_spent, description, for_date)
         self.card_id_var.set('')
         self.desc_text.delete('1.0', tk.END)
         self.time_var.set('')
@@ -368,6 +559,13 @@ class ManualTimeEntry(ttk.Frame):
             pass
         return None
 
+    @staticmethod
+    def _parse_date(value: str, period: Tuple[date, date]) -> date:
+        day = datetime.strptime(value.strip(), DATE_FORMAT).date()
+        if not period[0] <= day <= period[1]:
+            raise ValueError(f'{day} вне периода')
+        return day
+
     @classmethod
     def _fetch_card_id(cls, value: str) -> Optional[str]:
         if match := CARD_ID_REGEX.search(value):
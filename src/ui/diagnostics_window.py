@@ -0,0 +1,101 @@
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk
+
+from src.utils.tracing import Tracer
+
+REFRESH_INTERVAL = 2000  # мс
+RECENT_LIMIT = 100
+
+
+class DiagnosticsWindow(tk.Toplevel):
+    """Длительность последних операций: git, запросов к Kaiten и построения окна."""
+
+    def __init__(self, parent, tracer: Tracer):
+        super().__init__(parent)
+        self.tracer = tracer
+
+        self.title('Диагностика')
+
+        window_width = 760
+        window_height = 520
+        screen_width = self.winfo_screenwidth()
+        screen_height = self.winfo_screenheight()
+        x = (screen_width - window_width) // 2
+        y = (screen_height - window_height) // 2
+        self.geometry(f'{window_width}x{window_height}+{x}+{y}')
+
+        ttk.Label(self, text='Сводка (мс)', style='Settings.TLabel').pack(anchor=tk.W, padx=5, pady=(5, 0))
+        self.stats_tree = self._create_tree(
+            [
+                ('name', 'Операция', 220),
+                ('count', 'Кол-во', 70),
+                ('last', 'Последняя', 90),
+                ('p50', 'p50', 90),
+                ('p95', 'p95', 90),
+                ('max', 'Макс.', 90),
+            ],
+            height=8,
+        )
+
+        ttk.Label(self, text='Последние операции', style='Settings.TLabel').pack(anchor=tk.W, padx=5, pady=(5, 0))
+        self.recent_tree = self._create_tree(
+            [('time', 'Время', 80), ('name', 'Операция', 200), ('duration', 'мс', 80), ('details', 'Подробности', 380)],
+            height=12,
+        )
+
+        buttons = ttk.Frame(self)
+        buttons.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(buttons, text='Очистить', command=self.clear, style='Settings.TButton').pack(side=tk.RIGHT)
+
+        self.refresh()
+
+    def _create_tree(self, columns, height: int) -> ttk.Treeview:
+        tree = ttk.Treeview(self, columns=[name for name, _, _ in columns], show='headings', height=height)
+        for name, title, width in columns:
+            tree.heading(name, text=title)
+            tree.column(name, width=width, anchor=tk.W if name in ('name', 'details') else tk.E)
+        tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        return tree
+
+    def refresh(self):
+        # Окно могло быть закрыто, пока ожидалось обновление
+        if not self.winfo_exists():
+            return
+        self._render()
+        self.after(REFRESH_INTERVAL, self.refresh)
+
+    def _render(self):
+        self.stats_tree.delete(*self.stats_tree.get_children())
+        for stats in self.tracer.stats():
+            self.stats_tree.insert(
+                '',
+                tk.END,
+                values=(
+                    stats.name,
+                    stats.count,
+                    f'{stats.last_ms:.1f}',
+                    f'{stats.p50_ms:.1f}',
+                    f'{stats.p95_ms:.1f}',
+                    f'{stats.max_ms:.1f}',
+                ),
+            )
+        self.recent_tree.delete(*self.recent_tree.get_children())
+        for record in self.tracer.recent(RECENT_LIMIT):
+            details = ', '.join(f'{key}={value}' for key, value in record.attributes.items())
+            if record.error:
+                details = f'ошибка {record.error}; {details}'
+            self.recent_tree.insert(
+                '',
+                tk.END,
+                values=(
+                    datetime.fromtimestamp(record.started_at).strftime('%H:%M:%S'),
+                    record.name,
+                    f'{record.duration * 1000:.1f}',
+                    details,
+                ),
+            )
+
+    def clear(self):
+        self.tracer.clear()
+        self._render()
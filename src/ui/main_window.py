@@ -1,19 +1,37 @@
 import threading
 import tkinter as tk
+from datetime import date, datetime
 from tkinter import messagebox, ttk
-from typing import List
-
-import pystray
-import schedule
-
-from src.core.config import config
-from src.core.git_manager import GitManager
-from src.core.kaiten_api import KaitenAPI
-from src.core.work_calendar import WorkCalendar
-from src.ui.components import BranchTimeEntry, ManualTimeEntry, ScrollableFrame
-from src.ui.settings_window import SettingsWindow
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple, TypeVar
+
+from src.core.card_cache import CardCache
+from src.core.config import (
+    CALENDAR_FILE,
+    CARD_CACHE_FILE,
+    COMMIT_INDEX_FILE,
+    OUTBOX_FILE,
+    ROLES_CACHE_FILE,
+    config,
+)
+from src.core.models import BranchCommits, CardInfo, TimeLogEntry, TimeLogResult
+from src.core.outbox import Outbox, OutboxWorker
+from src.core.roles_cache import RolesCache
+from src.core.scheduler import NotificationScheduler
+from src.ui.background_loader import BackgroundLoader
+from src.ui.components import BranchEntry, ManualTimeEntry, VirtualBranchList
 from src.utils.logger import logger
 from src.utils.resources import get_resource_path, safe_get_icon
+from src.utils.time_parser import format_duration
+from src.utils.tracing import Span, span, tracer
+
+# GitPython, requests и holidays загружаются при первом обращении к подсистемам, а не при запуске
+if TYPE_CHECKING:
+    from src.core.git_manager import GitWorkspace
+    from src.core.kaiten_api import KaitenAPI
+    from src.core.ref_watcher import RefWatcher
+    from src.core.work_calendar import WorkCalendar
+
+T = TypeVar('T')
 
 LOGO_PATH = get_resource_path('static\\clock.png')
 
@@ -22,13 +40,21 @@ class Application:
     def __init__(self):
         self.window_visible = False
         self.root = None
+        self.period: Optional[Tuple[date, date]] = None
+        self.days_count = 1
+        self._open_span: Optional[Span] = None
+        self.ref_watcher: Optional['RefWatcher'] = None
+        self._pending_refresh: Set[str] = set()
+        self._services: Dict[str, object] = {}
+        self._services_lock = threading.Lock()
         self.icon_image = safe_get_icon(LOGO_PATH, size=70)
+        self.roles_cache = RolesCache(ROLES_CACHE_FILE)
+        self.card_cache = CardCache(CARD_CACHE_FILE)
         self.setup_window()
         self.setup_tray()
-        self.setup_scheduler()
-        self._init_app()
-        self.branch_entries: List[BranchTimeEntry] = []
-        self._check_config()
+        self.scheduler = NotificationScheduler(self._next_notification_time, self._on_notification)
+        self.outbox = Outbox(OUTBOX_FILE)
+        self.outbox_worker = OutboxWorker(self.outbox, self._get_outbox_api, on_flush=self._on_outbox_flush)
 
     def _check_config(self):
         if not config.is_configured():
@@ -37,7 +63,7 @@ class Application:
                 'Для работы приложения необходимо настроить:\n'
                 '• Токен Kaiten API\n'
                 '• URL сервера Kaiten\n'
-                '• Путь к Git репозиторию\n'
+                '• Пути к Git репозиториям\n'
                 '• Роль пользователя\n\n'
                 'Открыть окно настроек?',
                 icon='question',
@@ -45,15 +71,71 @@ class Application:
             if result:
                 self.show_settings()
 
+    def _start_services(self):
+        self.outbox_worker.start()
+        self.scheduler.start()
+        self._check_config()
+
     def _init_app(self):
-        try:
-            self.work_calendar = WorkCalendar()
-            self.git_manager = GitManager(config.git_repo_path)
-            self.kaiten_api = KaitenAPI.from_credentials(config.kaiten_token, config.kaiten_url, config.role_id)
-        except Exception as e:
-            logger.error(f'Ошибка при инициализации менеджеров: {e}')
-            messagebox.showerror('Ошибка', 'Не удалось инициализировать приложение. Проверьте настройки.')
-            self.show_settings()
+        """Применяет новые настройки: подсистемы будут созданы заново при следующем обращении."""
+        self._close_services()
+        self._stop_ref_watcher()
+        self.outbox_worker.wake()
+        self.scheduler.reschedule()
+
+    def _close_services(self):
+        """Освобождает ресурсы подсистем, например соединения KaitenAPI, и забывает их."""
+        with self._services_lock:
+            services = list(self._services.values())
+            self._services.clear()
+        for service in services:
+            close = getattr(service, 'close', None)
+            if close:
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning(f'Ошибка при закрытии {type(service).__name__}: {e}')
+
+    def _get_service(self, name: str, factory: Callable[[], T]) -> T:
+        with self._services_lock:
+            if name not in self._services:
+                self._services[name] = factory()
+            return self._services[name]
+
+    @property
+    def work_calendar(self) -> 'WorkCalendar':
+        def create():
+            from src.core.work_calendar import WorkCalendar
+
+            return WorkCalendar(CALENDAR_FILE)
+
+        return self._get_service('work_calendar', create)
+
+    @property
+    def git_manager(self) -> 'GitWorkspace':
+        def create():
+            from src.core.commit_index import CommitIndex
+            from src.core.git_manager import GitWorkspace
+
+            return GitWorkspace(config.git_repo_paths, index=CommitIndex(COMMIT_INDEX_FILE))
+
+        return self._get_service('git_manager', create)
+
+    @property
+    def kaiten_api(self) -> 'KaitenAPI':
+        def create():
+            from src.core.kaiten_api import KaitenAPI
+
+            return KaitenAPI.from_credentials(
+                config.kaiten_token,
+                config.kaiten_url,
+                config.role_id,
+                timeout=(config.connect_timeout, config.read_timeout),
+                rate_limit=config.rate_limit,
+                burst=config.rate_burst,
+            )
+
+        return self._get_service('kaiten_api', create)
 
     def _setup_global_paste_shortcut(self):
         def _on_paste(event):
@@ -111,7 +193,13 @@ class Application:
         self.loading_label = ttk.Label(center_frame, text='Загрузка коммитов...', style='Main.TLabel')
         self.loading_label.pack(pady=10)
 
-        self.main_frame = ScrollableFrame(self.root)
+        self._total_time_after_id: Optional[str] = None
+        self.main_frame = VirtualBranchList(self.root, on_time_change=self._update_total_time)
+        self._manual_entries: List[BranchEntry] = []
+        self._scan_results: Dict[str, dict] = {}
+        self.commits_loader = BackgroundLoader(self.root, self._on_scan_results, self._on_scan_done, 'commits-loader')
+        self.cards_loader = BackgroundLoader(self.root, self._on_cards_loaded, self._on_cards_done, 'cards-loader')
+        self._cards_pending = False
         self.manual_entry = ManualTimeEntry(
             self.main_frame, on_add_entry=self._add_manual_branch_entry, on_time_change=self._update_total_time
         )
@@ -141,9 +229,15 @@ class Application:
         save_button.pack(side=tk.RIGHT, padx=5)
 
     def setup_tray(self):
+        # pystray при импорте подключается к дисплею, поэтому загружается только при создании значка
+        import pystray
+
         menu = (
-            pystray.MenuItem('Учет времени', self.show_window),
-            pystray.MenuItem('Настройки', self.show_settings),
+            # pystray вызывает обработчики из своего потока, а с Tk можно работать только из главного
+            pystray.MenuItem('Учет времени', lambda: self.root.after(0, self.show_window)),
+            pystray.MenuItem('Учет времени за период', lambda: self.root.after(0, self.show_backfill)),
+            pystray.MenuItem('Настройки', lambda: self.root.after(0, self.show_settings)),
+            pystray.MenuItem('Диагностика', lambda: self.root.after(0, self.show_diagnostics)),
             pystray.MenuItem('Выход', self.quit_application),
         )
         self.tray_icon = pystray.Icon(
@@ -153,40 +247,45 @@ class Application:
             menu,
         )
 
-    def setup_scheduler(self):
-        schedule.every(30).seconds.do(self.check_notification_time)
-        scheduler_thread = threading.Thread(
-            target=self.run_scheduler,
-            daemon=True,
-        )
-        scheduler_thread.start()
+    def _next_notification_time(self, after: datetime) -> Optional[datetime]:
+        return self.work_calendar.next_notification_time(config.notification_times, after)
 
-    def run_scheduler(self):
-        while True:
-            schedule.run_pending()
-            threading.Event().wait(30)
+    def _on_notification(self):
+        if not self.window_visible:
+            self.root.after(0, self.show_window)
 
-    def _add_manual_branch_entry(self, card_id: int, time_spent: str, description: str):
-        entry = BranchTimeEntry(
-            self.main_frame,
+    def _add_manual_branch_entry(
+        self, card_id: int, time_spent: str, description: str, for_date: Optional[date] = None
+    ):
+        entry = BranchEntry(
             branch_name=str(card_id),
             card_id=card_id,
             commits=[description] if description else [],
-            on_time_change=self._update_total_time,
+            for_date=for_date,
+            time_spent=time_spent,
+            key=('manual', len(self._manual_entries)),
         )
-        entry.time_var.set(time_spent)
-        self.branch_entries.append(entry)
+        self._manual_entries.append(entry)
+        self.main_frame.add_entry(entry)
+        self._load_cards()
         self._update_total_time()
 
-    def _update_total_time(self):
-        total_minutes = 0
-        for entry in self.branch_entries:
-            total_minutes += entry.get_time_minutes()
-        total_minutes += self.manual_entry.get_time_minutes()
+    @property
+    def branch_entries(self) -> List[BranchEntry]:
+        return self.main_frame.entries
+
+    def _update_total_time(self, *args):
+        """Откладывает обновление надписи до простоя, несколько изменений подряд дают одну перерисовку."""
+        if self._total_time_after_id is None:
+            self._total_time_after_id = self.root.after_idle(self._render_total_time)
+
+    def _render_total_time(self):
+        self._total_time_after_id = None
+        total_minutes = self.main_frame.total_minutes + self.manual_entry.get_time_minutes()
         hours = total_minutes // 60
         minutes = total_minutes % 60
         time_text = f'Общее время: {hours}ч {minutes}м'
-        working_minutes = int(config.working_time * 60)
+        working_minutes = int(config.working_time * 60) * self.days_count
         if total_minutes == working_minutes:
             color = 'green'
         elif total_minutes < working_minutes or total_minutes > working_minutes:
@@ -195,90 +294,272 @@ class Application:
             color = 'black'
         self.total_time_label.configure(text=time_text, foreground=color)
 
-    def check_notification_time(self):
-        if not self.window_visible and self.work_calendar.should_show_notification(config.notification_time):
-            self.show_window()
-
-    def show_window(self):
-        if not self.window_visible:
+    def show_window(self, period: Optional[Tuple[date, date]] = None):
+        if not self.window_visible or period:
             self.window_visible = True
+            self.period = period
+            self.manual_entry.set_period(period)
             self.root.deiconify()
             self.root.lift()
 
-            self.loading_frame.pack(fill=tk.BOTH, expand=True)
             self.main_frame.pack_forget()
             self.buttons_frame.pack_forget()
+            self.loading_frame.pack(fill=tk.BOTH, expand=True)
             self.spinner.start(10)
-
-            def load_commits():
-                self.update_branch_entries()
-                self.loading_frame.pack_forget()
-                self.main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-                self.buttons_frame.pack(fill=tk.X, padx=10, pady=5, side=tk.BOTTOM)
-                self.root.focus_force()
-
-            threading.Thread(target=load_commits, daemon=True).start()
+            # Замер от открытия окна до появления первых строк; незавершенный замер прошлого открытия отменяется
+            self._cancel_open_span()
+            self._open_span = tracer.start('ui.open_window', period=bool(period))
+            self.refresh_branch_entries()
+
+    def _show_entries(self):
+        if self.loading_frame.winfo_ismapped():
+            self.spinner.stop()
+            self.loading_frame.pack_forget()
+            self.main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+            self.buttons_frame.pack(fill=tk.X, padx=10, pady=5, side=tk.BOTTOM)
+            self.root.focus_force()
+            if self._open_span:
+                self._open_span.attributes['entries'] = len(self.branch_entries)
+                self._open_span.finish()
+                self._open_span = None
+
+    def _cancel_open_span(self):
+        if self._open_span:
+            self._open_span.cancel()
+            self._open_span = None
 
     def hide_window(self):
         self.window_visible = False
+        self._cancel_open_span()
+        self._stop_ref_watcher()
         self.root.withdraw()
 
     def show_settings(self):
-        SettingsWindow(self.root, self._init_app, self.kaiten_api)
+        from src.ui.settings_window import SettingsWindow
 
-    def update_branch_entries(self):
-        for entry in self.branch_entries:
-            entry.frame.destroy()
-        self.branch_entries.clear()
+        SettingsWindow(self.root, self._init_app, self.kaiten_api, self.roles_cache)
 
-        try:
-            branches_data = self.git_manager.get_branches_with_commits()
-            for branch_name, card_id, commits in branches_data:
-                entry = BranchTimeEntry(
-                    self.main_frame, branch_name, card_id, commits, on_time_change=self._update_total_time
-                )
-                self.branch_entries.append(entry)
-            logger.info(f'Найдено {len(self.branch_entries)} веток с коммитами')
-            self._update_total_time()
-        except Exception as e:
-            logger.error(f'Ошибка при обновлении списка веток: {e}')
+    def show_diagnostics(self):
+        from src.ui.diagnostics_window import DiagnosticsWindow
+
+        DiagnosticsWindow(self.root, tracer)
+
+    def show_backfill(self):
+        from src.ui.backfill_window import BackfillWindow
+
+        BackfillWindow(self.root, lambda start, end: self.show_window(period=(start, end)))
+
+    def refresh_branch_entries(self, repo_keys: Optional[Set[str]] = None):
+        """Запускает сканирование репозиториев заново, отменяя текущее.
+
+        С `repo_keys` сканируются только эти репозитории, строки остальных остаются как есть.
+        """
+        if repo_keys is None:
+            self._scan_results = {}
+            self._pending_refresh.clear()
+        period = self.period
+        # Нерабочие дни пропускаются, каждая запись сохраняется за день своих коммитов
+        self.commits_loader.start(
+            lambda cancelled: self.git_manager.iter_repo_branches(
+                period, day_filter=self.work_calendar.is_working_day, cancelled=cancelled, repo_keys=repo_keys
+            )
+        )
+
+    def _on_scan_results(self, results: List[Tuple[str, dict]]):
+        self._scan_results.update(results)
+        self._update_branch_entries(final=False)
+        self._show_entries()
+
+    def _on_scan_done(self, error: Optional[Exception]):
+        self._show_entries()
+        if error:
             messagebox.showerror('Ошибка', 'Не удалось получить список коммитов. Проверьте путь к репозиторию.')
+            return
+        self._update_branch_entries(final=True)
+        logger.info(f'Найдено {len(self.branch_entries) - len(self._manual_entries)} веток с коммитами')
+        if self._pending_refresh:
+            repo_keys, self._pending_refresh = self._pending_refresh, set()
+            self.refresh_branch_entries(repo_keys)
+        elif self.window_visible and config.watch_repos:
+            self._start_ref_watcher()
+
+    def _start_ref_watcher(self):
+        """Следит за ветками, пока окно открыто: новые коммиты появляются в списке без повторного открытия."""
+        if self.ref_watcher is not None:
+            return
+        from src.core.ref_watcher import RefWatcher
+
+        # RefWatcher вызывает обработчик из своего потока
+        self.ref_watcher = RefWatcher(
+            self.git_manager.git_dirs, lambda repo_keys: self.root.after(0, self._on_refs_changed, repo_keys)
+        )
+        self.ref_watcher.start()
+
+    def _stop_ref_watcher(self):
+        if self.ref_watcher is not None:
+            self.ref_watcher.stop()
+            self.ref_watcher = None
+
+    def _on_refs_changed(self, repo_keys: Set[str]):
+        if not self.window_visible or self.ref_watcher is None:
+            return
+        logger.debug(f'Изменились ветки репозиториев: {", ".join(sorted(repo_keys))}')
+        if self.commits_loader.running:
+            # Сканирование уже идет; изменения учтутся после него, чтобы не отменять его результаты
+            self._pending_refresh |= repo_keys
+        else:
+            self.refresh_branch_entries(repo_keys)
+
+    def _update_branch_entries(self, final: bool):
+        with span('ui.update_branch_entries', final=final) as attributes:
+            self._build_branch_entries(final)
+            attributes['entries'] = len(self.branch_entries)
+
+    def _build_branch_entries(self, final: bool):
+        from src.core.git_manager import merge_branches_by_day
+
+        branches_by_date = merge_branches_by_day(self._scan_results.values())
+        self.days_count = max(len(branches_by_date), 1)
+        entries = [
+            BranchEntry(branch.branch_name, branch.card_id, branch.commits, for_date=for_date)
+            for for_date, branches_data in branches_by_date.items()
+            for branch in branches_data
+        ]
+        if not final:
+            # Пока сканирование не завершено, строки еще не просканированных репозиториев остаются на месте
+            keys = {entry.key for entry in entries}
+            entries += [entry for entry in self.branch_entries if entry.key not in keys]
+        else:
+            entries += self._manual_entries
+        # Записи с теми же ключами сохраняют уже введенное время, а виджеты строк переиспользуются
+        self.main_frame.set_entries(entries)
+        # Запрос карточек в Kaiten ждет конца сканирования, иначе каждая порция результатов перезапускала бы его
+        self._load_cards(fetch=final)
+        if final:
+            self._prefill_estimated_time(branches_by_date)
+        self._update_total_time()
+
+    def _load_cards(self, fetch: bool = True):
+        """Показывает сведения о карточках из кеша; с `fetch` в фоне запрашивает в Kaiten недостающие и устаревшие."""
+        url = config.kaiten_url
+        cards, stale = self.card_cache.get_many(url, [entry.card_id for entry in self.branch_entries])
+        self.main_frame.update_cards(cards)
+        if not (fetch and stale and config.is_configured()):
+            return
+        if self.cards_loader.running:
+            # Запрос уже идет; оставшиеся карточки запрашиваются после него, чтобы не отменять его результаты
+            self._cards_pending = True
+        else:
+            self.cards_loader.start(lambda cancelled: iter([self.card_cache.prefetch(self.kaiten_api, url, stale)]))
+
+    def _on_cards_loaded(self, results: List[Dict[int, CardInfo]]):
+        for cards in results:
+            self.main_frame.update_cards(cards)
+
+    def _on_cards_done(self, error: Optional[Exception]):
+        if self._cards_pending:
+            self._cards_pending = False
+            self._load_cards()
+
+    def _prefill_estimated_time(self, branches_by_date: Dict[Optional[date], List[BranchCommits]]):
+        """Распределяет рабочее время по карточкам по времени коммитов в днях, где время еще не введено."""
+        from src.core.time_estimator import estimate_time
+
+        manual_keys = {entry.key for entry in self._manual_entries}
+        values = {}
+        for day, branches in branches_by_date.items():
+            day_entries = [entry for entry in self.branch_entries if entry.for_date == day]
+            if any(entry.time_spent.strip() for entry in day_entries if entry.key not in manual_keys):
+                continue
+            working_hours = self.work_calendar.working_hours(day, config.working_time) if day else config.working_time
+            manual_minutes = sum(entry.minutes for entry in day_entries if entry.key in manual_keys)
+            estimates = estimate_time(
+                {branch.card_id: branch.commit_times for branch in branches}, int(working_hours * 60) - manual_minutes
+            )
+            for entry in day_entries:
+                if entry.key not in manual_keys and entry.card_id in estimates:
+                    values[entry.key] = format_duration(estimates[entry.card_id])
+        self.main_frame.fill_time(values)
 
     def save_time_logs(self):
-        success_count = 0
-        error_count = 0
+        with span('ui.save_time_logs'):
+            self._save_time_logs()
 
-        # Сохраняем записи из веток
+    def _save_time_logs(self):
+        entries = []
+        # Записи для несуществующих и недоступных карточек Kaiten не примет; они остаются в окне, остальные сохраняются
+        rejected: List[BranchEntry] = []
         for entry in self.branch_entries:
             card_id, time_spent, description = entry.get_data()
             if time_spent and float(time_spent) > 0:
-                try:
-                    if self.kaiten_api.add_time_log(card_id, time_spent, description):
-                        success_count += 1
-                        logger.debug(f'Успешно сохранено время для карточки {card_id}')
-                    else:
-                        error_count += 1
-                        logger.error(f'Не удалось сохранить время для карточки {card_id}')
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f'Ошибка при сохранении времени для карточки {card_id}: {e}')
-        if success_count > 0:
-            message = f'Время успешно записано для {success_count} задач.'
-            if error_count > 0:
-                message += f'\nОшибка записи времени для {error_count} задач'
-            logger.info(message)
-            messagebox.showinfo('Успешно', message)
-            self.hide_window()
-        else:
-            error_message = 'Ошибка записи времени. Проверьте настройки и попробуйте снова'
+                if entry.card and not (entry.card.exists and entry.card.accessible):
+                    rejected.append(entry)
+                else:
+                    entries.append(TimeLogEntry(card_id, time_spent, description, entry.for_date))
+        rejected_message = ''
+        if rejected:
+            cards = ', '.join(
+                f'#{entry.card_id} ({"не найдена" if not entry.card.exists else "нет доступа"})' for entry in rejected
+            )
+            rejected_message = f'Время не сохранено для карточек: {cards}.\nИсправьте номер карточки или уберите время.'
+            logger.warning(rejected_message)
+            if not entries:
+                messagebox.showwarning('Ошибка', rejected_message)
+                return
+        if not entries:
+            error_message = 'Ошибка записи времени. Укажите время хотя бы для одной задачи'
             logger.error(error_message)
             messagebox.showerror('Ошибка', error_message)
+            return
+
+        # Записи сохраняются в локальный журнал, отправкой в Kaiten занимается фоновый поток
+        added_count = self.outbox.enqueue(entries)
+        self.outbox_worker.wake()
+        self._manual_entries = [entry for entry in self._manual_entries if entry in rejected]
+        self.main_frame.set_entries(rejected)
+        message = f'Время сохранено для {added_count} задач и будет отправлено в Kaiten в фоне.'
+        if added_count < len(entries):
+            message += f'\nПропущено повторов уже сохраненных записей: {len(entries) - added_count}'
+        logger.info(message)
+        if rejected:
+            messagebox.showwarning('Сохранено частично', f'{message}\n\n{rejected_message}')
+            self._update_total_time()
+        else:
+            messagebox.showinfo('Успешно', message)
+            self.hide_window()
+
+    def _get_outbox_api(self) -> Optional['KaitenAPI']:
+        return self.kaiten_api if config.is_configured() else None
+
+    def _on_outbox_flush(self, results: List[TimeLogResult], given_up: List[TimeLogResult]):
+        success_count = sum(result.success for result in results)
+        error_count = len(results) - success_count - len(given_up)
+        messages = []
+        if success_count > 0:
+            messages.append(f'Время успешно записано для {success_count} задач.')
+            logger.info(messages[-1])
+        if error_count > 0:
+            messages.append(f'Ошибка записи времени для {error_count} задач, отправка будет повторена позже.')
+            logger.error(messages[-1])
+        if given_up:
+            cards = ', '.join(f'{result.entry.card_id} (HTTP {result.status})' for result in given_up)
+            messages.append(f'Kaiten не принял время для карточек {cards}, отправка прекращена.')
+            logger.error(messages[-1])
+        if messages and self.tray_icon.HAS_NOTIFICATION:
+            self.tray_icon.notify('\n'.join(messages), 'Kaiten Time Logger')
 
     def quit_application(self):
+        self.commits_loader.cancel()
+        self._stop_ref_watcher()
+        self.outbox_worker.stop()
+        self.scheduler.stop()
+        self._close_services()
         self.tray_icon.stop()
         self.root.quit()
 
     def run(self):
         threading.Thread(target=self.tray_icon.run, daemon=True).start()
         self.hide_window()
+        # Фоновые службы и проверка настроек запускаются, когда значок уже в трее
+        self.root.after(0, self._start_services)
         self.root.mainloop()
@@ -1,20 +1,25 @@
+import threading
 import tkinter as tk
 from tkinter import messagebox, ttk
-from typing import Callable
+from typing import Callable, Dict, Tuple
 
 from PIL import ImageTk
 
 from src.core.config import Config, config
 from src.core.kaiten_api import KaitenAPI
+from src.core.roles_cache import RolesCache
 from src.utils.resources import get_resource_path, safe_get_icon
 
 
 class SettingsWindow(tk.Toplevel):
-    def __init__(self, parent, on_init_app: Callable, kaiten_api: KaitenAPI):
+    def __init__(self, parent, on_init_app: Callable, kaiten_api: KaitenAPI, roles_cache: RolesCache):
         super().__init__(parent)
         self.on_init_app = on_init_app
         self.kaiten_api = kaiten_api
-        self.user_roles = kaiten_api.get_list_of_user_roles()
+        self.roles_cache = roles_cache
+        # Окно открывается сразу с ролями из кеша, актуальный список подгружается в фоне
+        self.user_roles, _ = roles_cache.get(config.kaiten_url, config.kaiten_token)
+        self._roles_credentials = (config.kaiten_token, config.kaiten_url)
 
         self.title('Настройки')
         self.geometry('400x540')
@@ -57,9 +62,9 @@ class SettingsWindow(tk.Toplevel):
         url_entry.pack(padx=5, pady=5)
         url_entry.bind('<FocusOut>', self._update_user_roles)
 
-        repo_label = ttk.Label(self, text='Путь до git репозитория:', style='Settings.TLabel')
+        repo_label = ttk.Label(self, text='Пути до git репозиториев (через ;):', style='Settings.TLabel')
         repo_label.pack(padx=5, pady=5)
-        self.repo_var = tk.StringVar(value=config.git_repo_path)
+        self.repo_var = tk.StringVar(value='; '.join(config.git_repo_paths))
         repo_entry = ttk.Entry(
             self,
             textvariable=self.repo_var,
@@ -90,7 +95,7 @@ class SettingsWindow(tk.Toplevel):
         reload_button = ttk.Button(
             role_frame,
             image=self.reload_icon,
-            command=self._update_user_roles,
+            command=lambda: self._update_user_roles(force=True),
         )
         reload_button.image = ImageTk.PhotoImage(reload_icon)
         reload_button.pack(side=tk.RIGHT)
@@ -106,13 +111,15 @@ class SettingsWindow(tk.Toplevel):
         )
         working_hours_entry.pack(padx=5, pady=5)
 
-        time_label = ttk.Label(self, text='Время уведомления (HH:MM):', style='Settings.TLabel')
+        time_label = ttk.Label(
+            self, text='Время уведомления (HH:MM, несколько через запятую):', style='Settings.TLabel'
+        )
         time_label.pack(padx=5, pady=5)
         self.time_var = tk.StringVar(value=config.notification_time)
         time_entry = ttk.Entry(
             self,
             textvariable=self.time_var,
-            width=5,
+            width=20,
             style='Settings.TEntry',
         )
         time_entry.pack(padx=5, pady=5)
@@ -125,6 +132,8 @@ class SettingsWindow(tk.Toplevel):
         )
         save_button.pack(padx=5, pady=20)
 
+        self._update_user_roles()
+
     def save_settings(self):
         validation_errors = []
 
@@ -136,8 +145,8 @@ class SettingsWindow(tk.Toplevel):
         if not url:
             validation_errors.append('• URL Kaiten')
 
-        repo_path = self.repo_var.get().strip()
-        if not repo_path:
+        repo_paths = [path.strip() for path in self.repo_var.get().split(';') if path.strip()]
+        if not repo_paths:
             validation_errors.append('• Путь до git репозитория')
 
         role_name = self.role_var.get().strip()
@@ -145,7 +154,7 @@ class SettingsWindow(tk.Toplevel):
             validation_errors.append('• Роль пользователя')
 
         time_str = self.time_var.get().strip()
-        if not self._validate_time_format(time_str):
+        if not all(self._validate_time_format(value.strip()) for value in time_str.split(',')):
             validation_errors.append('• Время уведомления (формат HH:MM)')
 
         try:
@@ -169,7 +178,7 @@ class SettingsWindow(tk.Toplevel):
             Config.save_config(
                 token,
                 time_str,
-                repo_path,
+                repo_paths,
                 url,
                 role_id,
                 working_time,
@@ -195,11 +204,51 @@ class SettingsWindow(tk.Toplevel):
         except ValueError:
             return False
 
-    def _update_user_roles(self, event=None):
-        if not (self.token_var.get() and self.url_var.get()):
+    def _update_user_roles(self, event=None, force: bool = False):
+        """Обновляет роли в фоне: при свежем кеше для тех же URL и токена запрос не выполняется."""
+        token, url = self.token_var.get().strip(), self.url_var.get().strip()
+        if not (token and url):
+            return
+        cached_roles, is_fresh = self.roles_cache.get(url, token)
+        if cached_roles and (token, url) != self._roles_credentials:
+            self._apply_user_roles((token, url), cached_roles)
+        if is_fresh and not force:
             return
-        kaiten_api = KaitenAPI.from_credentials(token=self.token_var.get(), base_url=self.url_var.get())
-        self.user_roles = kaiten_api.get_list_of_user_roles()
+
+        def fetch():
+            if token == config.kaiten_token and url == config.kaiten_url:
+                roles = self.kaiten_api.get_list_of_user_roles()
+            else:
+                kaiten_api = KaitenAPI.from_credentials(
+                    token=token,
+                    base_url=url,
+                    timeout=(config.connect_timeout, config.read_timeout),
+                    rate_limit=config.rate_limit,
+                    burst=config.rate_burst,
+                )
+                try:
+                    roles = kaiten_api.get_list_of_user_roles()
+                finally:
+                    kaiten_api.close()
+            if not roles:
+                return
+            self.roles_cache.put(url, token, roles)
+            try:
+                self.after(0, self._apply_user_roles, (token, url), roles)
+            except (RuntimeError, tk.TclError):
+                pass  # окно настроек уже закрыто
+
+        threading.Thread(target=fetch, daemon=True).start()
+
+    def _apply_user_roles(self, credentials: Tuple[str, str], roles: Dict[int, str]):
+        # Поля могли измениться, пока шел запрос: такие роли относятся к другому пользователю
+        if credentials != (self.token_var.get().strip(), self.url_var.get().strip()):
+            return
+        self._roles_credentials = credentials
+        self.user_roles = roles
+        selected_role = self.role_var.get()
         self.role_combobox['values'] = sorted(self.user_roles.values())
+        if selected_role in self.user_roles.values():
+            return
         role = self.user_roles.get(config.role_id)
         self.role_var.set(role if role else next(iter(self.role_combobox['values']), ''))
@@ -1,9 +1,49 @@
+import atexit
+import gzip
 import logging
+import os
+import queue
+import shutil
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Dict, List, Optional, TextIO
 
+from src.core.config import LOG_DIR
 
-def setup_logger(name: str = 'kaiten_logger') -> logging.Logger:
+LOG_FILE_NAME = 'kaiten_logger.log'
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+_listeners: Dict[str, QueueListener] = {}
+_console_handlers: Dict[str, logging.StreamHandler] = {}
+
+
+def _gzip_namer(name: str) -> str:
+    return f'{name}.gz'
+
+
+def _gzip_rotator(source: str, destination: str) -> None:
+    with open(source, 'rb') as source_file, gzip.open(destination, 'wb') as destination_file:
+        shutil.copyfileobj(source_file, destination_file)
+    os.remove(source)
+
+
+def create_file_handler(
+    path: Path, max_bytes: int = LOG_MAX_BYTES, backup_count: int = LOG_BACKUP_COUNT
+) -> RotatingFileHandler:
+    """Файл лога ограниченного размера: старые части сжимаются в .1.gz, .2.gz и т.д."""
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    handler.namer = _gzip_namer
+    handler.rotator = _gzip_rotator
+    return handler
+
+
+def setup_logger(name: str = 'kaiten_logger', log_dir: Path = LOG_DIR) -> logging.Logger:
+    """Логгер, который только кладет записи в очередь: вывод и запись в файл выполняет фоновый поток.
+
+    Так запись на диск и ротация не задерживают поток Tk.
+    """
     logger = logging.getLogger(name)
     logger.setLevel(logging.DEBUG)
 
@@ -12,17 +52,52 @@ def setup_logger(name: str = 'kaiten_logger') -> logging.Logger:
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers: List[logging.Handler] = [console_handler]
 
-    log_dir = Path('../logs')
-    log_dir.mkdir(exist_ok=True)
+    file_error = None
+    try:
+        log_dir.mkdir(parents=True, exist_ok=True)
+        file_handler = create_file_handler(log_dir / LOG_FILE_NAME)
+    except OSError as e:
+        file_error = e
+    else:
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
 
-    file_handler = logging.FileHandler(log_dir / 'kaiten_logger.log', encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    records = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(records))
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
+    _console_handlers[name] = console_handler
 
+    if file_error:
+        logger.warning(f'Лог в файл отключен: {file_error}')
     return logger
 
 
+def configure_console(stream: TextIO, level: int, name: str = 'kaiten_logger') -> None:
+    """Переводит вывод логгера `name` в консоль в другой поток и меняет его уровень.
+
+    Обработчик консоли принадлежит фоновому потоку логгера, поэтому в `logger.handlers` его нет.
+    """
+    handler = _console_handlers.get(name)
+    if handler:
+        handler.setStream(stream)
+        handler.setLevel(level)
+
+
+@atexit.register
+def stop_logging(name: Optional[str] = None) -> None:
+    """Дописывает записи из очереди и останавливает фоновый поток логгера `name` или всех логгеров."""
+    for listener_name in [name] if name else list(_listeners):
+        listener = _listeners.pop(listener_name, None)
+        _console_handlers.pop(listener_name, None)
+        if listener:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+
+
 logger = setup_logger()
@@ -4,7 +4,7 @@ from pathlib import Path
 
 from PIL import Image
 
-from utils.logger import logger
+from src.utils.logger import logger
 
 
 def get_resource_path(relative_path):
@@ -0,0 +1,69 @@
+import re
+from functools import lru_cache
+
+DEFAULT_HOURS_PER_DAY = 8.0
+
+_NUMBER = r'\d+(?:[.,]\d+)?'
+DURATION_REGEX = re.compile(
+    r'^(?:'
+    rf'(?P<clock_hours>\d{{1,2}}):(?P<clock_minutes>\d{{1,2}})'
+    r'|(?P<bare>\d+)'
+    rf'|(?:(?P<days>{_NUMBER})\s*[dд]\s*)?'
+    rf'(?:(?P<hours>{_NUMBER})\s*[hч]\s*)?'
+    r'(?:(?P<minutes>\d+)\s*[mм])?'
+    r')$',
+    re.IGNORECASE,
+)
+
+# Сколько минут в единице каждой группы; дни считаются рабочими и зависят от длины рабочего дня
+UNIT_MINUTES = {
+    'clock_hours': 60,
+    'clock_minutes': 1,
+    'bare': 60,
+    'hours': 60,
+    'minutes': 1,
+}
+
+
+@lru_cache(maxsize=1024)
+def parse_duration(time_str: str, hours_per_day: float = DEFAULT_HOURS_PER_DAY) -> int:
+    """Парсит строку времени в минуты.
+
+    Поддерживаемые форматы:
+    - 13:30 (часы:минуты)
+    - 5 (целое число как часы)
+    - 1d, 1д (рабочие дни по `hours_per_day` часов)
+    - 1h, 1ч, 1.5h (часы, в том числе десятичные)
+    - 30m, 30м, 90m (минуты, в том числе больше 60)
+    - комбинации: 1h30m, 1ч 30м, 1d 2h, 1д 2ч 30м
+    """
+    time_str = time_str.strip() if time_str else ''
+    if not time_str:
+        return 0
+
+    match = DURATION_REGEX.match(time_str)
+    if not match or not any(match.groups()):
+        raise ValueError(f'Неизвестный формат времени: {time_str}')
+
+    total = 0.0
+    for group, value in match.groupdict().items():
+        if value is not None:
+            minutes_per_unit = hours_per_day * 60 if group == 'days' else UNIT_MINUTES[group]
+            total += float(value.replace(',', '.')) * minutes_per_unit
+    return round(total)
+
+
+def parse_duration_or_zero(time_str: str, hours_per_day: float = DEFAULT_HOURS_PER_DAY) -> int:
+    """Как `parse_duration`, но для некорректной строки возвращает 0, например пока время еще вводится."""
+    try:
+        return parse_duration(time_str, hours_per_day)
+    except ValueError:
+        return 0
+
+
+def format_duration(minutes: int) -> str:
+    """Минуты в строку вида 1h30m, которую понимает `parse_duration`."""
+    hours, minutes = divmod(minutes, 60)
+    if hours and minutes:
+        return f'{hours}h{minutes}m'
+    return f'{hours}h' if hours else f'{minutes}m'
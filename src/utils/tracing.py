@@ -0,0 +1,118 @@
+import json
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+from src.utils.logger import logger
+
+SPANS_BUFFER_SIZE = 500
+
+trace_logger = logger.getChild('trace')
+
+
+@dataclass(frozen=True, slots=True)
+class SpanRecord:
+    name: str
+    started_at: float  # time.time()
+    duration: float  # секунды
+    attributes: Dict[str, object]
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class SpanStats:
+    name: str
+    count: int
+    last_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+class Span:
+    """Незавершенный замер; `finish` можно вызвать позже и из другого обработчика."""
+
+    def __init__(self, tracer: 'Tracer', name: str, attributes: Dict[str, object]):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._finished = False
+
+    def finish(self, error: Optional[str] = None) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        duration = time.perf_counter() - self._started
+        self.tracer.record(SpanRecord(self.name, self.started_at, duration, self.attributes, error))
+
+    def cancel(self) -> None:
+        """Отменяет замер без записи, например если операцию начали заново."""
+        self._finished = True
+
+
+class Tracer:
+    """Замеры длительности операций в кольцевом буфере последних `size` записей.
+
+    Каждый замер также пишется в лог отладки одной строкой JSON.
+    """
+
+    def __init__(self, size: int = SPANS_BUFFER_SIZE):
+        self._spans: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def start(self, name: str, **attributes) -> Span:
+        return Span(self, name, attributes)
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Dict[str, object]]:
+        """Замеряет блок кода; в возвращаемый словарь можно добавить атрибуты по ходу выполнения."""
+        span = self.start(name, **attributes)
+        try:
+            yield span.attributes
+        except BaseException as e:
+            span.finish(error=type(e).__name__)
+            raise
+        span.finish()
+
+    def record(self, record: SpanRecord) -> None:
+        with self._lock:
+            self._spans.append(record)
+        if trace_logger.isEnabledFor(logging.DEBUG):
+            payload = {'span': record.name, 'duration_ms': round(record.duration * 1000, 2), **record.attributes}
+            if record.error:
+                payload['error'] = record.error
+            trace_logger.debug(json.dumps(payload, ensure_ascii=False, default=str))
+
+    def recent(self, limit: Optional[int] = None) -> List[SpanRecord]:
+        """Последние замеры, новые первыми."""
+        with self._lock:
+            spans = list(self._spans)
+        spans.reverse()
+        return spans[:limit] if limit else spans
+
+    def stats(self) -> List[SpanStats]:
+        """Сводка по именам замеров из буфера, отсортированная по имени."""
+        durations: Dict[str, List[float]] = {}
+        for record in reversed(self.recent()):
+            durations.setdefault(record.name, []).append(record.duration * 1000)
+        result = []
+        for name, values in sorted(durations.items()):
+            ordered = sorted(values)
+            p95 = statistics.quantiles(ordered, n=20, method='inclusive')[18] if len(ordered) > 1 else ordered[0]
+            result.append(SpanStats(name, len(values), values[-1], statistics.median(ordered), p95, ordered[-1]))
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+tracer = Tracer()
+span = tracer.span
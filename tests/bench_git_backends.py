@@ -0,0 +1,78 @@
+"""Сравнение backend'ов GitManager на синтетическом репозитории: python tests/bench_git_backends.py [--json]
+
+Репозиторий с `--branches` ветками и `--commits-per-day` коммитами за каждый из последних `--days` дней
+создается через `git fast-import`. Замеряется `get_branches_with_commits_by_date` за весь период без
+индекса коммитов.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from synthetic_repo import create_repo  # noqa: E402
+
+from src.core.git_backends import CliGitBackend, GitPythonBackend  # noqa: E402
+from src.core.git_manager import GitManager  # noqa: E402
+
+BACKENDS = {'cli': CliGitBackend, 'gitpython': GitPythonBackend}
+
+
+def measure(path: Path, backend: str, days: int) -> tuple:
+    started = time.perf_counter()
+    manager = GitManager(path, backend=BACKENDS[backend](path))
+    result = manager.get_branches_with_commits_by_date(date.today() - timedelta(days=days), date.today())
+    return time.perf_counter() - started, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--branches', type=int, default=300)
+    parser.add_argument('--commits-per-day', type=int, default=430)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--json', action='store_true', help='вывод в JSON для отслеживания регрессий')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory)
+        commits = create_repo(path, args.branches, args.commits_per_day, args.days)
+        timings, results = {}, {}
+        for backend in BACKENDS:
+            runs = [measure(path, backend, args.days) for _ in range(args.runs)]
+            timings[backend] = [seconds for seconds, _ in runs]
+            results[backend] = runs[-1][1]
+
+    if results['cli'] != results['gitpython']:
+        print("Результаты backend'ов различаются", file=sys.stderr)
+        return 1
+
+    medians = {backend: statistics.median(runs) for backend, runs in timings.items()}
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    'branches': args.branches,
+                    'commits': commits,
+                    'median_s': medians,
+                    'runs_s': timings,
+                },
+                indent=2,
+            )
+        )
+    else:
+        print(f'{commits} коммитов, {args.branches} веток')
+        for backend, median in medians.items():
+            print(f'  {backend:<10} {median * 1000:8.1f} мс (медиана {args.runs} запусков)')
+        print(f'  ускорение: {medians["gitpython"] / medians["cli"]:.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""Микробенчмарк разбора времени: python tests/bench_parse_time.py"""
+
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.time_parser import parse_duration  # noqa: E402
+
+SAMPLES = ['5', '13:30', '1h30m', '1ч 30м', '1.5h', '90m', '1d 2h', '']
+LEGACY_PATTERNS = [
+    r'^(\d{1,2}):(\d{1,2})$',
+    r'^(\d+(?:\.\d+)?)[hч](\d+)[mм]$',
+    r'^(\d+(?:\.\d+)?)[hч]\s+(\d+)[mм]$',
+    r'^(\d+(?:\.\d+)?)[hч]$',
+    r'^(\d+)[mм]$',
+    r'^(\d+)$',
+]
+
+
+def legacy_match(time_str: str):
+    """Перебор шаблонов, как в прежнем BranchTimeEntry.parse_time."""
+    time_str = time_str.strip()
+    for pattern in LEGACY_PATTERNS:
+        match = re.match(pattern, time_str)
+        if match:
+            return match
+    return None
+
+
+def bench(name: str, fn, number: int = 100_000):
+    seconds = timeit.timeit(lambda: [fn(sample) for sample in SAMPLES], number=number)
+    per_call_ns = seconds / (number * len(SAMPLES)) * 1e9
+    print(f'{name:<24} {per_call_ns:8.0f} нс/строка')
+
+
+if __name__ == '__main__':
+    bench('прежний перебор regex', legacy_match)
+    bench('parse_duration (кеш)', parse_duration)
+    bench('parse_duration без кеша', parse_duration.__wrapped__)
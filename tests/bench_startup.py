@@ -0,0 +1,82 @@
+"""Время импорта до появления значка в трее: python tests/bench_startup.py [--json] [--max-ms 150]
+
+Замеряется `python -X importtime` для модуля приложения: все, что он импортирует, загружается
+до создания значка. Тяжелые подсистемы из `LAZY_MODULES` должны загружаться позже, по требованию.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+STARTUP_MODULE = 'src.ui.main_window'
+LAZY_MODULES = ('git', 'httpx', 'holidays', 'keyring')
+IMPORTTIME_REGEX = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def measure(module: str = STARTUP_MODULE) -> dict:
+    env = {**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_REGEX.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us))
+    return {
+        'total_ms': modules[module][1] / 1000,
+        'modules': modules,
+        'lazy_loaded_eagerly': sorted(name for name in LAZY_MODULES if name in modules),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--json', action='store_true', help='вывод в JSON для отслеживания регрессий')
+    parser.add_argument('--max-ms', type=float, help='ошибка, если медиана времени импорта больше')
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.runs)]
+    median_ms = statistics.median(run['total_ms'] for run in runs)
+    eager = runs[-1]['lazy_loaded_eagerly']
+    top = sorted(runs[-1]['modules'].items(), key=lambda item: item[1][0], reverse=True)[: args.top]
+
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    'module': STARTUP_MODULE,
+                    'median_ms': median_ms,
+                    'runs_ms': [run['total_ms'] for run in runs],
+                    'lazy_loaded_eagerly': eager,
+                    'top_self_ms': {name: self_us / 1000 for name, (self_us, _) in top},
+                },
+                indent=2,
+            )
+        )
+    else:
+        print(f'{STARTUP_MODULE}: медиана {median_ms:.1f} мс за {args.runs} запусков')
+        for name, (self_us, cumulative_us) in top:
+            print(f'  {name:<40} {self_us / 1000:7.1f} мс ({cumulative_us / 1000:.1f} мс с зависимостями)')
+        if eager:
+            print(f'Загружены при запуске, хотя должны загружаться по требованию: {", ".join(eager)}')
+
+    return 1 if eager or (args.max_ms and median_ms > args.max_ms) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
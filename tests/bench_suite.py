@@ -0,0 +1,182 @@
+"""Сквозные бенчмарки сбора коммитов и отправки времени: python tests/bench_suite.py [--output results.json]
+
+Сбор коммитов замеряется на синтетических репозиториях (`synthetic_repo.create_repo`), отправка
+времени — на локальном `StubKaitenServer` с заданными задержкой и долей ошибок. Результаты
+сохраняются в JSON; `--compare` сравнивает их с результатами прошлой версии и завершается с
+ошибкой, если какая-то метрика ухудшилась больше чем на `--threshold`.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from stub_kaiten import StubKaitenServer  # noqa: E402
+from synthetic_repo import create_repo  # noqa: E402
+
+from src.core.commit_index import CommitIndex  # noqa: E402
+from src.core.git_manager import GitWorkspace  # noqa: E402
+from src.core.kaiten_api import KaitenAPI  # noqa: E402
+from src.core.models import TimeLogEntry  # noqa: E402
+
+ROOT = Path(__file__).parent.parent
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Перцентили и среднее по замерам в секундах, в миллисекундах."""
+    samples_ms = sorted(sample * 1000 for sample in samples)
+    if len(samples_ms) > 1:
+        percentiles = statistics.quantiles(samples_ms, n=100, method='inclusive')
+        p50, p90, p99 = percentiles[49], percentiles[89], percentiles[98]
+    else:
+        p50 = p90 = p99 = samples_ms[0]
+    return {'p50_ms': p50, 'p90_ms': p90, 'p99_ms': p99, 'mean_ms': statistics.fmean(samples_ms)}
+
+
+def timed(fn: Callable, runs: int) -> List[float]:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def bench_collect(args, directory: Path) -> dict:
+    paths = []
+    for number in range(args.repos):
+        path = directory / f'repo-{number}'
+        create_repo(path, args.branches, args.commits_per_day, args.days, args.message_length)
+        paths.append(path)
+    period = (date.today() - timedelta(days=args.days), date.today())
+    indexed = GitWorkspace(paths, index=CommitIndex(directory / 'index.sqlite3'))
+    indexed.get_branches_with_commits()  # первое заполнение индекса не замеряется
+    # Без индекса каждый замер делается новым GitWorkspace: иначе после первого замера кэш последнего
+    # обхода сводит сбор к чтению вершин веток
+    return {
+        'today': summarize(timed(lambda: GitWorkspace(paths).get_branches_with_commits(), args.runs)),
+        'today_indexed': summarize(timed(indexed.get_branches_with_commits, args.runs)),
+        'period': summarize(timed(lambda: GitWorkspace(paths).get_branches_with_commits_by_date(*period), args.runs)),
+    }
+
+
+def bench_save(args) -> dict:
+    entries = [TimeLogEntry(1000 + number, 30, f'Запись {number}') for number in range(args.entries)]
+    with StubKaitenServer(latency=args.latency, error_rate=args.error_rate, seed=1) as server:
+        api = KaitenAPI(
+            'token',
+            server.url,
+            max_retries=args.max_retries,
+            backoff_factor=0.01,
+            rate_limit=args.rate_limit,
+            burst=args.burst,
+        )
+        try:
+            request_samples = timed(lambda: api.add_time_log(1, 30, 'Запись'), args.requests)
+            started = time.perf_counter()
+            results = api.add_time_logs(entries)
+            batch_s = time.perf_counter() - started
+            cards_samples = timed(lambda: api.get_cards(range(1, 51)), args.runs)
+            stats = api.rate_limit_stats
+        finally:
+            api.close()
+    succeeded = sum(result.success for result in results)
+    return {
+        'add_time_log': summarize(request_samples),
+        'add_time_logs': {
+            'batch_ms': batch_s * 1000,
+            'throughput_per_s': len(entries) / batch_s,
+            'success_rate': succeeded / len(entries),
+        },
+        'get_cards_50': summarize(cards_samples),
+        'rate_limit_wait_ms': stats.total_wait * 1000,
+        'server_requests': len(server.requests),
+    }
+
+
+def _revision() -> str:
+    result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+def _flatten(results: dict, prefix: str = '') -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f'{prefix}{key}.'))
+        else:
+            flat[f'{prefix}{key}'] = value
+    return flat
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Метрики, ухудшившиеся больше чем на `threshold`: время выросло или пропускная способность упала."""
+    regressions = []
+    baseline = _flatten(baseline)
+    for name, value in _flatten(results).items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if name.endswith('_ms') and value > previous * (1 + threshold):
+            regressions.append(f'{name}: {previous:.1f} -> {value:.1f}')
+        elif name.endswith(('_per_s', '_rate')) and value < previous * (1 - threshold):
+            regressions.append(f'{name}: {previous:.2f} -> {value:.2f}')
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repos', type=int, default=3)
+    parser.add_argument('--branches', type=int, default=100)
+    parser.add_argument('--commits-per-day', type=int, default=200)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--message-length', type=int, default=200)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.02, help='задержка ответа сервера Kaiten в секундах')
+    parser.add_argument('--error-rate', type=float, default=0.05, help='доля ответов 503')
+    parser.add_argument('--max-retries', type=int, default=3)
+    parser.add_argument('--rate-limit', type=float, default=1000.0)
+    parser.add_argument('--burst', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=50, help='последовательных запросов для перцентилей')
+    parser.add_argument('--entries', type=int, default=200, help='записей в пакетной отправке')
+    parser.add_argument('--output', type=Path, help='файл для результатов в JSON')
+    parser.add_argument('--compare', type=Path, help='результаты прошлой версии в JSON')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        collect = bench_collect(args, Path(directory))
+    report = {
+        'revision': _revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {name: str(value) if isinstance(value, Path) else value for name, value in vars(args).items()},
+        'results': {'collect': collect, 'save': bench_save(args)},
+    }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding='utf-8'))
+        regressions = compare(report['results'], baseline['results'], args.threshold)
+        for regression in regressions:
+            print(f'Регрессия {regression}', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+TIME_LOGS_PATH = re.compile(r'^/api/latest/cards/(\d+)/time-logs$')
+CARD_PATH = re.compile(r'^/api/latest/cards/(\d+)$')
+DEFAULT_ROLES = [{'id': 1, 'name': 'Разработчик'}, {'id': 2, 'name': 'Аналитик'}]
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # При очереди по умолчанию из 5 соединений пул клиента переполняет ее, и лишние соединения ждут повтора SYN ~1 с
+    request_queue_size = 128
+
+
+class StubKaitenServer:
+    """Локальный HTTP-сервер с API Kaiten для тестов и бенчмарков.
+
+    Ответы можно задать заранее через `enqueue`, иначе сервер отвечает успехом. `latency` добавляет
+    задержку к каждому ответу, `error_rate` — долю ответов 503. Карточки из `cards` отдаются по ID,
+    остальные отвечают 404.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        roles: Optional[List[dict]] = None,
+        seed=None,
+        cards: Optional[Dict[int, dict]] = None,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.roles = roles if roles is not None else DEFAULT_ROLES
+        self.cards = cards or {}
+        self.requests: List[dict] = []
+        self.time_logs: List[dict] = []
+        self._responses: Dict[tuple, deque] = defaultdict(deque)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _Server(('127.0.0.1', 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f'http://{host}:{port}'
+
+    def enqueue(self, method: str, path: str, status: int, body=None, headers: Optional[dict] = None, delay=0.0):
+        self._responses[(method, path)].append((status, body, headers or {}, delay))
+
+    def start(self) -> 'StubKaitenServer':
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'StubKaitenServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _respond(self, method: str, path: str, payload) -> tuple:
+        with self._lock:
+            scripted = self._responses.get((method, path))
+            if scripted:
+                status, body, headers, delay = scripted.popleft()
+                if method == 'POST' and status == 200 and body is None and (match := TIME_LOGS_PATH.match(path)):
+                    # Сервер принимает запись до задержки ответа, как настоящий Kaiten при медленном ответе
+                    body = self._add_time_log(int(match.group(1)), payload)
+                return status, body, headers, delay
+            if self.error_rate and self._random.random() < self.error_rate:
+                return 503, {'message': 'Service Unavailable'}, {}, self.latency
+            if method == 'GET' and path == '/api/latest/user-roles':
+                return 200, self.roles, {}, self.latency
+            if method == 'GET' and (match := CARD_PATH.match(path)) and int(match.group(1)) in self.cards:
+                return 200, {'id': int(match.group(1)), **self.cards[int(match.group(1))]}, {}, self.latency
+            if method == 'POST' and (match := TIME_LOGS_PATH.match(path)):
+                return 200, self._add_time_log(int(match.group(1)), payload), {}, self.latency
+        return 404, {'message': 'Not Found'}, {}, self.latency
+
+    def _add_time_log(self, card_id: int, payload) -> dict:
+        time_log = {'id': len(self.time_logs) + 1, **(payload or {}), 'card_id': card_id}
+        self.time_logs.append(time_log)
+        return time_log
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Заголовки и тело ответа пишутся отдельно, без этого Nagle добавляет к каждому ответу ~40 мс
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                raw_body = self.rfile.read(length) if length else b''
+                payload = json.loads(raw_body) if raw_body else None
+                with stub._lock:
+                    stub.requests.append(
+                        {
+                            'method': self.command,
+                            'path': self.path,
+                            'json': payload,
+                            'headers': dict(self.headers),
+                            'client_port': self.client_address[1],
+                        }
+                    )
+                status, body, headers, delay = stub._respond(self.command, self.path, payload)
+                if delay:
+                    time.sleep(delay)
+                # bytes отдаются как есть, чтобы проверять ответы с битым JSON
+                data = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, str(value))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = _handle
+            do_POST = _handle
+
+        return Handler
@@ -0,0 +1,62 @@
+import subprocess
+import time
+from pathlib import Path
+
+AUTHORS = ('Developer <dev@example.com>', 'Someone <someone@example.com>')
+DAY = 24 * 60 * 60
+
+
+def _data(text: str) -> str:
+    return f'data {len(text.encode("utf-8"))}\n{text}\n'
+
+
+def _message(branch: str, number: int, length: int) -> str:
+    subject = f'Изменение {number} в {branch}'
+    body = ('Подробное описание изменения. ' * (length // 30 + 1))[:length]
+    return f'{subject}\n\n{body}' if length else subject
+
+
+def create_repo(
+    path: Path, branches: int, commits_per_day: int, days: int = 1, message_length: int = 40, user: str = 'Developer'
+) -> int:
+    """Создает через `git fast-import` репозиторий для тестов производительности и возвращает число коммитов.
+
+    Ветки TASK-1000, TASK-1001... начинаются от общего корня; за каждый из последних `days` дней
+    в репозиторий добавляется `commits_per_day` коммитов, распределенных по веткам по кругу. Каждый
+    второй коммит ветки сделан другим автором, `message_length` задает длину тела сообщения.
+    """
+    subprocess.run(['git', 'init', '-q', '-b', 'main', str(path)], check=True)
+    subprocess.run(['git', '-C', str(path), 'config', 'user.name', user], check=True)
+    now = int(time.time())
+    step = max(DAY // (commits_per_day + 1), 1)
+    root_at = now - days * DAY
+    stream = [
+        f'commit refs/heads/main\nmark :1\ncommitter {AUTHORS[0]} {root_at} +0000\n',
+        _data('Initial commit'),
+        'M 644 inline README.md\n',
+        _data('init'),
+    ]
+    parents = [':1'] * branches
+    counts = [0] * branches
+    mark = 1
+    for day in range(days):
+        day_start = now - (days - day) * DAY
+        for number in range(commits_per_day):
+            branch = number % branches
+            mark += 1
+            name = f'TASK-{branch + 1000}'
+            author = AUTHORS[counts[branch] % len(AUTHORS)]
+            timestamp = day_start + step * (number + 1)
+            stream += [
+                f'commit refs/heads/{name}\nmark :{mark}\n',
+                f'author {author} {timestamp} +0000\ncommitter {author} {timestamp} +0000\n',
+                _data(_message(name, counts[branch], message_length)),
+                f'from {parents[branch]}\nM 644 inline file-{branch}.txt\n',
+                _data(str(mark)),
+            ]
+            parents[branch] = f':{mark}'
+            counts[branch] += 1
+    subprocess.run(
+        ['git', '-C', str(path), 'fast-import', '--quiet'], input=''.join(stream).encode('utf-8'), check=True
+    )
+    return mark
@@ -0,0 +1,42 @@
+from datetime import date
+
+import pytest
+
+from src.ui.components import MAX_COMMIT_LINES, BranchEntry
+
+
+@pytest.mark.parametrize(
+    'commits, time_spent, description, expected_data',
+    [
+        (['fix', 'tests'], '1:30', None, (1, 90, 'fix\ntests')),
+        (['fix'], '2h', 'свое описание ', (1, 120, 'свое описание')),
+        ([], '', None, (1, 0, '')),
+    ],
+)
+def test_get_data(commits, time_spent, description, expected_data):
+    entry = BranchEntry('feature/1', 1, commits, time_spent=time_spent, description=description)
+    assert entry.get_data() == expected_data
+
+
+def test_update_from_keeps_user_input():
+    entry = BranchEntry('feature/1', 1, ['fix'], for_date=date(2025, 5, 5), time_spent='1h', description='текст')
+    assert entry.key == (date(2025, 5, 5), 1)
+
+    assert not entry.update_from(BranchEntry('feature/1', 1, ['fix'], for_date=date(2025, 5, 5)))
+    assert entry.update_from(BranchEntry('feature/1, hotfix/1', 1, ['fix', 'more'], for_date=date(2025, 5, 5)))
+    assert (entry.branch_name, entry.commits) == ('feature/1, hotfix/1', ['fix', 'more'])
+    assert (entry.time_spent, entry.description) == ('1h', 'текст')
+
+
+@pytest.mark.parametrize('commits_count, expected_lines', [(0, 3), (4, 5), (100, MAX_COMMIT_LINES)])
+def test_text_lines(commits_count, expected_lines):
+    assert BranchEntry('b', 1, ['c'] * commits_count).text_lines == expected_lines
+
+
+def test_set_time_spent_returns_delta():
+    entry = BranchEntry('b', 1, [], time_spent='1h')
+    assert entry.minutes == 60
+
+    assert entry.set_time_spent('1h 30m') == 30
+    assert entry.set_time_spent('1h 3') == -90
+    assert (entry.time_spent, entry.get_time_minutes()) == ('1h 3', 0)
@@ -0,0 +1,44 @@
+from stub_kaiten import StubKaitenServer
+
+from src.core.card_cache import MISSING_CARD_TTL, CardCache
+from src.core.kaiten_api import KaitenAPI
+from src.core.models import CardInfo
+
+URL = 'https://kaiten.example'
+
+
+def test_card_cache_persists_and_evicts_least_recently_used(tmp_path):
+    cache = CardCache(tmp_path / 'cards.json', max_size=2)
+    cache.put_many(URL, [CardInfo(1, 'Первая'), CardInfo(2, 'Вторая')], now=1)
+    cache.get_many(URL, [1], now=1)
+    cache.put_many(URL, [CardInfo(3, 'Третья')], now=1)
+
+    cards, stale = CardCache(tmp_path / 'cards.json').get_many(URL + '/', [1, 2, 3], now=1)
+
+    assert cards == {1: CardInfo(1, 'Первая'), 3: CardInfo(3, 'Третья')}
+    assert stale == [2]
+
+
+def test_missing_cards_expire_sooner(tmp_path):
+    cache = CardCache(tmp_path / 'cards.json', ttl=MISSING_CARD_TTL * 2)
+    cache.put_many(URL, [CardInfo(1, 'Первая'), CardInfo(2, exists=False)], now=1)
+
+    cards, stale = cache.get_many(URL, [1, 2], now=1 + MISSING_CARD_TTL)
+
+    assert set(cards) == {1, 2}
+    assert stale == [2]
+
+
+def test_prefetch_requests_only_uncached_cards(tmp_path):
+    cache = CardCache(tmp_path / 'cards.json')
+    cards = {1: {'title': 'Первая', 'board': {'title': 'Доска'}, 'column': {'title': 'В работе'}}}
+    with StubKaitenServer(cards=cards) as server:
+        api = KaitenAPI('token', server.url)
+        first = cache.prefetch(api, server.url, [1, 2])
+        requests_count = len(server.requests)
+        second = cache.prefetch(api, server.url, [1, 2])
+        api.close()
+
+    assert first == second == {1: CardInfo(1, 'Первая', 'Доска', 'В работе'), 2: CardInfo(2, exists=False)}
+    assert requests_count == 2
+    assert len(server.requests) == requests_count
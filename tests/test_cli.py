@@ -0,0 +1,116 @@
+import importlib
+import io
+import json
+import subprocess
+import sys
+import tomllib
+from pathlib import Path
+
+import pytest
+import setuptools
+from git import Repo
+from stub_kaiten import StubKaitenServer
+
+from src import cli
+from src.core import config as config_module
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    repo = Repo.init(tmp_path / 'repo')
+    with repo.config_writer() as writer:
+        writer.set_value('user', 'name', 'Developer')
+        writer.set_value('user', 'email', 'dev@example.com')
+    repo.index.commit('Initial commit')
+    repo.create_head('TASK-100').checkout()
+    repo.index.commit('today change')
+    return repo
+
+
+def _run(argv):
+    out = io.StringIO()
+    args = cli.build_parser().parse_args(argv)
+    return args.handler(args, out), out.getvalue()
+
+
+def test_collect_json(git_repo):
+    code, output = _run(['collect', '--repo', git_repo.working_tree_dir, '--no-index', '--json'])
+
+    assert code == 0
+    [row] = json.loads(output)
+    assert (row['card_id'], row['branch'], row['commits']) == (100, 'TASK-100', ['today change', 'Initial commit'])
+
+
+def test_collect_rejects_reversed_period(git_repo):
+    argv = ['collect', '--repo', git_repo.working_tree_dir, '--from', '2025-05-12', '--to', '2025-05-05']
+
+    assert _run(argv) == (2, '')
+
+
+def test_collect_json_stdout_is_not_mixed_with_log(git_repo):
+    code = (
+        'from src.cli import main; from src.utils.logger import logger; '
+        f'main(["-v", "collect", "--repo", {git_repo.working_tree_dir!r}, "--no-index", "--json"]); '
+        'logger.warning("запись лога")'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=Path(__file__).parent.parent, check=True, capture_output=True, text=True
+    )
+
+    [row] = json.loads(result.stdout)
+    assert row['card_id'] == 100
+    assert 'запись лога' in result.stderr
+
+
+@pytest.mark.parametrize(
+    'rows, expected_output',
+    [
+        ([{'card_id': 1, 'time_spent': '1h 30m', 'for_date': '2025-05-05'}], '2025-05-05\t1\t90 мин\n'),
+        ([{'card_id': 1, 'time_spent': '90', 'for_date': '2025-05-05'}], '2025-05-05\t1\t90 мин\n'),
+        (
+            [{'card_id': 2, 'time_spent': 45, 'for_date': '2025-05-05'}, {'card_id': 3, 'time_spent': ''}],
+            '2025-05-05\t2\t45 мин\n',
+        ),
+    ],
+)
+def test_submit_dry_run(tmp_path, rows, expected_output):
+    path = tmp_path / 'entries.json'
+    path.write_text(json.dumps(rows), encoding='utf-8')
+
+    assert _run(['submit', '--from', str(path), '--dry-run']) == (0, expected_output)
+
+
+def test_submit_is_idempotent(tmp_path, monkeypatch):
+    path = tmp_path / 'entries.json'
+    path.write_text(json.dumps([{'card_id': 1, 'time_spent': '2h', 'for_date': '2025-05-05'}]), encoding='utf-8')
+    monkeypatch.setattr(config_module, 'OUTBOX_FILE', tmp_path / 'outbox.sqlite3')
+
+    with StubKaitenServer() as server:
+        monkeypatch.setattr(config_module.config, '_kaiten_token', 'token')
+        monkeypatch.setattr(config_module.config, 'kaiten_url', server.url)
+        monkeypatch.setattr(config_module.config, 'git_repo_paths', [])
+
+        assert _run(['submit', '--from', str(path)])[0] == 0
+        assert _run(['submit', '--from', str(path)]) == (0, 'Новых записей: 0, отправлено: 0, с ошибкой: 0\n')
+
+    assert [log['time_spent'] for log in server.time_logs] == [120]
+
+
+def test_cli_does_not_import_gui_modules(git_repo):
+    code = (
+        'import sys; from src.cli import main; '
+        f'main(["collect", "--repo", {git_repo.working_tree_dir!r}, "--no-index"]); '
+        'assert not {"tkinter", "PIL", "pystray"} & set(sys.modules), sys.modules.keys()'
+    )
+    subprocess.run([sys.executable, '-c', code], cwd=Path(__file__).parent.parent, check=True, capture_output=True)
+
+
+def test_console_script_module_is_packaged():
+    root = Path(__file__).parent.parent
+    pyproject = tomllib.loads((root / 'pyproject.toml').read_text(encoding='utf-8'))
+    find = pyproject['tool']['setuptools']['packages']['find']
+    packages = setuptools.find_packages(where=str(root / find['where'][0]), include=find['include'])
+    module, _, function = pyproject['project']['scripts']['kaiten-time-logger'].partition(':')
+
+    assert module.rpartition('.')[0] in packages
+    assert callable(getattr(importlib.import_module(module), function))
@@ -1,6 +1,14 @@
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
 import pytest
+from git import Actor, Repo
 
-from src.core.git_manager import GitManager
+from src.core.commit_index import CommitIndex
+from src.core.git_backends import CliGitBackend, GitPythonBackend
+from src.core.git_manager import GitManager, GitWorkspace, merge_branches_by_card, merge_branches_by_day
+from src.core.models import BranchCommits
 
 
 @pytest.mark.parametrize(
@@ -22,3 +30,218 @@ from src.core.git_manager import GitManager
 )
 def test_extract_card_id(branch_name, expected_id):
     assert GitManager._extract_card_id(branch_name) == expected_id
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    repo = Repo.init(tmp_path)
+    with repo.config_writer() as writer:
+        writer.set_value('user', 'name', 'Developer')
+        writer.set_value('user', 'email', 'dev@example.com')
+    (tmp_path / 'README.md').write_text('init', encoding='utf-8')
+    repo.index.add(['README.md'])
+    repo.index.commit('Initial commit')
+    return repo
+
+
+def _commit(repo: Repo, message: str, author: str = 'Developer') -> None:
+    path = Path(repo.working_tree_dir) / 'file.txt'
+    path.write_text(message, encoding='utf-8')
+    repo.index.add([str(path)])
+    actor = Actor(author, f'{author.lower()}@example.com')
+    repo.index.commit(message, author=actor, committer=actor)
+
+
+def _without_times(branches):
+    return [branch[:3] for branch in branches]
+
+
+def test_get_branches_with_commits_single_pass(git_repo):
+    base = git_repo.active_branch
+    git_repo.create_head('TASK-100').checkout()
+    _commit(git_repo, 'first change')
+    git_repo.create_head('TASK-200').checkout()
+    _commit(git_repo, 'second change')
+    _commit(git_repo, 'foreign change', author='Someone')
+    base.checkout()
+
+    result = {
+        branch.card_id: branch.commits for branch in GitManager(git_repo.working_tree_dir).get_branches_with_commits()
+    }
+
+    assert result[100] == ['first change', 'Initial commit']
+    assert result[200] == ['second change', 'first change', 'Initial commit']
+
+
+def test_git_backends_read_same_history(git_repo):
+    base = git_repo.active_branch
+    git_repo.create_head('TASK-100').checkout()
+    _commit(git_repo, 'Исправление\n\nПодробное описание')
+    base.checkout()
+    git_repo.git.merge('TASK-100', '--no-ff', '-m', 'Merge TASK-100')
+    since = datetime.now().astimezone() - timedelta(days=1)
+    path = git_repo.working_tree_dir
+
+    cli, gitpython = CliGitBackend(path), GitPythonBackend(path)
+
+    assert cli.git_dir == gitpython.git_dir
+    assert cli.user_name() == gitpython.user_name() == 'Developer'
+    assert cli.head_tips() == gitpython.head_tips()
+    cli_log = list(cli.log(['--branches'], since))
+    assert cli_log == list(gitpython.log(['--branches'], since))
+    assert len(cli_log[0].parents) == 2
+    assert cli_log[1].message == 'Исправление\n\nПодробное описание'
+
+
+def test_commit_index_rewalks_only_moved_branches(git_repo, tmp_path):
+    git_repo.create_head('TASK-100').checkout()
+    _commit(git_repo, 'first change')
+    index = CommitIndex(tmp_path / 'index.sqlite3')
+    manager = GitManager(git_repo.working_tree_dir, index=index)
+
+    assert _without_times(manager.get_branches_with_commits()) == [
+        ('TASK-100', 100, ['first change', 'Initial commit'])
+    ]
+
+    git_repo.git.commit('--amend', '-m', 'amended change')
+    reopened = GitManager(git_repo.working_tree_dir, index=CommitIndex(tmp_path / 'index.sqlite3'))
+
+    assert _without_times(reopened.get_branches_with_commits()) == [
+        ('TASK-100', 100, ['amended change', 'Initial commit'])
+    ]
+
+
+def test_broken_commit_index_falls_back_to_git(git_repo, tmp_path):
+    git_repo.create_head('TASK-100').checkout()
+    _commit(git_repo, 'first change')
+    path = tmp_path / 'index.sqlite3'
+    manager = GitManager(git_repo.working_tree_dir, index=CommitIndex(path))
+    path.write_bytes(b'not a database' * 1024)
+
+    for _ in range(2):
+        assert _without_times(manager.get_branches_with_commits()) == [
+            ('TASK-100', 100, ['first change', 'Initial commit'])
+        ]
+    assert manager.index.broken and path.read_bytes().startswith(b'not a database')
+
+    reopened = GitManager(git_repo.working_tree_dir, index=CommitIndex(path))
+    assert not reopened.index.broken
+    assert _without_times(reopened.get_branches_with_commits()) == [
+        ('TASK-100', 100, ['first change', 'Initial commit'])
+    ]
+
+
+def test_workspace_merges_repositories_by_card(tmp_path):
+    repos = []
+    for name in ('backend', 'frontend'):
+        repo = Repo.init(tmp_path / name)
+        with repo.config_writer() as writer:
+            writer.set_value('user', 'name', 'Developer')
+            writer.set_value('user', 'email', 'dev@example.com')
+        _commit(repo, f'init {name}')
+        repo.create_head('TASK-100').checkout()
+        _commit(repo, f'{name} change')
+        repos.append(repo.working_tree_dir)
+
+    result = GitWorkspace(repos).get_branches_with_commits()
+
+    assert _without_times(result) == [
+        ('TASK-100', 100, ['backend change', 'init backend', 'frontend change', 'init frontend'])
+    ]
+
+
+@pytest.mark.parametrize('backend', ['cli', 'gitpython'])
+def test_workspace_skips_invalid_repository(git_repo, tmp_path_factory, monkeypatch, backend):
+    monkeypatch.setenv('KAITEN_GIT_BACKEND', backend)
+
+    workspace = GitWorkspace([tmp_path_factory.mktemp('not-a-repo'), git_repo.working_tree_dir])
+
+    assert [manager.repo_path for manager in workspace.managers] == [git_repo.working_tree_dir]
+
+
+def test_merge_branches_by_card():
+    first, second, third = datetime(2025, 5, 5, 10, 0), datetime(2025, 5, 5, 11, 0), datetime(2025, 5, 5, 12, 0)
+    result = merge_branches_by_card(
+        [
+            [
+                BranchCommits('TASK-1', 1, ['a', 'fix'], (second, first), ('s2', 's1')),
+                BranchCommits('TASK-2', 2, ['b'], (first,), ('s4',)),
+            ],
+            [BranchCommits('TASK-1-fix', 1, ['fix', 'fix'], (third, first), ('s3', 's1'))],
+        ]
+    )
+
+    assert result == [
+        BranchCommits('TASK-1, TASK-1-fix', 1, ['a', 'fix', 'fix'], (first, second, third), ('s2', 's1', 's3')),
+        BranchCommits('TASK-2', 2, ['b'], (first,), ('s4',)),
+    ]
+
+
+def test_get_branches_with_commits_by_date(git_repo):
+    git_repo.create_head('TASK-100').checkout()
+    yesterday = datetime.now().astimezone() - timedelta(days=1)
+    path = Path(git_repo.working_tree_dir) / 'file.txt'
+    path.write_text('old', encoding='utf-8')
+    git_repo.index.add([str(path)])
+    timestamp = f'{int(yesterday.timestamp())} +0000'
+    git_repo.index.commit('yesterday change', author_date=timestamp, commit_date=timestamp)
+    _commit(git_repo, 'today change')
+
+    result = GitWorkspace([git_repo.working_tree_dir]).get_branches_with_commits_by_date(
+        yesterday.date(), date.today(), day_filter=lambda day: day != date.today()
+    )
+
+    assert {day: _without_times(branches) for day, branches in result.items()} == {
+        yesterday.date(): [('TASK-100', 100, ['yesterday change'])]
+    }
+    assert result[yesterday.date()][0].commit_times[0].timestamp() == int(yesterday.timestamp())
+
+
+def test_iter_repo_branches(git_repo):
+    git_repo.create_head('TASK-100').checkout()
+    _commit(git_repo, 'today change')
+    workspace = GitWorkspace([git_repo.working_tree_dir, git_repo.working_tree_dir])
+
+    results = [result for _, result in workspace.iter_repo_branches()]
+
+    assert len(results) == 2
+    [branch] = merge_branches_by_day(results)[None]
+    assert branch[:3] == ('TASK-100', 100, ['today change', 'Initial commit'])
+    assert branch.commit_times
+
+
+def test_iter_repo_branches_cancelled(git_repo):
+    cancelled = threading.Event()
+    cancelled.set()
+
+    assert list(GitWorkspace([git_repo.working_tree_dir]).iter_repo_branches(cancelled=cancelled)) == []
+
+
+def test_rescan_walks_only_moved_branches(git_repo):
+    base = git_repo.active_branch
+    for name in ('TASK-100', 'TASK-200'):
+        git_repo.create_head(name, base.commit).checkout()
+        _commit(git_repo, f'{name} change')
+    manager = GitManager(git_repo.working_tree_dir)
+    walked = []
+    log = manager.backend.log
+    manager.backend.log = lambda revisions, *args: walked.append(revisions) or log(revisions, *args)
+
+    manager.get_branches_with_commits()
+    _commit(git_repo, 'TASK-200 second change')
+    result = {branch.card_id: branch.commits for branch in manager.get_branches_with_commits()}
+
+    assert walked == [['--branches'], [git_repo.heads['TASK-200'].commit.hexsha]]
+    assert result == {
+        100: ['TASK-100 change', 'Initial commit'],
+        200: ['TASK-200 second change', 'TASK-200 change', 'Initial commit'],
+    }
+
+
+def test_iter_repo_branches_scans_selected_repositories(git_repo, tmp_path):
+    other = Repo.init(tmp_path / 'other')
+    _commit(other, 'other init')
+    workspace = GitWorkspace([git_repo.working_tree_dir, other.working_tree_dir])
+    repo_key = workspace.git_dirs[1]
+
+    assert [key for key, _ in workspace.iter_repo_branches(repo_keys={repo_key})] == [repo_key]
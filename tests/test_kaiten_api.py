@@ -0,0 +1,195 @@
+import asyncio
+import time
+from datetime import date
+
+import httpx
+import pytest
+from stub_kaiten import StubKaitenServer
+
+from src.core.kaiten_api import AsyncKaitenAPI, KaitenAPI, RateLimiter, _rate_limit_reset, _retry_after
+from src.core.models import CardInfo, TimeLogEntry
+
+
+@pytest.fixture
+def kaiten_server():
+    with StubKaitenServer() as server:
+        yield server
+
+
+def test_add_time_log(kaiten_server):
+    api = KaitenAPI('token', kaiten_server.url, role_id=7)
+
+    assert api.add_time_log(123, 90, 'fix', for_date=date(2025, 1, 9))
+    assert kaiten_server.time_logs == [
+        {'id': 1, 'card_id': 123, 'time_spent': 90, 'comment': 'fix', 'for_date': '2025-01-09', 'role_id': 7}
+    ]
+    assert kaiten_server.requests[0]['headers']['Authorization'] == 'Bearer token'
+
+
+def test_requests_reuse_connection(kaiten_server):
+    api = KaitenAPI('token', kaiten_server.url)
+
+    for _ in range(3):
+        assert api.get_list_of_user_roles() == {1: 'Разработчик', 2: 'Аналитик'}
+
+    assert len({request['client_port'] for request in kaiten_server.requests}) == 1
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_retry_respects_retry_after(kaiten_server, status):
+    kaiten_server.enqueue('POST', '/api/latest/cards/1/time-logs', status, headers={'Retry-After': '1'})
+    api = KaitenAPI('token', kaiten_server.url, backoff_factor=0)
+
+    started = time.monotonic()
+    assert api.add_time_log(1, 30, 'retry')
+    assert time.monotonic() - started >= 1
+    assert len(kaiten_server.requests) == 2
+
+
+def test_retries_are_limited(kaiten_server):
+    for _ in range(3):
+        kaiten_server.enqueue('GET', '/api/latest/user-roles', 500)
+    api = KaitenAPI('token', kaiten_server.url, max_retries=2, backoff_factor=0)
+
+    assert api.get_list_of_user_roles() == {}
+    assert len(kaiten_server.requests) == 3
+
+
+@pytest.mark.parametrize('body', [b'<html>Bad Gateway</html>', [{'id': 1}], {'roles': []}])
+def test_malformed_roles_response(kaiten_server, body):
+    kaiten_server.enqueue('GET', '/api/latest/user-roles', 200, body)
+    api = KaitenAPI('token', kaiten_server.url)
+
+    assert api.get_list_of_user_roles() == {}
+
+
+def test_read_timeout(kaiten_server):
+    kaiten_server.enqueue('POST', '/api/latest/cards/1/time-logs', 200, delay=1)
+    api = KaitenAPI('token', kaiten_server.url, timeout=(1, 0.1), max_retries=0)
+
+    started = time.monotonic()
+    assert not api.add_time_log(1, 30, 'slow')
+    assert time.monotonic() - started < 1
+
+
+def test_post_is_not_retried_after_read_timeout(kaiten_server):
+    kaiten_server.enqueue('POST', '/api/latest/cards/1/time-logs', 200, delay=0.5)
+    api = KaitenAPI('token', kaiten_server.url, timeout=(1, 0.1), backoff_factor=0)
+
+    assert not api.add_time_log(1, 30, 'slow')
+    assert len(kaiten_server.time_logs) == 1
+    assert len(kaiten_server.requests) == 1
+
+
+def test_get_is_retried_after_read_timeout(kaiten_server):
+    kaiten_server.enqueue('GET', '/api/latest/user-roles', 200, delay=0.5)
+    api = KaitenAPI('token', kaiten_server.url, timeout=(1, 0.1), backoff_factor=0)
+
+    assert api.get_list_of_user_roles() == {1: 'Разработчик', 2: 'Аналитик'}
+    assert len(kaiten_server.requests) == 2
+
+
+@pytest.mark.parametrize('status', [500, 502, 504])
+def test_post_is_not_retried_on_server_error(kaiten_server, status):
+    kaiten_server.enqueue('POST', '/api/latest/cards/1/time-logs', status)
+    api = KaitenAPI('token', kaiten_server.url, backoff_factor=0)
+
+    assert not api.add_time_log(1, 30, 'fail')
+    assert len(kaiten_server.requests) == 1
+
+
+def test_add_time_logs_runs_concurrently():
+    entries = [TimeLogEntry(card_id, 30, f'card {card_id}') for card_id in range(1, 9)]
+    progress = []
+
+    with StubKaitenServer(latency=0.2) as server:
+        api = KaitenAPI('token', server.url)
+        started = time.monotonic()
+        results = api.add_time_logs(entries, max_workers=8, on_result=progress.append)
+        elapsed = time.monotonic() - started
+
+    assert [result.entry for result in results] == entries
+    assert all(result.success for result in results)
+    assert len(progress) == len(entries)
+    assert elapsed < 0.2 * len(entries) / 2
+
+
+def test_async_api_fans_out_on_one_loop():
+    entries = [TimeLogEntry(card_id, 30, f'card {card_id}') for card_id in range(1, 9)]
+
+    async def run(api: AsyncKaitenAPI):
+        try:
+            return await asyncio.gather(
+                api.add_time_logs(entries), api.get_list_of_user_roles(), api.get_cards([1, 2, 1])
+            )
+        finally:
+            await api.aclose()
+
+    with StubKaitenServer(latency=0.2, cards={1: {'title': 'Первая'}}) as server:
+        server.enqueue('GET', '/api/latest/cards/2', 403)
+        started = time.monotonic()
+        results, roles, cards = asyncio.run(run(AsyncKaitenAPI('token', server.url)))
+        elapsed = time.monotonic() - started
+
+    assert all(result.success for result in results)
+    assert roles == {1: 'Разработчик', 2: 'Аналитик'}
+    assert cards == {1: CardInfo(1, 'Первая'), 2: CardInfo(2, accessible=False)}
+    assert elapsed < 0.2 * 3
+
+
+@pytest.mark.parametrize('retry_after, expected', [('2', 2.0), ('-5', 0.0), ('100000', 120.0), ('soon', None)])
+def test_retry_after_header(retry_after, expected):
+    response = httpx.Response(503, headers={'Retry-After': retry_after})
+
+    assert _retry_after(response) == expected
+
+
+def test_sync_get_card(kaiten_server):
+    kaiten_server.cards[5] = {'title': 'Карточка'}
+    api = KaitenAPI('token', kaiten_server.url)
+
+    assert api.get_card(5) == {'id': 5, 'title': 'Карточка'}
+    assert api.get_card(6) is None
+    api.close()
+
+
+def test_rate_limiter_allows_burst_then_limits_rate():
+    async def run(limiter: RateLimiter):
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for _ in range(8)))
+        return time.monotonic() - started
+
+    limiter = RateLimiter(rate=20, burst=4)
+    elapsed = asyncio.run(run(limiter))
+
+    assert 4 / 20 <= elapsed < 4 / 20 + 0.1
+    assert limiter.stats.requests == 8
+    assert limiter.stats.delayed == 4
+    assert limiter.stats.max_wait >= 4 / 20 - 0.01
+
+
+@pytest.mark.parametrize(
+    'headers, expected',
+    [
+        ({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '2'}, 2.0),
+        ({'X-RateLimit-Remaining': '3', 'X-RateLimit-Reset': '2'}, None),
+        ({'RateLimit-Remaining': '0', 'RateLimit-Reset': '1'}, 1.0),
+        ({'X-RateLimit-Remaining': '0'}, None),
+    ],
+)
+def test_rate_limit_reset_header(headers, expected):
+    assert _rate_limit_reset(httpx.Response(200, headers=headers)) == expected
+
+
+def test_exhausted_quota_pauses_all_requests(kaiten_server):
+    kaiten_server.enqueue(
+        'GET', '/api/latest/user-roles', 200, [], headers={'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '1'}
+    )
+    api = KaitenAPI('token', kaiten_server.url)
+
+    api.get_list_of_user_roles()
+    started = time.monotonic()
+    assert api.add_time_log(1, 30, 'after reset')
+    assert time.monotonic() - started >= 0.9
+    assert api.rate_limit_stats.delayed == 1
+    api.close()
@@ -0,0 +1,24 @@
+import gzip
+import logging
+
+from src.utils.logger import create_file_handler, setup_logger, stop_logging
+
+
+def test_logger_writes_through_queue(tmp_path):
+    logger = setup_logger('test_queued_logger', tmp_path / 'logs')
+    logger.debug('запись в фоне')
+    stop_logging('test_queued_logger')
+
+    assert 'запись в фоне' in (tmp_path / 'logs' / 'kaiten_logger.log').read_text(encoding='utf-8')
+
+
+def test_rotated_logs_are_compressed(tmp_path):
+    handler = create_file_handler(tmp_path / 'app.log', max_bytes=200, backup_count=2)
+    logger = logging.getLogger('test_rotated_logger')
+    logger.addHandler(handler)
+    for number in range(20):
+        logger.warning(f'строка {number:02} ' + 'x' * 40)
+    handler.close()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['app.log', 'app.log.1.gz', 'app.log.2.gz']
+    assert 'строка' in gzip.decompress((tmp_path / 'app.log.1.gz').read_bytes()).decode('utf-8')
@@ -1,3 +1,5 @@
+from datetime import date
+
 import pytest
 
 from src.ui.components import ManualTimeEntry
@@ -16,3 +18,21 @@ from src.ui.components import ManualTimeEntry
 def test_on_card_paste(pasted_text, expected_card_id):
     card_id = ManualTimeEntry._fetch_card_id(pasted_text)
     assert card_id == expected_card_id
+
+
+@pytest.mark.parametrize(
+    'value, expected',
+    [
+        ('05.05.2025', date(2025, 5, 5)),
+        (' 09.05.2025 ', date(2025, 5, 9)),
+        ('04.05.2025', None),
+        ('2025-05-06', None),
+    ],
+)
+def test_manual_entry_date_within_period(value, expected):
+    period = (date(2025, 5, 5), date(2025, 5, 9))
+    if expected is None:
+        with pytest.raises(ValueError):
+            ManualTimeEntry._parse_date(value, period)
+    else:
+        assert ManualTimeEntry._parse_date(value, period) == expected
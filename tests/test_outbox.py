@@ -0,0 +1,84 @@
+from datetime import date
+
+import pytest
+from stub_kaiten import StubKaitenServer
+
+from src.core.kaiten_api import KaitenAPI
+from src.core.models import TimeLogEntry
+from src.core.outbox import MAX_SERVER_ERROR_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY, Outbox, OutboxWorker
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    return Outbox(tmp_path / 'outbox.sqlite3')
+
+
+def test_enqueue_deduplicates_entries(outbox):
+    entry = TimeLogEntry(1, 60, 'fix', date(2025, 1, 9))
+
+    assert outbox.enqueue([entry, entry]) == 1
+    assert outbox.enqueue([entry, TimeLogEntry(1, 30, 'fix', date(2025, 1, 9))]) == 1
+    assert outbox.pending_count() == 2
+
+
+def test_enqueue_fixes_date_at_save_time(outbox):
+    outbox.enqueue([TimeLogEntry(1, 60, 'fix')])
+
+    assert [entry for _, entry in outbox.due()] == [TimeLogEntry(1, 60, 'fix', date.today())]
+
+
+def test_worker_replays_failed_entries_with_backoff(outbox):
+    with StubKaitenServer() as server:
+        server.enqueue('POST', '/api/latest/cards/1/time-logs', 503)
+        api = KaitenAPI('token', server.url, max_retries=0)
+        worker = OutboxWorker(outbox, lambda: api)
+        outbox.enqueue([TimeLogEntry(1, 60, 'fix', date(2025, 1, 9))], now=1000)
+
+        assert [result.success for result in worker.flush(now=1000)] == [False]
+        assert worker.flush(now=1000 + RETRY_BASE_DELAY - 1) == []
+        assert [result.success for result in worker.flush(now=1000 + RETRY_BASE_DELAY)] == [True]
+        assert worker.flush(now=10_000) == []
+
+    assert outbox.pending_count() == 0
+    assert len(server.time_logs) == 1
+
+
+@pytest.mark.parametrize('status', [400, 401, 403, 404])
+def test_worker_stops_on_permanent_failure(outbox, status):
+    reported = []
+    entry = TimeLogEntry(1, 60, 'fix', date(2025, 1, 9))
+    with StubKaitenServer() as server:
+        server.enqueue('POST', '/api/latest/cards/1/time-logs', status)
+        api = KaitenAPI('token', server.url, max_retries=0)
+        worker = OutboxWorker(outbox, lambda: api, on_flush=lambda results, given_up: reported.append(given_up))
+        outbox.enqueue([entry], now=1000)
+
+        assert [result.status for result in worker.flush(now=1000)] == [status]
+        assert worker.flush(now=100_000) == []
+        assert [[result.entry for result in given_up] for given_up in reported] == [[entry]]
+        assert outbox.pending_count() == 0
+        assert outbox.failed() == [(entry, f'HTTP {status}')]
+
+        # Повторное сохранение после исправления, например токена, снова отправляет запись
+        assert outbox.enqueue([entry], now=200_000) == 1
+        assert [result.success for result in worker.flush(now=200_000)] == [True]
+
+    assert outbox.failed() == []
+    assert len(server.time_logs) == 1
+
+
+def test_worker_limits_attempts_on_server_errors(outbox):
+    reported = []
+    with StubKaitenServer() as server:
+        for _ in range(MAX_SERVER_ERROR_ATTEMPTS):
+            server.enqueue('POST', '/api/latest/cards/1/time-logs', 500)
+        api = KaitenAPI('token', server.url, max_retries=0)
+        worker = OutboxWorker(outbox, lambda: api, on_flush=lambda results, given_up: reported.extend(given_up))
+        outbox.enqueue([TimeLogEntry(1, 60, 'fix', date(2025, 1, 9))], now=1000)
+
+        for attempt in range(MAX_SERVER_ERROR_ATTEMPTS):
+            assert [result.status for result in worker.flush(now=1000 + attempt * RETRY_MAX_DELAY)] == [500]
+
+    assert [result.status for result in reported] == [500]
+    assert outbox.pending_count() == 0
+    assert len(server.requests) == MAX_SERVER_ERROR_ATTEMPTS
@@ -1,6 +1,7 @@
 import pytest
 
 from src.ui.components import BranchTimeEntry
+from src.utils.time_parser import parse_duration
 
 
 @pytest.mark.parametrize(
@@ -23,3 +24,27 @@ from src.ui.components import BranchTimeEntry
 )
 def test_parse_time(time, expected_time):
     assert BranchTimeEntry.parse_time(time) == expected_time
+
+
+@pytest.mark.parametrize(
+    'time, expected_minutes',
+    [
+        ('13:30', 810),
+        ('1.5h', 90),
+        ('1,5ч', 90),
+        ('90m', 90),
+        ('1H 30M', 90),
+        ('1d', 480),
+        ('1d 2h', 600),
+        ('1д2ч30м', 630),
+        ('  2h  ', 120),
+    ],
+)
+def test_parse_duration(time, expected_minutes):
+    assert parse_duration(time) == expected_minutes
+
+
+@pytest.mark.parametrize('time', ['abc', '1x', 'h', '1h 2d', '1:2:3', '-1h'])
+def test_parse_duration_invalid(time):
+    with pytest.raises(ValueError):
+        parse_duration(time)
@@ -0,0 +1,36 @@
+import threading
+import time
+
+import pytest
+from git import Repo
+
+from src.core.ref_watcher import RefWatcher
+
+
+@pytest.mark.parametrize('use_inotify', [True, False])
+def test_ref_changes_are_debounced_into_one_notification(tmp_path, use_inotify):
+    repo = Repo.init(tmp_path)
+    with repo.config_writer() as writer:
+        writer.set_value('user', 'name', 'Developer')
+        writer.set_value('user', 'email', 'dev@example.com')
+    repo.git.commit('--allow-empty', '-m', 'Initial commit')
+    git_dir = str(tmp_path / '.git')
+    notifications = []
+    notified = threading.Event()
+
+    def on_change(git_dirs):
+        notifications.append(git_dirs)
+        notified.set()
+
+    watcher = RefWatcher([git_dir], on_change, debounce=0.3, poll_interval=0.1, use_inotify=use_inotify)
+    watcher.start()
+    try:
+        repo.create_head('feature/TASK-100')
+        repo.git.commit('--allow-empty', '-m', 'change')
+        assert notified.wait(5)
+        # Оба изменения пришли в пределах интервала и дали одно уведомление
+        time.sleep(0.5)
+    finally:
+        watcher.stop()
+
+    assert notifications == [{git_dir}]
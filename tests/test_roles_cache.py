@@ -0,0 +1,16 @@
+from src.core.roles_cache import RolesCache
+
+
+def test_roles_cache_persists_between_instances(tmp_path):
+    RolesCache(tmp_path / 'roles.json').put('https://kaiten.example/', 'token', {1: 'Разработчик'})
+
+    assert RolesCache(tmp_path / 'roles.json').get('https://kaiten.example', 'token') == ({1: 'Разработчик'}, True)
+    assert 'token' not in (tmp_path / 'roles.json').read_text(encoding='utf-8')
+
+
+def test_roles_cache_is_keyed_by_credentials_and_expires(tmp_path):
+    cache = RolesCache(tmp_path / 'roles.json', ttl=60)
+    cache.put('https://kaiten.example', 'token', {1: 'Разработчик'}, now=1)
+
+    assert cache.get('https://kaiten.example', 'other-token') == ({}, False)
+    assert cache.get('https://kaiten.example', 'token') == ({1: 'Разработчик'}, False)
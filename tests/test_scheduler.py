@@ -0,0 +1,50 @@
+from datetime import datetime, time
+
+import pytest
+
+from src.core.scheduler import NotificationScheduler
+from src.core.work_calendar import WorkCalendar
+
+
+@pytest.mark.parametrize(
+    'after, expected',
+    [
+        (datetime(2025, 1, 9, 10, 0), datetime(2025, 1, 9, 13, 0)),
+        (datetime(2025, 1, 9, 13, 0), datetime(2025, 1, 9, 18, 0)),
+        (datetime(2025, 1, 9, 18, 30), datetime(2025, 1, 10, 13, 0)),
+        (datetime(2025, 1, 10, 19, 0), datetime(2025, 1, 13, 13, 0)),  # выходные
+        (datetime(2025, 4, 30, 19, 0), datetime(2025, 5, 5, 13, 0)),  # майские праздники
+    ],
+)
+def test_next_notification_time(after, expected):
+    assert WorkCalendar().next_notification_time([time(18, 0), time(13, 0)], after) == expected
+
+
+class FakeClock:
+    def __init__(self, now: datetime):
+        self.value = now
+
+    def __call__(self) -> datetime:
+        return self.value
+
+
+def test_scheduler_catches_up_missed_notification_once():
+    clock = FakeClock(datetime(2025, 1, 9, 10, 0))
+    fired = []
+    calendar = WorkCalendar()
+    scheduler = NotificationScheduler(
+        lambda after: calendar.next_notification_time([time(13, 0), time(18, 0)], after),
+        lambda: fired.append(clock()),
+        now=clock,
+    )
+
+    assert scheduler.check() == datetime(2025, 1, 9, 13, 0)
+    assert fired == []
+
+    clock.value = datetime(2025, 1, 9, 18, 45)  # проснулись после сна, пропустив оба напоминания
+    assert scheduler.check() == datetime(2025, 1, 10, 13, 0)
+    assert fired == [datetime(2025, 1, 9, 18, 45)]
+
+    clock.value = datetime(2025, 1, 13, 9, 0)  # напоминания прошлых дней не показываются
+    assert scheduler.check() == datetime(2025, 1, 13, 13, 0)
+    assert fired == [datetime(2025, 1, 9, 18, 45)]
@@ -0,0 +1,7 @@
+import pytest
+from bench_startup import STARTUP_MODULE, measure
+
+
+@pytest.mark.parametrize('module', [STARTUP_MODULE, 'src.core.config', 'src.cli'])
+def test_heavy_modules_are_loaded_lazily(module):
+    assert measure(module)['lazy_loaded_eagerly'] == []
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+import pytest
+
+from src.core.time_estimator import estimate_time
+from src.utils.time_parser import format_duration, parse_duration
+
+
+def _at(hour: int, minute: int = 0) -> datetime:
+    return datetime(2025, 5, 5, hour, minute).astimezone()
+
+
+@pytest.mark.parametrize(
+    'commit_times_by_card, total_minutes, expected',
+    [
+        # 30 минут до первого коммита и по часу до следующих
+        ({1: [_at(10)], 2: [_at(11), _at(12)]}, 150, {1: 30, 2: 120}),
+        # Перерыв больше 90 минут начинает новую сессию
+        ({1: [_at(9, 30), _at(10)], 2: [_at(15)]}, 90, {1: 60, 2: 30}),
+        # Масштабирование к рабочему дню
+        ({1: [_at(10)], 2: [_at(10, 30)]}, 480, {1: 240, 2: 240}),
+        # Коммиты в одну минуту
+        ({1: [_at(10)], 2: [_at(10)]}, 60, {1: 50, 2: 10}),
+        ({}, 480, {}),
+    ],
+)
+def test_estimate_time(commit_times_by_card, total_minutes, expected):
+    assert estimate_time(commit_times_by_card, total_minutes) == expected
+
+
+def test_estimate_time_matches_total_exactly():
+    commit_times_by_card = {card_id: [_at(9 + card_id % 8, card_id % 60)] for card_id in range(1, 40)}
+
+    result = estimate_time(commit_times_by_card, 482)
+
+    assert sum(result.values()) == 482
+    assert set(result) == set(commit_times_by_card)
+
+
+@pytest.mark.parametrize('minutes, expected', [(0, '0m'), (45, '45m'), (120, '2h'), (95, '1h35m')])
+def test_format_duration(minutes, expected):
+    assert format_duration(minutes) == expected
+    assert parse_duration(expected) == minutes
@@ -0,0 +1,41 @@
+import pytest
+
+from src.utils.tracing import SpanRecord, Tracer
+
+
+def test_span_records_duration_attributes_and_errors():
+    tracer = Tracer()
+
+    with tracer.span('git.branches', repo='backend') as attributes:
+        attributes['branches'] = 3
+    with pytest.raises(ValueError):
+        with tracer.span('kaiten.request'):
+            raise ValueError
+
+    failed, succeeded = tracer.recent()
+    assert succeeded.attributes == {'repo': 'backend', 'branches': 3}
+    assert succeeded.duration >= 0 and succeeded.error is None
+    assert failed.name == 'kaiten.request' and failed.error == 'ValueError'
+
+
+def test_cancelled_span_is_not_recorded():
+    tracer = Tracer()
+    span = tracer.start('ui.open_window')
+
+    span.cancel()
+    span.finish()
+
+    assert tracer.recent() == []
+
+
+def test_ring_buffer_keeps_latest_spans_and_percentiles():
+    tracer = Tracer(size=20)
+    for duration in range(1, 31):
+        tracer.record(SpanRecord('kaiten.request', 0, duration / 1000, {}))
+
+    (stats,) = tracer.stats()
+
+    assert len(tracer.recent()) == 20
+    assert (stats.count, stats.last_ms, stats.max_ms) == (20, 30, 30)
+    assert stats.p50_ms == pytest.approx(20.5)
+    assert stats.p95_ms == pytest.approx(29.05)
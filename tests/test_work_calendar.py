@@ -0,0 +1,57 @@
+import json
+from datetime import date
+
+import pytest
+
+from src.core.work_calendar import WorkCalendar
+
+
+@pytest.fixture
+def work_calendar(tmp_path):
+    overrides = tmp_path / 'calendar.json'
+    overrides.write_text(
+        json.dumps(
+            {
+                'days_off': ['2025-07-14..2025-07-18'],
+                'working_days': ['2025-07-19'],
+                'short_days': {'2025-07-21': 7},
+            }
+        ),
+        encoding='utf-8',
+    )
+    return WorkCalendar(overrides)
+
+
+@pytest.mark.parametrize(
+    'day, expected',
+    [
+        (date(2025, 5, 1), False),  # праздник
+        (date(2025, 5, 5), True),
+        (date(2025, 7, 13), False),  # выходной
+        (date(2025, 7, 14), False),  # отпуск
+        (date(2025, 7, 18), False),
+        (date(2025, 7, 19), True),  # рабочая суббота
+    ],
+)
+def test_is_working_day(work_calendar, day, expected):
+    assert work_calendar.is_working_day(day) is expected
+
+
+def test_count_working_days(work_calendar):
+    assert work_calendar.count_working_days(date(2025, 7, 14), date(2025, 7, 20)) == 1
+    assert work_calendar.count_working_days(date(2025, 4, 28), date(2025, 5, 12)) == 7
+    assert work_calendar.count_working_days(date(2025, 12, 29), date(2026, 1, 12)) == len(
+        list(work_calendar.iter_working_days(date(2025, 12, 29), date(2026, 1, 12)))
+    )
+
+
+def test_next_working_day(work_calendar):
+    assert work_calendar.next_working_day(date(2025, 4, 30)) == date(2025, 5, 5)
+    assert work_calendar.next_working_day(date(2025, 5, 5), inclusive=True) == date(2025, 5, 5)
+    assert work_calendar.next_working_day(date(2025, 7, 11)) == date(2025, 7, 19)
+
+
+def test_working_hours(work_calendar):
+    assert work_calendar.working_hours(date(2025, 7, 21), 8) == 7
+    assert work_calendar.working_hours(date(2025, 7, 22), 8) == 8
+    assert work_calendar.working_hours(date(2025, 7, 14), 8) == 0